@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
@@ -5,15 +7,32 @@ import logging
 # ensure DI bootstrap
 import core.bootstrap  # noqa: F401
 
+from src.asr.executor import get_transcription_executor
+from src.asr.jobs import get_job_runner
+
 # Import routers
 from backend.realtime import router as realtime_router
 from backend.routers.asr import router as asr_router
+from backend.routers.jobs import router as jobs_router
 from backend.routers.streaming_ws import router as stream_router
 
 # Setup logging using the standard Python logging module
 logger = logging.getLogger("ambient_scribe")
 
-app = FastAPI(title="Ambient Scribe API")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Spawn batch-transcription workers for engines with preloaded models so
+    # the first upload finds them warm, and resume jobs interrupted by the
+    # previous shutdown.
+    get_transcription_executor().warm()
+    get_job_runner().start()
+    yield
+    await get_job_runner().stop()
+    get_transcription_executor().shutdown(wait=False)
+
+
+app = FastAPI(title="Ambient Scribe API", lifespan=lifespan)
 
 # Define allowed origins
 origins = [
@@ -33,3 +52,5 @@ app.add_middleware(
 app.include_router(realtime_router)
 app.include_router(asr_router)
 app.include_router(stream_router)
+app.include_router(jobs_router)
+
@@ -9,6 +9,9 @@ from pathlib import Path
 from fastapi import APIRouter, File, Form, UploadFile, HTTPException
 from pydantic import BaseModel
 
+from src.asr.executor import get_transcription_executor
+from src.asr.model_registry import get_model_registry
+from src.asr.transcript_cache import get_transcript_cache
 from src.asr.transcription import transcribe_audio
 from src.asr.exceptions import TranscriptionError
 from src.llm.routing import generate_note_router
@@ -39,6 +42,25 @@ def list_templates():
     return load_prompt_templates()
 
 
+@router.get("/asr/models")
+def model_registry_stats():
+    """Return loaded ASR models, load times and cache hit rate."""
+    return get_model_registry().stats()
+
+
+@router.get("/asr/executor")
+def transcription_executor_stats():
+    """Return per-engine worker counts, queue depth and wait / run times of batch transcriptions."""
+    return get_transcription_executor().stats()
+
+
+@router.get("/asr/cache")
+def transcript_cache_stats():
+    """Return transcript cache size, hit rate and coalesced (singleflight) requests."""
+    cache = get_transcript_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
 @router.post("/transcribe")
 async def transcribe_endpoint(
     file: UploadFile = File(...),
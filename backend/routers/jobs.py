@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+"""Background transcription jobs for long recordings.
+
+    POST   /jobs                 multipart upload → 202 {"job_id", "status"}
+    GET    /jobs/{id}            status, progress (audio seconds) and partial transcript
+    GET    /jobs/{id}/events     the same as Server-Sent Events until the job ends
+    GET    /jobs/{id}/result     final transcript (409 while still running)
+    DELETE /jobs/{id}            cancel a queued or running job
+
+Jobs are persisted by :mod:`src.asr.jobs` and survive restarts.
+"""
+
+import asyncio
+import json
+import logging
+import shutil
+import uuid
+from pathlib import Path
+
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import StreamingResponse
+
+from src.asr.jobs import Job, get_job_runner, jobs_dir
+
+logger = logging.getLogger("ambient_scribe")
+
+router = APIRouter()
+
+_EVENT_POLL_S = 0.5
+_HEARTBEAT_S = 15.0
+
+
+def _get_job(job_id: str) -> Job:
+    job = get_job_runner().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(
+    file: UploadFile = File(...),
+    model: str = Form("vosk"),
+    language: str = Form("en-US"),
+    model_path: str | None = Form(None),
+    priority: int = Form(0),
+):
+    """Store the upload and queue it for background transcription."""
+    job_id = uuid.uuid4().hex
+    work_dir = jobs_dir() / job_id
+    work_dir.mkdir(parents=True, exist_ok=True)
+    audio_path = work_dir / f"input{Path(file.filename or '').suffix}"
+    with open(audio_path, "wb") as fh:
+        await asyncio.to_thread(shutil.copyfileobj, file.file, fh)
+
+    job = get_job_runner().submit(
+        audio_path, model, model_path=model_path, language=language, priority=priority, job_id=job_id
+    )
+    logger.info("Queued transcription job %s: model=%s, priority=%d, file=%s", job.id, model, priority, file.filename)
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.get("/jobs")
+def list_jobs(status: str | None = None, limit: int = 50):
+    """Recent jobs (without transcripts) and the runner's counters."""
+    runner = get_job_runner()
+    return {
+        "runner": runner.stats(),
+        "jobs": [job.to_dict(transcript=False) for job in runner.store.list(status, limit)],
+    }
+
+
+@router.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    """Status, progress and the transcript produced so far."""
+    return _get_job(job_id).to_dict()
+
+
+@router.get("/jobs/{job_id}/result")
+def job_result(job_id: str):
+    """Final transcript of a completed job."""
+    job = _get_job(job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=422, detail=job.error or "Transcription failed")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return {"job_id": job.id, "transcript": job.transcript, "duration_s": job.duration_s}
+
+
+@router.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    job = _get_job(job_id)
+    if not get_job_runner().store.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job is already {job.status}")
+    if job.status == "queued":
+        shutil.rmtree(Path(job.audio_path).parent, ignore_errors=True)
+    return {"job_id": job_id, "status": "cancelled"}
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, request: Request):
+    """Server-Sent Events: one ``status`` event per change, ending with the final state."""
+    _get_job(job_id)
+    store = get_job_runner().store
+
+    async def _stream():
+        last = None
+        idle = 0.0
+        while True:
+            job = store.get(job_id)
+            if job is None:
+                return
+            state = (job.status, job.progress_s, job.duration_s)
+            if state != last:
+                last, idle = state, 0.0
+                yield f"event: status\ndata: {json.dumps(job.to_dict())}\n\n"
+                if job.done:
+                    return
+            elif idle >= _HEARTBEAT_S:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            if await request.is_disconnected():
+                return
+            await asyncio.sleep(_EVENT_POLL_S)
+            idle += _EVENT_POLL_S
+
+    return StreamingResponse(
+        _stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -3,21 +3,44 @@ from __future__ import annotations
 """Generic streaming WebSocket endpoint powered by *StreamingService*.
 
 Client connects to /ws/stream?engine=vosk (or whisper, azure_speech).
-Audio chunks must be raw 16-bit LE PCM at 16-kHz mono.
+Add ``&model=`` to pick the model (a Vosk folder under ``<base_dir>/models``
+or a Whisper size; the server default otherwise) and ``&vad=1`` / ``&vad=0``
+to override ``streaming_vad_enabled``.
+Audio chunks are raw 16-bit LE PCM at 16-kHz mono unless another codec is
+negotiated (``?codec=mulaw|alaw|opus&rate=N`` or a first
+``{"type": "config", ...}`` text frame, see :mod:`src.asr.streaming.ingest`).
 Outgoing JSON mirrors the per-handler update dictionaries.
+When the host is out of streaming capacity the client receives an
+``{"type": "error", "error": "capacity", "retry_after": s}`` message and
+close code 1013; a downgraded session starts with a ``downgrade`` event.
+An unknown or misconfigured engine is reported as ``"error": "configuration"``
+with close code 1011.
+
+Receiving audio and sending updates run as two independent tasks, so a
+result is pushed as soon as a handler produces it – even when the client
+has paused or stopped sending audio.  Sessions run on the async service:
+a slow client only ever gets the newest partial and never stalls
+recognition.
 """
 
+import asyncio
 import logging
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
 
+from src.asr.streaming.ingest import UNSUPPORTED_AUDIO_CLOSE_CODE, negotiate_decoder
 from src.core.bootstrap import container
-from src.core.interfaces.streaming_service import IStreamingService
+from src.core.exceptions import CapacityExceededError, ConfigurationError, ServiceNotFoundError
+from src.core.interfaces.streaming_service import IAsyncStreamingService
 
 logger = logging.getLogger("ambient_scribe")
 
 router = APIRouter()
 
+# Handler option the ``model`` query parameter sets, per engine.
+_MODEL_OPTIONS = {"vosk": "model_path", "whisper": "model_size"}
+_DRAIN_TIMEOUT = 5.0  # seconds the sender may take to flush updates after the session ended
+
 
 @router.websocket("/ws/stream")
 async def websocket_stream(ws: WebSocket) -> None:  # noqa: D401
@@ -26,23 +49,108 @@ async def websocket_stream(ws: WebSocket) -> None:  # noqa: D401
     engine = ws.query_params.get("engine", "vosk")
 
     try:
-        streaming: IStreamingService = container.resolve(IStreamingService)
+        streaming: IAsyncStreamingService = container.resolve(IAsyncStreamingService)
     except Exception as exc:
         logger.error("StreamingService unavailable: %s", exc)
         await ws.close(code=1011)
         return
 
-    session_id = streaming.start_session(engine)
     try:
+        decoder, first_chunk = await negotiate_decoder(ws)
+    except WebSocketDisconnect:
+        return
+    except ConfigurationError as exc:
+        await ws.close(code=UNSUPPORTED_AUDIO_CLOSE_CODE, reason=str(exc)[:120])
+        return
+
+    options = {}
+    model = ws.query_params.get("model")
+    if model and engine.lower() in _MODEL_OPTIONS:
+        options[_MODEL_OPTIONS[engine.lower()]] = model
+    vad = ws.query_params.get("vad")
+    if vad is not None:
+        options["vad"] = vad.lower() in ("1", "true", "yes", "on")
+    try:
+        session_id = await streaming.start_session(engine, **options)
+    except CapacityExceededError as exc:
+        logger.warning("/ws/stream rejected: %s", exc)
+        await ws.send_json({"type": "error", "error": "capacity", "detail": str(exc), "retry_after": exc.retry_after})
+        await ws.close(code=1013, reason=f"retry after {exc.retry_after:.0f}s")  # 1013 = try again later
+        return
+    except (ConfigurationError, ServiceNotFoundError) as exc:
+        logger.error("/ws/stream could not start %s session: %s", engine, exc)
+        await ws.send_json({"type": "error", "error": "configuration", "detail": str(exc)})
+        await ws.close(code=1011, reason=str(exc)[:120])
+        return
+    sender = asyncio.create_task(_send_updates(ws, streaming, session_id))
+    try:
+        if first_chunk:
+            await streaming.process_chunk(session_id, first_chunk)
         while True:
-            chunk = await ws.receive_bytes()
-            streaming.process_chunk(session_id, chunk)
-            for update in streaming.get_updates(session_id):
-                await ws.send_json(update)
+            chunk = decoder.decode(await ws.receive_bytes())
+            if chunk:
+                await streaming.process_chunk(session_id, chunk)
     except WebSocketDisconnect:
         logger.info("Client disconnected from /ws/stream")
     except Exception as exc:
         logger.error("/ws/stream error: %s", exc)
         await ws.close(code=1011)
     finally:
-        streaming.end_session(session_id) 
\ No newline at end of file
+        try:
+            # Sharded stats are a round trip to the worker; keep the loop free.
+            stats = await asyncio.to_thread(streaming.get_session_stats, session_id)
+            logger.info(
+                "/ws/stream session %s delivery latency: %s (%d partials coalesced)",
+                session_id,
+                stats["delivery_latency"],
+                stats["coalesced_partials"],
+            )
+        except KeyError:
+            pass
+        await streaming.end_session(session_id)
+        # Ending the session flushes the last finals and metrics; let the
+        # sender deliver them before the socket goes away.
+        try:
+            await asyncio.wait_for(sender, _DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass  # wait_for cancels the sender
+
+
+async def _send_updates(ws: WebSocket, streaming: IAsyncStreamingService, session_id: str) -> None:
+    """Push updates to the client the moment a handler produces them."""
+    try:
+        async for update in streaming.updates(session_id):
+            await ws.send_json(update)
+    except asyncio.CancelledError:
+        raise
+    except KeyError:
+        # Session ended (e.g. expired by the housekeeper)
+        return
+    except Exception as exc:
+        logger.debug("/ws/stream sender stopped: %s", exc)
+
+
+@router.get("/ws/stream/sessions/{session_id}/stats")
+async def stream_session_stats(session_id: str) -> dict:
+    """Return live statistics (delivery latency, audio quality etc.) for a streaming session."""
+    streaming: IAsyncStreamingService = container.resolve(IAsyncStreamingService)
+    try:
+        return await asyncio.to_thread(streaming.get_session_stats, session_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown session {session_id}")
+
+
+@router.get("/ws/stream/shards")
+def stream_shard_stats() -> list:
+    """Return per-shard sessions, real-time factor and CPU when sharding is enabled."""
+    streaming: IAsyncStreamingService = container.resolve(IAsyncStreamingService)
+    shard_stats = getattr(streaming, "shard_stats", None)
+    return shard_stats() if callable(shard_stats) else []
+
+
+@router.get("/ws/stream/capacity")
+def stream_capacity() -> dict:
+    """Return the admission budget, current load and per-engine real-time factors."""
+    streaming: IAsyncStreamingService = container.resolve(IAsyncStreamingService)
+    get_capacity = getattr(streaming, "get_capacity", None)
+    return get_capacity() if callable(get_capacity) else {}
@@ -0,0 +1,479 @@
+"""Websocket load generator for ``/ws/vosk`` and ``/ws/stream``.
+
+Opens N concurrent clients against a local uvicorn instance.  Each client
+streams a WAV file (or generated speech-like audio) paced in real time, at
+a speed multiplier, or as fast as possible, with optional per-frame jitter.
+Every frame's send time and every update's receive time are recorded.  The
+report at the end contains:
+
+* first-partial, final and update latency distributions (p50/p95/p99/max),
+* send lateness (how far the client itself fell behind schedule),
+* connections rejected (capacity), failed to connect, or dropped mid-stream,
+* the server's own metrics (``/ws/vosk/stats``, ``/ws/stream/capacity``,
+  ``/ws/stream/shards``).
+
+Examples::
+
+    # start a private server on a free port and run 20 Vosk clients at 2x
+    python -m scripts.ws_loadgen --serve -n 20 --speed 2 --wav visit.wav
+
+    # hit an already running server, 50 clients ramped over 10 s
+    python -m scripts.ws_loadgen --url http://127.0.0.1:8000 --endpoint stream \\
+        --engine vosk -n 50 --ramp 10 --jitter-ms 30 --json report.json
+
+Final latency is measured from the frame that completed the segment when
+the server reports segment end times (``audio_end`` or Vosk ``words_info``),
+otherwise from the last frame sent before the final arrived.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+import wave
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+RATE = 16000
+ENDPOINTS = {"vosk": "/ws/vosk", "stream": "/ws/stream"}
+METRIC_PATHS = ("/ws/vosk/stats", "/ws/stream/capacity", "/ws/stream/shards")
+CAPACITY_CLOSE_CODE = 1013
+
+
+# ---------------------------------------------------------------------------
+# Audio
+# ---------------------------------------------------------------------------
+
+def load_wav(path: str) -> Tuple[bytes, int]:
+    """Return 16-bit mono PCM and sample rate of a PCM WAV file."""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+        channels, rate = wav.getnchannels(), wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    if channels > 1:
+        samples = np.frombuffer(frames, dtype="<i2").reshape(-1, channels)
+        frames = samples.mean(axis=1).astype("<i2").tobytes()
+    return frames, rate
+
+
+def generate_speech(seconds: float, *, rate: int = RATE, seed: int = 0) -> bytes:
+    """Speech-like PCM: voiced syllables with harmonics, separated by pauses."""
+    rng = np.random.default_rng(seed)
+    pieces: List[np.ndarray] = []
+    total = 0
+    wanted = int(seconds * rate)
+    while total < wanted:
+        length = int(rng.uniform(0.15, 0.35) * rate)
+        t = np.arange(length) / rate
+        pitch = rng.uniform(100, 220)
+        voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        syllable = voiced * np.hanning(length) * rng.uniform(0.2, 0.5)
+        pause = np.zeros(int(rng.uniform(0.05, 0.4) * rate))
+        pieces += [syllable, pause]
+        total += length + len(pause)
+    audio = np.concatenate(pieces)[:wanted] + rng.normal(0, 0.003, wanted)
+    return (np.clip(audio, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def frames(pcm: bytes, rate: int, chunk_ms: int) -> List[Tuple[bytes, float]]:
+    """Split PCM into ``(frame, audio end in seconds)`` pairs."""
+    size = max(2, rate * 2 * chunk_ms // 1000) & ~1
+    out = []
+    for offset in range(0, len(pcm), size):
+        chunk = pcm[offset : offset + size]
+        out.append((chunk, (offset + len(chunk)) / (rate * 2)))
+    return out
+
+
+def schedule(audio_ends: Sequence[float], speed: float, jitter_ms: float, rng: random.Random) -> List[float]:
+    """Send offsets (s) for frames ending at *audio_ends*.
+
+    A frame is due when its audio has been "captured" at *speed*× (0 means
+    as fast as possible), shifted by uniform ±*jitter_ms*.  Offsets never go
+    backwards, so jitter delays frames but cannot reorder them.
+    """
+    out: List[float] = []
+    previous = 0.0
+    for end in audio_ends:
+        due = end / speed if speed > 0 else 0.0
+        if jitter_ms:
+            due += rng.uniform(-jitter_ms, jitter_ms) / 1000.0
+        previous = max(previous, due, 0.0)
+        out.append(previous)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))]
+
+
+def distribution(values: Sequence[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0,
+    }
+
+
+def _is_final(update: dict) -> bool:
+    return bool(update.get("is_final")) or update.get("type") == "final"
+
+
+def _audio_end(update: dict) -> Optional[float]:
+    if "audio_end" in update:
+        return float(update["audio_end"])
+    words = update.get("words_info") or update.get("result") or []
+    ends = [w["end"] for w in words if isinstance(w, dict) and "end" in w]
+    return max(ends) if ends else None
+
+
+@dataclass
+class ClientTrace:
+    """Send times per frame and receive times per update of one client."""
+
+    client_id: int
+    sent_audio: List[float] = field(default_factory=list)  # audio end of each frame (s)
+    sent_at: List[float] = field(default_factory=list)
+    lateness_ms: List[float] = field(default_factory=list)  # actual minus scheduled send
+    received: List[Tuple[float, str]] = field(default_factory=list)  # (time, type)
+    first_partial_ms: Optional[float] = None
+    final_ms: List[float] = field(default_factory=list)
+    update_lag_ms: List[float] = field(default_factory=list)  # since the latest frame sent
+    status: str = "pending"  # completed | rejected | failed | dropped
+    close_code: Optional[int] = None
+    error: Optional[str] = None
+
+    def on_send(self, audio_end: float, scheduled: float) -> None:
+        now = time.perf_counter()
+        self.sent_audio.append(audio_end)
+        self.sent_at.append(now)
+        self.lateness_ms.append(max(0.0, now - scheduled) * 1000.0)
+
+    def on_update(self, update: dict, now: Optional[float] = None) -> None:
+        now = time.perf_counter() if now is None else now
+        kind = str(update.get("type") or ("final" if _is_final(update) else "partial"))
+        self.received.append((now, kind))
+        if kind == "error":
+            if update.get("error") == "capacity":
+                self.status = "rejected"
+            self.error = str(update.get("detail") or update.get("error"))
+            return
+        if not self.sent_at:
+            return
+        latest = max(0, bisect.bisect_right(self.sent_at, now) - 1)
+        self.update_lag_ms.append((now - self.sent_at[latest]) * 1000.0)
+        if _is_final(update):
+            end = _audio_end(update)
+            if end is not None:
+                # The frame completing the segment is the first reaching its end.
+                idx = min(bisect.bisect_left(self.sent_audio, end - 1e-6), latest)
+            else:
+                idx = latest
+            self.final_ms.append((now - self.sent_at[idx]) * 1000.0)
+        elif self.first_partial_ms is None and kind == "partial":
+            self.first_partial_ms = (now - self.sent_at[0]) * 1000.0
+
+
+def summarise(traces: Sequence[ClientTrace], *, audio_seconds: float, wall_seconds: float) -> Dict[str, Any]:
+    """Aggregate client traces into the report's latency and connection sections."""
+    statuses = [t.status for t in traces]
+    return {
+        "clients": len(traces),
+        "completed": statuses.count("completed"),
+        "rejected": statuses.count("rejected"),
+        "failed": statuses.count("failed"),
+        "dropped": statuses.count("dropped"),
+        "close_codes": sorted({t.close_code for t in traces if t.close_code is not None}),
+        "errors": sorted({t.error for t in traces if t.error})[:10],
+        "frames_sent": sum(len(t.sent_at) for t in traces),
+        "updates_received": sum(len(t.received) for t in traces),
+        "audio_seconds": audio_seconds,
+        "wall_seconds": wall_seconds,
+        "latency_ms": {
+            "first_partial": distribution([t.first_partial_ms for t in traces if t.first_partial_ms is not None]),
+            "final": distribution([v for t in traces for v in t.final_ms]),
+            "update": distribution([v for t in traces for v in t.update_lag_ms]),
+            "send_lateness": distribution([v for t in traces for v in t.lateness_ms]),
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Clients
+# ---------------------------------------------------------------------------
+
+def client_url(base: str, endpoint: str, params: Dict[str, Any]) -> str:
+    """Turn an ``http(s)://host:port`` base into the websocket URL."""
+    parts = urlsplit(base if "://" in base else f"http://{base}")
+    scheme = "wss" if parts.scheme in ("https", "wss") else "ws"
+    query = urlencode({k: v for k, v in params.items() if v not in (None, "")})
+    return f"{scheme}://{parts.netloc}{ENDPOINTS[endpoint]}" + (f"?{query}" if query else "")
+
+
+async def run_client(
+    client_id: int,
+    url: str,
+    audio: List[Tuple[bytes, float]],
+    *,
+    speed: float,
+    jitter_ms: float,
+    drain: float,
+    start_delay: float = 0.0,
+    seed: int = 0,
+) -> ClientTrace:
+    """Stream *audio* over one connection and record its timings."""
+    import websockets
+
+    trace = ClientTrace(client_id)
+    offsets = schedule([end for _, end in audio], speed, jitter_ms, random.Random(seed + client_id))
+    await asyncio.sleep(start_delay)
+    try:
+        ws = await websockets.connect(url, open_timeout=10, max_size=None)
+    except Exception as exc:
+        trace.status, trace.error = "failed", f"connect: {exc}"
+        return trace
+
+    async def receive() -> None:
+        async for message in ws:
+            if isinstance(message, str):
+                try:
+                    update = json.loads(message)
+                except ValueError:
+                    continue
+                if isinstance(update, dict):
+                    trace.on_update(update)
+
+    receiver = asyncio.create_task(receive())
+    try:
+        started = time.perf_counter()
+        for (chunk, end), offset in zip(audio, offsets):
+            delay = started + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if receiver.done():
+                break
+            await ws.send(chunk)
+            trace.on_send(end, started + offset)
+        if not receiver.done():
+            # Give trailing partials/finals time to arrive before hanging up.
+            await asyncio.wait([receiver], timeout=drain)
+    except Exception as exc:
+        trace.error = trace.error or str(exc)
+    finally:
+        receiver.cancel()
+        await ws.close()
+        trace.close_code = ws.close_code
+    if trace.status == "pending":
+        finished = len(trace.sent_at) == len(audio)
+        clean = trace.close_code in (1000, None) or finished and trace.close_code == 1005
+        if trace.close_code == CAPACITY_CLOSE_CODE:
+            trace.status = "rejected"
+        else:
+            trace.status = "completed" if finished and clean else "dropped"
+    return trace
+
+
+async def run_load(
+    url: str,
+    audio: List[Tuple[bytes, float]],
+    *,
+    clients: int,
+    speed: float,
+    jitter_ms: float,
+    ramp: float,
+    drain: float,
+    seed: int = 0,
+) -> Tuple[List[ClientTrace], float]:
+    """Run *clients* connections, started evenly over *ramp* seconds."""
+    started = time.perf_counter()
+    step = ramp / clients if clients > 1 else 0.0
+    traces = await asyncio.gather(
+        *(
+            run_client(i, url, audio, speed=speed, jitter_ms=jitter_ms, drain=drain, start_delay=i * step, seed=seed)
+            for i in range(clients)
+        )
+    )
+    return list(traces), time.perf_counter() - started
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+def fetch_json(base: str, path: str, timeout: float = 5.0) -> Any:
+    with urllib.request.urlopen(base.rstrip("/") + path, timeout=timeout) as response:  # noqa: S310 – local URL
+        return json.loads(response.read().decode())
+
+
+def server_metrics(base: str) -> Dict[str, Any]:
+    """Collect the server's streaming metrics; unavailable endpoints are skipped."""
+    metrics: Dict[str, Any] = {}
+    for path in METRIC_PATHS:
+        try:
+            metrics[path] = fetch_json(base, path)
+        except (urllib.error.URLError, OSError, ValueError) as exc:
+            metrics[path] = {"unavailable": str(exc)}
+    return metrics
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app: str = "backend.main:app", timeout: float = 120.0) -> Tuple[subprocess.Popen, str]:
+    """Launch uvicorn on a free loopback port and wait until it answers."""
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    cmd = [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, cwd=os.getcwd())  # noqa: S603 – fixed argv
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+        try:
+            fetch_json(base, "/ws/stream/capacity", timeout=1.0)
+            return proc, base
+        except (urllib.error.URLError, OSError, ValueError):
+            time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError(f"uvicorn did not answer on {base} within {timeout:.0f}s")
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ws_loadgen", description=__doc__.split("\n\n")[0])
+    target = parser.add_argument_group("target")
+    target.add_argument("--url", default="http://127.0.0.1:8000", help="server base URL (default: %(default)s)")
+    target.add_argument("--serve", action="store_true", help="start uvicorn backend.main:app on a free local port")
+    target.add_argument("--app", default="backend.main:app", help="ASGI app for --serve (default: %(default)s)")
+    target.add_argument("--endpoint", choices=sorted(ENDPOINTS), default="vosk")
+    target.add_argument("--engine", help="engine for /ws/stream (vosk, whisper, azure_speech; default vosk)")
+    target.add_argument(
+        "--model", help="Vosk model folder under <base_dir>/models, or Whisper size for --engine whisper (default: server's)"
+    )
+    target.add_argument("--param", action="append", default=[], metavar="KEY=VALUE", help="extra query parameter")
+
+    load = parser.add_argument_group("load")
+    load.add_argument("-n", "--clients", type=int, default=10)
+    load.add_argument("--ramp", type=float, default=0.0, help="seconds over which clients connect")
+    load.add_argument("--speed", type=float, default=1.0, help="pace multiplier, 0 = as fast as possible")
+    load.add_argument("--jitter-ms", type=float, default=0.0, help="uniform ± jitter per frame")
+    load.add_argument("--chunk-ms", type=int, default=100)
+    load.add_argument("--drain", type=float, default=3.0, help="seconds to wait for results after the last frame")
+    load.add_argument("--seed", type=int, default=0)
+
+    audio = parser.add_argument_group("audio")
+    audio.add_argument("--wav", help="16-bit PCM WAV to stream (any rate/channels)")
+    audio.add_argument("--duration", type=float, default=10.0, help="seconds of generated audio without --wav")
+
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON ('-' for stdout only)")
+    return parser
+
+
+def _format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"clients {report['clients']}: {report['completed']} completed, {report['rejected']} rejected, "
+        f"{report['failed']} failed to connect, {report['dropped']} dropped",
+        f"frames sent {report['frames_sent']}, updates received {report['updates_received']}, "
+        f"{report['audio_seconds']:.1f}s audio per client in {report['wall_seconds']:.1f}s",
+    ]
+    if report["close_codes"]:
+        lines.append(f"close codes: {report['close_codes']}")
+    for error in report["errors"]:
+        lines.append(f"error: {error}")
+    lines.append(f"{'latency (ms)':<16}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name, dist in report["latency_ms"].items():
+        lines.append(
+            f"{name:<16}{dist['count']:>8}{dist['p50']:>10.1f}{dist['p95']:>10.1f}{dist['p99']:>10.1f}{dist['max']:>10.1f}"
+        )
+    lines.append("server metrics:")
+    for path, metrics in report.get("server", {}).items():
+        lines.append(f"  {path}: {json.dumps(metrics, default=str)}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.clients < 1:
+        raise SystemExit("--clients must be at least 1")
+
+    if args.wav:
+        pcm, rate = load_wav(args.wav)
+    else:
+        pcm, rate = generate_speech(args.duration, seed=args.seed), RATE
+    audio = frames(pcm, rate, args.chunk_ms)
+
+    params: Dict[str, Any] = dict(p.split("=", 1) for p in args.param if "=" in p)
+    if args.endpoint == "stream":
+        params.setdefault("engine", args.engine or "vosk")
+    if args.model:
+        params.setdefault("model", args.model)
+    if rate != RATE:
+        params.setdefault("rate", rate)  # the server resamples
+
+    proc = None
+    base = args.url
+    if args.serve:
+        proc, base = start_server(args.app)
+    try:
+        url = client_url(base, args.endpoint, params)
+        traces, wall = asyncio.run(
+            run_load(
+                url,
+                audio,
+                clients=args.clients,
+                speed=args.speed,
+                jitter_ms=args.jitter_ms,
+                ramp=args.ramp,
+                drain=args.drain,
+                seed=args.seed,
+            )
+        )
+        report = summarise(traces, audio_seconds=len(pcm) / (rate * 2), wall_seconds=wall)
+        report["url"] = url
+        report["server"] = server_metrics(base)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    if args.json == "-":
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print(_format_report(report))
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2, default=str)
+    return 0 if report["completed"] == report["clients"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
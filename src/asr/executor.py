@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+"""Off-loop execution of batch transcriptions.
+
+The transcribers are ``async def`` but decode synchronously: Whisper's
+``model.transcribe`` and Vosk's Kaldi loop would hold the event loop for
+the length of the upload and stall every live websocket.
+:class:`TranscriptionExecutor` runs each job elsewhere and only awaits its
+result:
+
+* engines with workers configured in ``asr_pool_workers``
+  (``"vosk=2,whisper=1"``) get a dedicated process pool.  Workers start
+  with the engine's ``asr_preload_models`` already loading, and each keeps
+  its models resident in its own :class:`ModelRegistry` between jobs;
+* all other engines (Azure by default, or any engine set to ``0``) run on a
+  thread, which is enough for network-bound providers.
+
+Per engine, :meth:`TranscriptionExecutor.stats` reports jobs in flight,
+queue depth, and wait (submit → start) and run times.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+from ..core.container import global_container
+from ..core.exceptions import ConfigurationError
+from ..core.interfaces.config_service import IConfigurationService
+from .exceptions import TranscriptionError
+
+logger = logging.getLogger("ambient_scribe")
+
+__all__ = ["TranscriptionExecutor", "get_transcription_executor", "parse_pool_workers"]
+
+_HISTORY = 200  # jobs per engine kept for wait / run percentiles
+
+
+def parse_pool_workers(spec: str) -> Dict[str, int]:
+    """Parse ``"vosk=2, whisper=1"`` into ``{"vosk": 2, "whisper": 1}``."""
+    workers: Dict[str, int] = {}
+    for item in filter(None, (p.strip() for p in spec.split(","))):
+        engine, sep, count = item.partition("=")
+        try:
+            workers[engine.strip().lower()] = int(count)
+        except ValueError:
+            sep = ""
+        if not sep:
+            raise ConfigurationError(f"Invalid asr_pool_workers entry '{item}'")
+    return workers
+
+
+def _default_workers() -> Dict[str, int]:
+    return {"vosk": max(1, (os.cpu_count() or 1) // 2), "whisper": 1}
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def _init_worker(engine: str) -> None:
+    """Pool initializer: bootstrap DI and start warming the engine's models."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the API process handles Ctrl-C
+    try:
+        import src.core.bootstrap  # noqa: F401 – registers configuration & factories
+        from .model_registry import get_model_registry
+
+        get_model_registry(engines={engine})
+    except Exception as exc:  # pragma: no cover – engine not installed
+        logger.warning("%s transcription worker could not preload models: %s", engine, exc)
+
+
+def _noop() -> int:
+    return os.getpid()
+
+
+def _run_job(provider_type: str, options: Dict[str, Any], audio_path: str) -> Tuple[str, float, float]:
+    """Transcribe one file; returns ``(transcript, started, finished)`` wall times."""
+    started = time.time()
+    from src.core.bootstrap import container
+    from src.core.factories.transcriber_factory import TranscriberFactory
+
+    transcriber = container.resolve(TranscriberFactory).create(provider_type, **options)
+    transcript = asyncio.run(transcriber.transcribe(Path(audio_path)))
+    return transcript, started, time.time()
+
+
+# ---------------------------------------------------------------------------
+# API side
+# ---------------------------------------------------------------------------
+
+class _EngineStats:
+    def __init__(self) -> None:
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.wait: Deque[float] = deque(maxlen=_HISTORY)
+        self.run: Deque[float] = deque(maxlen=_HISTORY)
+
+
+def _summary(values: Deque[float]) -> dict:
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    return {
+        "mean": sum(ordered) / len(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+class TranscriptionExecutor:
+    """Run transcriptions in per-engine process pools (or threads) and await them."""
+
+    def __init__(
+        self,
+        workers: Optional[Dict[str, int]] = None,
+        *,
+        start_method: str = "spawn",
+        warm_engines: Iterable[str] = (),
+    ) -> None:
+        self.workers = dict(_default_workers() if workers is None else workers)
+        self.start_method = start_method
+        self.warm_engines = tuple(warm_engines)
+        self._pools: Dict[str, ProcessPoolExecutor] = {}
+        self._stats: Dict[str, _EngineStats] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_settings(cls) -> TranscriptionExecutor:
+        """Build an executor from ``asr_pool_workers`` (defaults when empty).
+
+        Engines named in ``asr_preload_models`` are the ones :meth:`warm`
+        starts by default.
+        """
+        try:
+            cfg = global_container.resolve(IConfigurationService)
+            spec = str(cfg.get("asr_pool_workers", "") or "")
+            preload = str(cfg.get("asr_preload_models", "") or "")
+        except Exception:  # pragma: no cover – DI not ready
+            spec, preload = "", ""
+        workers = _default_workers()
+        workers.update(parse_pool_workers(spec))
+        warm = {item.partition(":")[0].strip() for item in preload.split(",") if item.strip()}
+        return cls(workers, warm_engines=sorted(warm))
+
+    # ------------------------------------------------------------------
+    def _pool(self, engine: str) -> Optional[ProcessPoolExecutor]:
+        count = self.workers.get(engine, 0)
+        if count <= 0:
+            return None
+        with self._lock:
+            pool = self._pools.get(engine)
+            if pool is None:
+                pool = ProcessPoolExecutor(
+                    max_workers=count,
+                    mp_context=get_context(self.start_method),
+                    initializer=_init_worker,
+                    initargs=(engine,),
+                )
+                self._pools[engine] = pool
+                logger.info("Started %d %s transcription worker(s)", count, engine)
+            return pool
+
+    def _discard_pool(self, engine: str, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pools.get(engine) is pool:
+                del self._pools[engine]
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    def warm(self, *engines: str) -> None:
+        """Start the pools of *engines* (``warm_engines`` by default) now.
+
+        Workers begin loading their preloaded models immediately, so the
+        first upload does not pay for process start-up and model load.
+        """
+        for engine in engines or self.warm_engines:
+            pool = self._pool(engine)
+            if pool is not None:
+                for _ in range(self.workers[engine]):
+                    pool.submit(_noop)
+
+    # ------------------------------------------------------------------
+    async def run(self, provider_type: str, options: Dict[str, Any], audio_path: str | Path) -> str:
+        """Transcribe *audio_path* off the event loop and return the transcript."""
+        engine = provider_type.lower()
+        with self._lock:
+            stats = self._stats.setdefault(engine, _EngineStats())
+            stats.submitted += 1
+            stats.in_flight += 1
+        submitted = time.time()
+        pool = self._pool(engine)
+        future: Future
+        if pool is not None:
+            future = pool.submit(_run_job, engine, options, str(audio_path))
+        else:
+            future = Future()
+            threading.Thread(
+                target=self._run_in_thread, args=(future, engine, options, str(audio_path)), daemon=True
+            ).start()
+        try:
+            transcript, started, finished = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            self._finish(stats, ok=False)
+            raise
+        except BrokenProcessPool as exc:
+            # A worker died (e.g. OOM); the next job gets a fresh pool.
+            if pool is not None:
+                self._discard_pool(engine, pool)
+            self._finish(stats, ok=False)
+            raise TranscriptionError(f"{engine} transcription worker crashed") from exc
+        except TranscriptionError:
+            self._finish(stats, ok=False)
+            raise
+        except Exception as exc:
+            self._finish(stats, ok=False)
+            raise TranscriptionError(str(exc)) from exc
+        self._finish(stats, ok=True, wait=max(0.0, started - submitted), run=finished - started)
+        return transcript
+
+    @staticmethod
+    def _run_in_thread(future: Future, engine: str, options: Dict[str, Any], audio_path: str) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(_run_job(engine, options, audio_path))
+        except BaseException as exc:  # noqa: BLE001 – forwarded to the awaiting caller
+            future.set_exception(exc)
+
+    def _finish(self, stats: _EngineStats, *, ok: bool, wait: float = 0.0, run: float = 0.0) -> None:
+        with self._lock:
+            stats.in_flight -= 1
+            if ok:
+                stats.completed += 1
+                stats.wait.append(wait)
+                stats.run.append(run)
+            else:
+                stats.failed += 1
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:  # noqa: D401
+        """Per-engine workers, queue depth and wait / run time summaries (seconds)."""
+        with self._lock:
+            out = {}
+            for engine in sorted(set(self._stats) | {e for e, n in self.workers.items() if n > 0}):
+                s = self._stats.get(engine) or _EngineStats()
+                workers = self.workers.get(engine, 0)
+                out[engine] = {
+                    "mode": "process" if workers > 0 else "thread",
+                    "workers": workers,
+                    "started": engine in self._pools,
+                    "in_flight": s.in_flight,
+                    "queued": max(0, s.in_flight - workers) if workers > 0 else 0,
+                    "submitted": s.submitted,
+                    "completed": s.completed,
+                    "failed": s.failed,
+                    "wait_seconds": _summary(s.wait),
+                    "run_seconds": _summary(s.run),
+                }
+            return out
+
+    # ------------------------------------------------------------------
+    def shutdown(self, wait: bool = True) -> None:  # noqa: D401
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_EXECUTOR: TranscriptionExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_transcription_executor() -> TranscriptionExecutor:
+    """Return the process-wide executor built from the settings."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = TranscriptionExecutor.from_settings()
+        return _EXECUTOR
@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+"""Persistent background transcription jobs for long recordings.
+
+``POST /transcribe`` keeps the request open for the whole decode.  An hour
+of audio outlives proxy timeouts, and the retries double the work.  Jobs
+decouple submission from decoding:
+
+* :class:`JobStore` keeps jobs in a local SQLite database (WAL mode), so
+  queued and half-finished jobs survive a restart.
+* :class:`JobRunner` workers claim the highest-priority queued job, cut the
+  audio into segments of about ``asr_job_segment_s`` seconds at the
+  quietest point near each boundary, and transcribe them one by one on the
+  :class:`TranscriptionExecutor`.  After every segment the processed audio
+  seconds and the transcript so far are written back.  Clients polling or
+  streaming the job see progress, and a job interrupted by a restart
+  resumes after its last completed segment.  A job claimed
+  ``asr_job_max_attempts`` times without finishing (e.g. one that keeps
+  crashing the process) is failed instead of requeued.
+* A job's uploaded audio is removed as soon as it reaches a terminal state.
+"""
+
+import asyncio
+import logging
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, List, Optional
+
+from ..audio.pcm_store import DecodedAudio, get_pcm_store
+from ..audio.vad import next_cut
+from ..core.container import global_container
+from ..core.interfaces.config_service import IConfigurationService
+from .exceptions import TranscriptionError
+from .executor import TranscriptionExecutor, get_transcription_executor
+from .model_spec import parse_model_spec
+
+logger = logging.getLogger("ambient_scribe")
+
+__all__ = ["Job", "JobStore", "JobRunner", "get_job_runner", "jobs_dir", "next_cut", "TERMINAL_STATES"]
+
+TERMINAL_STATES = ("completed", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    status      TEXT NOT NULL,
+    priority    INTEGER NOT NULL DEFAULT 0,
+    model       TEXT NOT NULL,
+    model_path  TEXT,
+    language    TEXT,
+    audio_path  TEXT NOT NULL,
+    duration_s  REAL,
+    progress_s  REAL NOT NULL DEFAULT 0,
+    transcript  TEXT NOT NULL DEFAULT '',
+    error       TEXT,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    created_at  REAL NOT NULL,
+    started_at  REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created_at);
+"""
+
+
+@dataclass
+class Job:
+    id: str
+    status: str
+    priority: int
+    model: str
+    model_path: Optional[str]
+    language: Optional[str]
+    audio_path: str
+    duration_s: Optional[float]
+    progress_s: float
+    transcript: str
+    error: Optional[str]
+    attempts: int
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATES
+
+    def to_dict(self, *, transcript: bool = True) -> dict:
+        """Public view of the job (no server paths)."""
+        data = asdict(self)
+        data.pop("audio_path")
+        data.pop("model_path")
+        data["progress"] = min(1.0, self.progress_s / self.duration_s) if self.duration_s else 0.0
+        if not transcript:
+            data.pop("transcript")
+        return data
+
+
+class JobStore:
+    """SQLite-backed job table; safe to share between threads."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    def create(
+        self,
+        audio_path: str | Path,
+        model: str,
+        *,
+        model_path: Optional[str] = None,
+        language: Optional[str] = None,
+        priority: int = 0,
+        job_id: Optional[str] = None,
+    ) -> Job:
+        job_id = job_id or uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, priority, model, model_path, language, audio_path, created_at)"
+                " VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)",
+                (job_id, int(priority), model, model_path, language, str(audio_path), time.time()),
+            )
+        return self.get(job_id)  # type: ignore[return-value]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(**dict(row)) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[Job]:
+        query, args = "SELECT * FROM jobs", ()
+        if status:
+            query, args = query + " WHERE status = ?", (status,)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY created_at DESC LIMIT ?", (*args, limit)).fetchall()
+        return [Job(**dict(row)) for row in rows]
+
+    # ------------------------------------------------------------------
+    def claim(self) -> Optional[Job]:
+        """Atomically move the highest-priority queued job to ``running``."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' ORDER BY priority DESC, created_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1,"
+                        " started_at = COALESCE(started_at, ?) WHERE id = ?",
+                        (time.time(), row["id"]),
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return self.get(row["id"]) if row is not None else None
+
+    def update_progress(self, job_id: str, progress_s: float, transcript: str, duration_s: Optional[float] = None) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET progress_s = ?, transcript = ?, duration_s = COALESCE(?, duration_s) WHERE id = ?",
+                (progress_s, transcript, duration_s, job_id),
+            )
+
+    def finish(self, job_id: str, transcript: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'completed', transcript = ?, progress_s = COALESCE(duration_s, progress_s),"
+                " finished_at = ? WHERE id = ? AND status = 'running'",
+                (transcript, time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+                (error, time.time(), job_id),
+            )
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; False if it had already finished."""
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id),
+            )
+        return cur.rowcount > 0
+
+    def fail_interrupted(self, max_attempts: int) -> List[Job]:
+        """Fail jobs left ``running`` that were already claimed *max_attempts* times."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM jobs WHERE status = 'running' AND attempts >= ?", (max_attempts,)
+            ).fetchall()
+            self._db.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Interrupted ' || attempts || ' times; giving up',"
+                " finished_at = ? WHERE status = 'running' AND attempts >= ?",
+                (time.time(), max_attempts),
+            )
+        return [Job(**dict(row)) for row in rows]
+
+    def requeue_interrupted(self) -> int:
+        """Return jobs left ``running`` by a previous process to the queue."""
+        with self._lock:
+            cur = self._db.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+        return cur.rowcount
+
+    def counts(self) -> dict:  # noqa: D401
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def close(self) -> None:  # noqa: D401
+        with self._lock:
+            self._db.close()
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+class JobRunner:
+    """Async workers that drain the :class:`JobStore` in priority order."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        *,
+        workers: int = 2,
+        segment_seconds: float = 30.0,
+        executor: Optional[TranscriptionExecutor] = None,
+        poll_interval: float = 1.0,
+        max_attempts: int = 3,
+    ) -> None:
+        self.store = store
+        self.workers = max(1, workers)
+        self.segment_seconds = segment_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.poll_interval = poll_interval
+        self._executor = executor
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+
+    @property
+    def executor(self) -> TranscriptionExecutor:
+        return self._executor or get_transcription_executor()
+
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Start the workers on the running event loop (idempotent)."""
+        if self._tasks:
+            return
+        for job in self.store.fail_interrupted(self.max_attempts):
+            logger.error("Transcription job %s interrupted %d times; marking it failed", job.id, job.attempts)
+            self._remove_upload(job)
+        requeued = self.store.requeue_interrupted()
+        if requeued:
+            logger.info("Resuming %d transcription job(s) interrupted by a restart", requeued)
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:  # noqa: D401
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def submit(self, audio_path: str | Path, model: str, **kwargs: Any) -> Job:
+        """Queue a job for *audio_path* and wake an idle worker."""
+        job = self.store.create(audio_path, model, **kwargs)
+        if self._wake is not None:
+            self._wake.set()
+        return job
+
+    # ------------------------------------------------------------------
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = self.store.claim()
+            if job is None:
+                assert self._wake is not None
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self.process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 – recorded on the job
+                logger.warning("Transcription job %s failed: %s", job.id, exc)
+                self.store.fail(job.id, str(exc))
+                self._remove_upload(job)
+
+    async def process(self, job: Job) -> None:
+        """Transcribe *job* segment by segment from its recorded progress."""
+        provider_type, options = parse_model_spec(job.model, job.model_path).to_factory_args()
+        audio = await asyncio.to_thread(self._convert, job.audio_path)
+        transcript = job.transcript
+
+        rate, total = audio.rate, len(audio.samples)
+        duration = audio.duration
+        position = min(total, int(round(job.progress_s * rate)))
+        segment = max(1, int(self.segment_seconds * rate))
+        if job.duration_s is None:
+            self.store.update_progress(job.id, job.progress_s, transcript, duration)
+        while position < total:
+            current = self.store.get(job.id)
+            if current is None or current.status != "running":
+                if current is not None and current.done:
+                    self._remove_upload(job)
+                return
+            final = position + segment >= total
+            cut = next_cut(audio.view(position, position + segment), rate, final=final)
+            seg_path = audio.write_wav(Path(job.audio_path).parent / f"segment_{position}.wav", position, position + cut)
+            try:
+                text = await self.executor.run(provider_type, options, seg_path)
+            finally:
+                seg_path.unlink(missing_ok=True)
+            if isinstance(text, str) and text.startswith("ERROR"):
+                raise TranscriptionError(text.removeprefix("ERROR:").strip())
+            text = (text or "").strip()
+            if text:
+                transcript = f"{transcript} {text}" if transcript else text
+            position += cut
+            self.store.update_progress(job.id, position / rate, transcript)
+
+        self.store.finish(job.id, transcript)
+        # Completed, or cancelled during the last segment.
+        self._remove_upload(job)
+        logger.info("Transcription job %s finished (%.0fs audio)", job.id, duration)
+
+    @staticmethod
+    def _remove_upload(job: Job) -> None:
+        """Drop a finished job's work dir; its transcript lives in the database."""
+        shutil.rmtree(Path(job.audio_path).parent, ignore_errors=True)
+
+    @staticmethod
+    def _convert(audio_path: str) -> DecodedAudio:
+        try:
+            return get_pcm_store().open(audio_path)
+        except Exception as exc:
+            raise TranscriptionError(f"Audio conversion failed: {exc}") from exc
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:  # noqa: D401
+        return {"workers": self.workers, "running": bool(self._tasks), "jobs": self.store.counts()}
+
+
+_RUNNER: JobRunner | None = None
+_RUNNER_LOCK = threading.Lock()
+
+
+def jobs_dir() -> Path:
+    """Directory holding the job database and uploaded audio."""
+    try:
+        base_dir = Path(global_container.resolve(IConfigurationService).get("base_dir", Path("./app_data")))
+    except Exception:  # pragma: no cover – DI not ready
+        base_dir = Path("./app_data")
+    return base_dir / "jobs"
+
+
+def get_job_runner() -> JobRunner:
+    """Return the process-wide runner over ``<base_dir>/jobs/jobs.sqlite3``."""
+    global _RUNNER
+    with _RUNNER_LOCK:
+        if _RUNNER is None:
+            try:
+                cfg = global_container.resolve(IConfigurationService)
+                workers = int(cfg.get("asr_job_workers", 2))
+                segment = float(cfg.get("asr_job_segment_s", 30))
+                max_attempts = int(cfg.get("asr_job_max_attempts", 3))
+            except Exception:  # pragma: no cover – DI not ready
+                workers, segment, max_attempts = 2, 30.0, 3
+            _RUNNER = JobRunner(
+                JobStore(jobs_dir() / "jobs.sqlite3"),
+                workers=workers,
+                segment_seconds=segment,
+                max_attempts=max_attempts,
+            )
+        return _RUNNER
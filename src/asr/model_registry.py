@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+"""Process-wide registry of loaded ASR models.
+
+Every component that needs a Vosk or Whisper model – the real-time
+websockets, the streaming handlers and the batch transcribers – acquires it
+through :func:`get_model_registry` instead of loading its own copy.  Models
+are keyed by ``(engine, model, device)`` and reference counted; models no
+longer referenced stay resident until the configured memory budget forces
+least-recently-used eviction.
+
+Usage::
+
+    with get_model_registry().acquire("vosk", "/models/small-english") as model:
+        rec = KaldiRecognizer(model, 16000)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional
+
+from ..core.container import global_container
+from ..core.exceptions import ModelLoadError
+from ..core.interfaces.config_service import IConfigurationService
+
+logger = logging.getLogger("ambient_scribe")
+
+__all__ = [
+    "ModelKey",
+    "ModelLease",
+    "ModelRegistry",
+    "get_model_registry",
+]
+
+Loader = Callable[[str, str], Any]
+Sizer = Callable[[Any, str], int]
+
+
+class ModelKey(NamedTuple):
+    engine: str
+    model: str
+    device: str = "cpu"
+
+
+@dataclass
+class _Entry:
+    key: ModelKey
+    model: Any = None
+    size_bytes: int = 0
+    refs: int = 0
+    pinned: bool = False
+    load_seconds: float = 0.0
+    loaded_at: float = 0.0
+    last_used: float = field(default_factory=time.time)
+    ready: threading.Event = field(default_factory=threading.Event)
+    error: Optional[BaseException] = None
+
+
+class ModelLease:
+    """Reference to a registry model; release it (or use ``with``) when done."""
+
+    def __init__(self, registry: ModelRegistry, key: ModelKey, model: Any) -> None:
+        self._registry = registry
+        self.key = key
+        self.model = model
+        self._released = False
+
+    # ------------------------------------------------------------------
+    def release(self) -> None:  # noqa: D401
+        if not self._released:
+            self._released = True
+            self._registry._release(self.key)
+
+    # ------------------------------------------------------------------
+    def __enter__(self) -> Any:
+        return self.model
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.release()
+
+
+# ---------------------------------------------------------------------------
+# Default loaders / size estimators
+# ---------------------------------------------------------------------------
+
+def _normalise_vosk(model: str) -> str:
+    """Map a model folder name or relative path to one canonical absolute path."""
+    path = Path(model)
+    if not path.exists():
+        try:
+            cfg = global_container.resolve(IConfigurationService)
+            base_dir = Path(cfg.get("base_dir", Path("./app_data")))
+        except Exception:  # pragma: no cover – DI not ready
+            base_dir = Path("./app_data")
+        candidate = base_dir / "models" / model
+        if candidate.exists():
+            path = candidate
+    return str(path.resolve()) if path.exists() else model
+
+
+def _load_vosk(model: str, _device: str) -> Any:
+    from vosk import Model  # type: ignore
+
+    return Model(model)
+
+
+def _size_vosk(_model: Any, model: str) -> int:
+    # Kaldi graphs are mapped into RAM nearly 1:1 with their on-disk size.
+    total = 0
+    for root, _dirs, files in os.walk(model):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:  # pragma: no cover – racing deletes
+                pass
+    return total
+
+
+def _load_whisper(model: str, device: str) -> Any:
+    import whisper  # type: ignore
+
+    try:
+        cfg = global_container.resolve(IConfigurationService)
+        download_root = Path(str(cfg.get("whisper_models_dir", Path("./app_data/whisper_models"))))
+    except Exception:  # pragma: no cover – DI not ready
+        download_root = Path("./app_data/whisper_models")
+    download_root.mkdir(parents=True, exist_ok=True)
+    return whisper.load_model(name=model, download_root=str(download_root), device=device)
+
+
+def _size_whisper(model: Any, _model: str) -> int:
+    try:
+        return int(sum(p.numel() * p.element_size() for p in model.parameters()))
+    except Exception:  # pragma: no cover – non-torch stand-ins
+        return 0
+
+
+class ModelRegistry:
+    """Reference-counted model cache with a RAM budget and LRU eviction."""
+
+    def __init__(self, *, budget_bytes: int = 0) -> None:
+        self.budget_bytes = budget_bytes  # 0 → unlimited
+        self._entries: "OrderedDict[ModelKey, _Entry]" = OrderedDict()
+        self._loaders: Dict[str, tuple[Loader, Sizer | None]] = {
+            "vosk": (_load_vosk, _size_vosk),
+            "whisper": (_load_whisper, _size_whisper),
+        }
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._total_load_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    def register_loader(self, engine: str, loader: Loader, sizer: Sizer | None = None) -> None:  # noqa: D401
+        """Register (or replace) the loader used for *engine*."""
+        with self._lock:
+            self._loaders[engine] = (loader, sizer)
+
+    # ------------------------------------------------------------------
+    def acquire(self, engine: str, model: str | Path, device: str = "cpu") -> ModelLease:
+        """Return a lease on the requested model, loading it on first use.
+
+        Concurrent callers asking for a model that is still loading wait for
+        the single in-flight load instead of starting their own.
+        """
+        model = _normalise_vosk(str(model)) if engine == "vosk" else str(model)
+        key = ModelKey(engine, model, device)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.error is None:
+                self._hits += 1
+                entry.refs += 1
+                entry.last_used = time.time()
+                self._entries.move_to_end(key)
+                owner = False
+            else:
+                self._misses += 1
+                entry = _Entry(key=key, refs=1)
+                self._entries[key] = entry
+                owner = True
+
+        if owner:
+            self._load(entry)
+        else:
+            entry.ready.wait()
+        if entry.error is not None:
+            with self._lock:
+                entry.refs -= 1
+            raise ModelLoadError(f"Failed to load {engine} model '{model}': {entry.error}") from entry.error
+        return ModelLease(self, key, entry.model)
+
+    # ------------------------------------------------------------------
+    def _load(self, entry: _Entry) -> None:
+        key = entry.key
+        try:
+            loader, sizer = self._loaders[key.engine]
+        except KeyError:
+            entry.error = ModelLoadError(f"No loader registered for engine '{key.engine}'")
+        else:
+            logger.info("Loading %s model '%s' on %s", key.engine, key.model, key.device)
+            started = time.perf_counter()
+            try:
+                entry.model = loader(key.model, key.device)
+                entry.size_bytes = int(sizer(entry.model, key.model)) if sizer else 0
+            except Exception as exc:
+                logger.error("Failed to load %s model '%s': %s", key.engine, key.model, exc)
+                entry.error = exc
+            entry.load_seconds = time.perf_counter() - started
+            entry.loaded_at = time.time()
+            if entry.error is None:
+                logger.info(
+                    "Loaded %s model '%s' in %.2fs (%.0f MB)",
+                    key.engine,
+                    key.model,
+                    entry.load_seconds,
+                    entry.size_bytes / 1024 / 1024,
+                )
+
+        with self._lock:
+            self._total_load_seconds += entry.load_seconds
+            if entry.error is not None:
+                # Leave no poisoned entry behind so a later acquire can retry.
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            else:
+                self._enforce_budget_locked()
+        entry.ready.set()
+
+    # ------------------------------------------------------------------
+    def _release(self, key: ModelKey) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs = max(0, entry.refs - 1)
+            entry.last_used = time.time()
+            self._enforce_budget_locked()
+
+    # ------------------------------------------------------------------
+    def _enforce_budget_locked(self) -> None:
+        if not self.budget_bytes:
+            return
+        resident = sum(e.size_bytes for e in self._entries.values())
+        for key in list(self._entries):  # oldest first
+            if resident <= self.budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry.refs or entry.pinned or not entry.ready.is_set():
+                continue
+            del self._entries[key]
+            resident -= entry.size_bytes
+            self._evictions += 1
+            logger.info(
+                "Evicted idle %s model '%s' (%.0f MB) to respect memory budget",
+                key.engine,
+                key.model,
+                entry.size_bytes / 1024 / 1024,
+            )
+        if resident > self.budget_bytes:
+            logger.warning(
+                "ASR models in use exceed memory budget (%.0f / %.0f MB)",
+                resident / 1024 / 1024,
+                self.budget_bytes / 1024 / 1024,
+            )
+
+    # ------------------------------------------------------------------
+    def preload(
+        self,
+        engine: str,
+        model: str | Path,
+        device: str = "cpu",
+        *,
+        pin: bool = False,
+    ) -> Future:
+        """Load a model on a background thread.
+
+        The returned future resolves to the model.  With ``pin=True`` the model
+        is kept resident for the lifetime of the process.
+        """
+        future: Future = Future()
+
+        def _run() -> None:
+            try:
+                lease = self.acquire(engine, model, device)
+            except BaseException as exc:  # noqa: BLE001 – forwarded to caller
+                future.set_exception(exc)
+                return
+            if pin:
+                with self._lock:
+                    entry = self._entries.get(lease.key)
+                    if entry is not None:
+                        entry.pinned = True
+            lease.release()
+            future.set_result(lease.model)
+
+        threading.Thread(target=_run, name=f"preload-{engine}", daemon=True).start()
+        return future
+
+    # ------------------------------------------------------------------
+    def evict_idle(self) -> int:  # noqa: D401
+        """Drop every unreferenced, unpinned model and return how many went."""
+        with self._lock:
+            idle = [
+                k
+                for k, e in self._entries.items()
+                if not e.refs and not e.pinned and e.ready.is_set()
+            ]
+            for key in idle:
+                del self._entries[key]
+            self._evictions += len(idle)
+            return len(idle)
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:  # noqa: D401
+        """Return hit rate, load times and residency for monitoring."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "total_load_seconds": self._total_load_seconds,
+                "resident_bytes": sum(e.size_bytes for e in self._entries.values()),
+                "budget_bytes": self.budget_bytes,
+                "models": [
+                    {
+                        "engine": e.key.engine,
+                        "model": e.key.model,
+                        "device": e.key.device,
+                        "refs": e.refs,
+                        "pinned": e.pinned,
+                        "size_bytes": e.size_bytes,
+                        "load_seconds": e.load_seconds,
+                        "loaded": e.ready.is_set(),
+                    }
+                    for e in self._entries.values()
+                ],
+            }
+
+
+_REGISTRY: ModelRegistry | None = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_model_registry(*, engines: Optional[Iterable[str]] = None) -> ModelRegistry:
+    """Return the process-wide :class:`ModelRegistry`.
+
+    The memory budget comes from ``asr_model_memory_budget_mb`` and models
+    listed in ``asr_preload_models`` (``"engine:model[,engine:model]"``) start
+    loading in the background on first access.  *engines* restricts that
+    preload to the given engines (e.g. in a single-engine worker process);
+    it only matters on the first call.
+    """
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is not None:
+            return _REGISTRY
+        try:
+            cfg = global_container.resolve(IConfigurationService)
+            budget_mb = int(cfg.get("asr_model_memory_budget_mb", 0) or 0)
+            preload = str(cfg.get("asr_preload_models", "") or "")
+            device = str(cfg.get("whisper_device", "cpu"))
+        except Exception:  # pragma: no cover – DI not ready
+            budget_mb, preload, device = 0, "", "cpu"
+        _REGISTRY = ModelRegistry(budget_bytes=budget_mb * 1024 * 1024)
+
+    wanted = set(engines) if engines is not None else None
+    for item in filter(None, (p.strip() for p in preload.split(","))):
+        engine, _, name = item.partition(":")
+        if not name:
+            logger.warning("Ignoring malformed asr_preload_models entry '%s'", item)
+            continue
+        if wanted is not None and engine not in wanted:
+            continue
+        _REGISTRY.preload(engine, name, device if engine == "whisper" else "cpu", pin=True)
+    return _REGISTRY
@@ -12,11 +12,32 @@ from .handlers import (
     WhisperStreamingHandler,
     AzureSpeechStreamingHandler,
 )
+from .azure_uploader import AzureUploadWorker, get_azure_uploader
+from .emission import EmissionPolicy
+from .ingest import negotiate_decoder
+from .recognition_pool import (
+    OverloadPolicy,
+    RecognitionWorkerPool,
+    get_recognition_pool,
+)
+from .update_queue import LatencyTracker, UpdateQueue
+from .whisper_batcher import WhisperBatchWorker, get_whisper_batcher
 from .websocket import router as websocket_router
 
 __all__ = [
     "VoskStreamingHandler",
     "WhisperStreamingHandler",
     "AzureSpeechStreamingHandler",
+    "AzureUploadWorker",
+    "get_azure_uploader",
+    "EmissionPolicy",
+    "negotiate_decoder",
+    "OverloadPolicy",
+    "RecognitionWorkerPool",
+    "get_recognition_pool",
+    "UpdateQueue",
+    "LatencyTracker",
+    "WhisperBatchWorker",
+    "get_whisper_batcher",
     "websocket_router",
 ] 
\ No newline at end of file
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+"""Background upload worker for Azure Speech streaming sessions.
+
+The REST recognition endpoint is a blocking HTTPS round trip of one to three
+seconds.  :class:`AzureSpeechStreamingHandler` therefore never posts from the
+chunk callback; it hands each finished WAV window to the shared
+:class:`AzureUploadWorker`, which runs at most ``max_concurrent`` requests at
+a time across all sessions (further windows wait in its queue) and reports
+the outcome through the callback supplied with the window.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from ...core.container import global_container
+from ...core.interfaces.config_service import IConfigurationService
+
+logger = logging.getLogger("ambient_scribe")
+
+__all__ = ["AzureUploadWorker", "get_azure_uploader"]
+
+# ``callback(result_json, error)`` – exactly one of the two is not None.
+UploadCallback = Callable[[Optional[Dict[str, Any]], Optional[BaseException]], None]
+PostFn = Callable[..., Any]
+
+
+def _requests_post(url: str, **kwargs: Any) -> Any:
+    import requests  # type: ignore
+
+    return requests.post(url, **kwargs)
+
+
+class AzureUploadWorker:
+    """Bounded thread pool posting WAV windows to the Speech REST endpoint."""
+
+    def __init__(self, max_concurrent: int = 4, *, post: PostFn | None = None, timeout: float = 30.0) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.timeout = timeout
+        self._post = post or _requests_post
+        self._pool = ThreadPoolExecutor(self.max_concurrent, thread_name_prefix="azure-upload")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._bytes_sent = 0
+        self._upload_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        url: str,
+        wav: bytes,
+        callback: UploadCallback,
+        *,
+        headers: Dict[str, str],
+        params: Dict[str, str] | None = None,
+    ) -> Future:
+        """Queue *wav* for upload and return immediately."""
+        with self._lock:
+            self._queued += 1
+        return self._pool.submit(self._upload, url, wav, callback, headers, params or {})
+
+    # ------------------------------------------------------------------
+    def _upload(
+        self,
+        url: str,
+        wav: bytes,
+        callback: UploadCallback,
+        headers: Dict[str, str],
+        params: Dict[str, str],
+    ) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+        started = time.perf_counter()
+        result: Optional[Dict[str, Any]] = None
+        error: Optional[BaseException] = None
+        try:
+            resp = self._post(url, headers=headers, params=params, data=wav, timeout=self.timeout)
+            if resp.status_code == 200:
+                result = resp.json()
+            else:
+                error = RuntimeError(f"Azure Speech API error: {resp.status_code} - {resp.text[:200]}")
+        except Exception as exc:
+            error = exc
+
+        with self._lock:
+            self._in_flight -= 1
+            self._upload_seconds += time.perf_counter() - started
+            self._bytes_sent += len(wav)
+            if error is None:
+                self._completed += 1
+            else:
+                self._failed += 1
+        try:
+            callback(result, error)
+        except Exception as cb_exc:  # pragma: no cover – misbehaving session
+            logger.error("Azure upload callback failed: %s", cb_exc)
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:  # noqa: D401
+        """Return concurrency and throughput counters."""
+        with self._lock:
+            done = self._completed + self._failed
+            return {
+                "max_concurrent": self.max_concurrent,
+                "queued": self._queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "bytes_sent": self._bytes_sent,
+                "avg_upload_ms": self._upload_seconds / done * 1000.0 if done else 0.0,
+            }
+
+    # ------------------------------------------------------------------
+    def shutdown(self, wait: bool = True) -> None:  # noqa: D401
+        self._pool.shutdown(wait=wait)
+
+
+_UPLOADER: AzureUploadWorker | None = None
+_UPLOADER_LOCK = threading.Lock()
+
+
+def get_azure_uploader() -> AzureUploadWorker:
+    """Return the process-wide upload worker.
+
+    The global concurrency limit comes from ``azure_stream_max_uploads``.
+    """
+    global _UPLOADER
+    with _UPLOADER_LOCK:
+        if _UPLOADER is None:
+            try:
+                cfg = global_container.resolve(IConfigurationService)
+                limit = int(cfg.get("azure_stream_max_uploads", 4))
+            except Exception:  # pragma: no cover – DI not ready
+                limit = 4
+            _UPLOADER = AzureUploadWorker(limit)
+        return _UPLOADER
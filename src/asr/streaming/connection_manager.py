@@ -15,6 +15,9 @@ class ConnectionManager:  # noqa: D401 – class name is explicit
     def __init__(self) -> None:
         self._active: Set[WebSocket] = set()
 
+    def __len__(self) -> int:
+        return len(self._active)
+
     # ------------------------------------------------------------------
     async def connect(self, ws: WebSocket) -> None:  # noqa: D401
         await ws.accept()
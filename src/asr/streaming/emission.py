@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+"""Per-session policy deciding which streaming updates reach the client.
+
+Recognisers report a partial hypothesis for every audio chunk, most of them
+identical to the previous one.  :class:`EmissionPolicy` lets a partial
+through only when its text changed and at least ``min_interval`` seconds
+passed since the last one.  Finals always pass and receive increasing
+segment ids.  With ``delta=True`` producers send just the new final segment
+(plus the current partial) instead of the cumulative transcript.
+"""
+
+import time
+from typing import Callable
+
+from ...core.container import global_container
+from ...core.interfaces.config_service import IConfigurationService
+
+__all__ = ["EmissionPolicy"]
+
+
+class EmissionPolicy:
+    """Rate-limit and de-duplicate partials; number final segments."""
+
+    def __init__(
+        self,
+        *,
+        min_interval: float = 0.2,
+        only_on_change: bool = True,
+        delta: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_interval = max(0.0, min_interval)
+        self.only_on_change = only_on_change
+        self.delta = delta
+        self._clock = clock
+        self._last_partial: str | None = None
+        self._last_partial_at = float("-inf")
+        self.next_segment_id = 0
+        self.partials_seen = 0
+        self.partials_emitted = 0
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_settings(cls) -> EmissionPolicy:
+        """Build a policy from the ``streaming_partial_*`` / ``streaming_delta_updates`` settings."""
+        try:
+            cfg = global_container.resolve(IConfigurationService)
+            return cls(
+                min_interval=float(cfg.get("streaming_partial_min_interval_ms", 200)) / 1000.0,
+                only_on_change=bool(cfg.get("streaming_partial_only_on_change", True)),
+                delta=bool(cfg.get("streaming_delta_updates", False)),
+            )
+        except Exception:  # pragma: no cover – DI not ready
+            return cls()
+
+    # ------------------------------------------------------------------
+    def accept_partial(self, text: str) -> bool:
+        """Return *True* if a partial with *text* should be sent now."""
+        self.partials_seen += 1
+        if self.only_on_change and text == self._last_partial:
+            return False
+        now = self._clock()
+        if now - self._last_partial_at < self.min_interval:
+            return False
+        self._last_partial = text
+        self._last_partial_at = now
+        self.partials_emitted += 1
+        return True
+
+    # ------------------------------------------------------------------
+    def accept_final(self) -> int:
+        """Register a final segment and return its segment id."""
+        segment_id = self.next_segment_id
+        self.next_segment_id += 1
+        # The next partial starts a new segment and is always news.
+        self._last_partial = None
+        self._last_partial_at = float("-inf")
+        return segment_id
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:  # noqa: D401
+        return {
+            "partials_seen": self.partials_seen,
+            "partials_emitted": self.partials_emitted,
+            "finals": self.next_segment_id,
+        }
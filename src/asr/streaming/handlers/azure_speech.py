@@ -2,12 +2,21 @@ from __future__ import annotations
 
 import io
 import queue
+import threading
 import time
 import wave
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List
+from functools import partial
+from typing import Any, Deque, Dict, Optional, Tuple
 
+import numpy as np
+
+from src.audio.ring_buffer import PCMRingBuffer
+from src.core.container import global_container
+from src.core.interfaces.config_service import IConfigurationService
 from src.utils.audio import get_audio_config
+from ..azure_uploader import AzureUploadWorker, get_azure_uploader
 import logging
 
 logger = logging.getLogger("ambient_scribe")
@@ -15,32 +24,103 @@ logger = logging.getLogger("ambient_scribe")
 
 @dataclass
 class AzureSpeechStreamingHandler:
+    """Windowed Azure Speech recogniser for real-time sessions.
+
+    Finished windows are posted by the shared :class:`AzureUploadWorker`, so
+    the chunk callback never waits on the network.  A session has at most one
+    request in flight; audio keeps buffering until it returns.
+
+    ``mode="window"`` posts whatever accumulated every few seconds.
+    ``mode="segment"`` cuts the audio at pauses (or after *max_segment*
+    seconds), uploads every segment exactly once under a sequence id and
+    merges the results in order; all-silent segments are never sent.  On
+    :meth:`close` the trailing segment is uploaded and waited for (up to
+    *close_timeout* seconds) so its final is published before the session
+    queue closes.
+    """
+
     api_key: str
     endpoint: str
     update_queue: queue.Queue
-    buf: List[bytes] = field(default_factory=list)
+    buf: PCMRingBuffer = field(init=False, repr=False)
     last_time: float = field(default_factory=time.time)
     start_time: float = field(default_factory=time.time)
     chunk_duration: int = 45
     full_transcription: str = ""
+    uploader: Optional[AzureUploadWorker] = None  # None → process-wide worker
+    mode: Optional[str] = None  # "window" | "segment"; None → ``azure_stream_mode``
+    min_segment: float = 1.0  # seconds before a pause may close a segment
+    max_segment: float = 15.0  # hard cut when nobody pauses
+    silence_duration: float = 0.5  # trailing quiet needed to close a segment
+    silence_threshold: float = 0.01  # RMS (full scale = 1.0) treated as silence
+    close_timeout: float = 10.0  # seconds close() waits for outstanding segments
+    _inflight: bool = field(init=False, default=False, repr=False)
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock, repr=False)
+    _pending: Deque[Tuple[int, bytes]] = field(init=False, default_factory=deque, repr=False)
+    _results: Dict[int, str] = field(init=False, default_factory=dict, repr=False)
+    _next_seq: int = field(init=False, default=0, repr=False)
+    _merged_seq: int = field(init=False, default=0, repr=False)
+    _published_seq: int = field(init=False, default=0, repr=False)  # segments whose finals are out
+    _published: threading.Condition = field(init=False, repr=False)
+    _silent_run: int = field(init=False, default=0, repr=False)
+    _voiced: int = field(init=False, default=0, repr=False)
+
+    def __post_init__(self) -> None:
+        self._published = threading.Condition(self._lock)
+        if self.mode is None:
+            try:
+                cfg = global_container.resolve(IConfigurationService)
+                self.mode = str(cfg.get("azure_stream_mode", "window"))
+            except Exception:  # pragma: no cover – DI not ready
+                self.mode = "window"
+        if self.mode not in ("window", "segment"):
+            raise ValueError(f"Unknown Azure streaming mode '{self.mode}'")
+        # A full request window (or segment) plus slack for chunks arriving
+        # mid-upload.
+        horizon = self.max_segment if self.mode == "segment" else self.chunk_duration
+        self.buf = PCMRingBuffer.for_duration(horizon + 5, sample_rate=get_audio_config()["rate"])
+        if self.uploader is None:
+            self.uploader = get_azure_uploader()
 
     # ------------------------------------------------------------------
-    def __call__(self, chunk: bytes) -> None:
-        import requests  # type: ignore
+    @property
+    def _url(self) -> str:
+        return f"{self.endpoint.rstrip('/')}/speech/recognition/conversation/cognitiveservices/v1"
 
-        self.buf.append(chunk)
-        elapsed = time.time() - self.start_time
-        elapsed_str = f"{int(elapsed // 60):02d}:{int(elapsed % 60):02d}"
+    @property
+    def _headers(self) -> Dict[str, str]:
+        return {"api-key": self.api_key, "Content-Type": "audio/wav"}
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _wav(samples: np.ndarray) -> bytes:
+        audio_cfg = get_audio_config()
+        wav_buffer = io.BytesIO()
+        with wave.open(wav_buffer, "wb") as wf:
+            wf.setnchannels(audio_cfg["channels"])
+            wf.setsampwidth(2)
+            wf.setframerate(audio_cfg["rate"])
+            wf.writeframes(samples)
+        return wav_buffer.getvalue()
+
+    # ------------------------------------------------------------------
+    def __call__(self, chunk: bytes) -> None:
+        added = self.buf.append(chunk)
+        if self.mode == "segment":
+            self._segment_step(added)
+            return
 
-        audio_buffer = b"".join(self.buf)
         audio_cfg = get_audio_config()
         samples_per_chunk = int(audio_cfg["rate"] * self.chunk_duration)
-        audio_samples = len(audio_buffer) // 2
+        audio_samples = len(self.buf)
 
         if not (
             audio_samples >= samples_per_chunk or time.time() - self.last_time >= 3
         ):
             return
+        if self._inflight:
+            # Previous window still being recognised – keep buffering.
+            return
 
         self.last_time = time.time()
         self.update_queue.put(
@@ -48,59 +128,178 @@ class AzureSpeechStreamingHandler:
                 "text": self.full_transcription,
                 "words_info": [],
                 "is_final": False,
-                "elapsed": elapsed_str,
+                "elapsed": self._elapsed_str(),
                 "partial": "Processing audio...",
                 "processing": True,
             }
         )
 
+        wav = self._wav(self.buf.view())
+
+        # The window is handed off, so trim the buffer right away.
+        if audio_samples >= samples_per_chunk:
+            self.buf.keep_last(audio_samples - samples_per_chunk)
+        else:
+            self.buf.consume(audio_samples)
+
+        self._inflight = True
+        self.uploader.submit(
+            self._url, wav, self._on_result, headers=self._headers, params={"language": "en-US"}
+        )
+
+    # ------------------------------------------------------------------
+    def _on_result(self, result: Optional[Dict[str, Any]], exc: Optional[BaseException]) -> None:
+        """Publish a recognition result; called from the upload worker."""
         try:
-            wav_buffer = io.BytesIO()
-            with wave.open(wav_buffer, "wb") as wf:
-                wf.setnchannels(audio_cfg["channels"])
-                wf.setsampwidth(2)
-                wf.setframerate(audio_cfg["rate"])
-                wf.writeframes(audio_buffer)
-
-            url = f"{self.endpoint.rstrip('/')}/speech/recognition/conversation/cognitiveservices/v1"
-            headers = {"api-key": self.api_key, "Content-Type": "audio/wav"}
-            params = {"language": "en-US"}
-            resp = requests.post(url, headers=headers, params=params, data=wav_buffer.getvalue())
-            if resp.status_code == 200:
-                result = resp.json()
-                if result.get("RecognitionStatus") == "Success":
-                    text = result.get("DisplayText", "").strip()
-                    if text:
-                        self.full_transcription = f"{self.full_transcription} {text}".strip()
-                        self.update_queue.put(
-                            {
-                                "text": self.full_transcription,
-                                "words_info": [],
-                                "is_final": True,
-                                "elapsed": elapsed_str,
-                                "partial": "",
-                                "processing": False,
-                            }
-                        )
+            if exc is not None:
+                logger.error("Azure Speech transcription error: %s", exc)
+                self.update_queue.put(
+                    {
+                        "text": self.full_transcription,
+                        "words_info": [],
+                        "is_final": False,
+                        "elapsed": self._elapsed_str(),
+                        "partial": f"Azure Error: {str(exc)[:50]}...",
+                        "processing": False,
+                    }
+                )
+                return
+            if result and result.get("RecognitionStatus") == "Success":
+                text = result.get("DisplayText", "").strip()
+                if text:
+                    self.full_transcription = f"{self.full_transcription} {text}".strip()
+                    self.update_queue.put(
+                        {
+                            "text": self.full_transcription,
+                            "words_info": [],
+                            "is_final": True,
+                            "elapsed": self._elapsed_str(),
+                            "partial": "",
+                            "processing": False,
+                        }
+                    )
+        finally:
+            self._inflight = False
+
+    # ------------------------------------------------------------------
+    # Segment mode
+    # ------------------------------------------------------------------
+    def _segment_step(self, added: np.ndarray) -> None:
+        """Track pauses in the new samples and close the segment when due."""
+        if len(added):
+            level = float(np.sqrt(np.mean(np.square(added, dtype=np.float64)))) / 32768.0
+            if level < self.silence_threshold:
+                self._silent_run += len(added)
             else:
-                logger.error("Azure Speech API error: %s - %s", resp.status_code, resp.text[:200])
-        except Exception as exc:  # pragma: no cover
-            logger.error("Azure Speech transcription error: %s", exc)
+                self._silent_run = 0
+                self._voiced += len(added)
+
+        length = len(self.buf)
+        at_pause = (
+            self._silent_run >= self.buf.seconds(self.silence_duration)
+            and length >= self.buf.seconds(self.min_segment)
+        )
+        if at_pause or length >= self.buf.seconds(self.max_segment):
+            self._cut_segment()
+
+    # ------------------------------------------------------------------
+    def _cut_segment(self) -> None:
+        """Queue the buffered audio as the next segment (unless all silent)."""
+        if self._voiced:
+            with self._lock:
+                self._pending.append((self._next_seq, self._wav(self.buf.view())))
+                self._next_seq += 1
+        self.buf.consume(len(self.buf))
+        self._silent_run = self._voiced = 0
+        self._pump()
+
+    # ------------------------------------------------------------------
+    def _pump(self) -> None:
+        """Start the next queued segment upload if none is in flight."""
+        with self._lock:
+            if self._inflight or not self._pending:
+                return
+            seq, wav = self._pending.popleft()
+            self._inflight = True
+        self.uploader.submit(
+            self._url,
+            wav,
+            partial(self._on_segment, seq),
+            headers=self._headers,
+            params={"language": "en-US"},
+        )
+
+    # ------------------------------------------------------------------
+    def _on_segment(self, seq: int, result: Optional[Dict[str, Any]], exc: Optional[BaseException]) -> None:
+        """Store a segment result and publish every segment now in order."""
+        text = ""
+        if exc is not None:
+            logger.error("Azure Speech segment %d failed: %s", seq, exc)
             self.update_queue.put(
                 {
                     "text": self.full_transcription,
                     "words_info": [],
                     "is_final": False,
-                    "elapsed": elapsed_str,
+                    "elapsed": self._elapsed_str(),
                     "partial": f"Azure Error: {str(exc)[:50]}...",
                     "processing": False,
+                    "segment_id": seq,
                 }
             )
+        elif result and result.get("RecognitionStatus") == "Success":
+            text = result.get("DisplayText", "").strip()
 
-        if audio_samples >= samples_per_chunk:
-            excess_samples = audio_samples - samples_per_chunk
-            new_buf_bytes = audio_buffer[-excess_samples * 2 :]
-            chunk_sz = audio_cfg["chunk"] * 2
-            self.buf = [new_buf_bytes[i : i + chunk_sz] for i in range(0, len(new_buf_bytes), chunk_sz)]
-        else:
-            self.buf = [] 
\ No newline at end of file
+        with self._lock:
+            self._results[seq] = text
+            ready = []
+            while self._merged_seq in self._results:
+                ready.append((self._merged_seq, self._results.pop(self._merged_seq)))
+                self._merged_seq += 1
+            self._inflight = False
+
+        for segment_id, segment_text in ready:
+            if not segment_text:
+                continue
+            self.full_transcription = f"{self.full_transcription} {segment_text}".strip()
+            self.update_queue.put(
+                {
+                    "text": self.full_transcription,
+                    "words_info": [],
+                    "is_final": True,
+                    "elapsed": self._elapsed_str(),
+                    "partial": "",
+                    "processing": False,
+                    "segment_id": segment_id,
+                    "delta": segment_text,
+                }
+            )
+        if ready:
+            with self._published:
+                self._published_seq = ready[-1][0] + 1
+                self._published.notify_all()
+        self._pump()
+
+    # ------------------------------------------------------------------
+    def on_endpoint(self) -> None:
+        """Speech paused: close the open segment instead of waiting for silence."""
+        if self.mode == "segment" and len(self.buf):
+            self._cut_segment()
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Upload the trailing segment and wait for every outstanding final."""
+        if self.mode != "segment":
+            return
+        if len(self.buf):
+            self._cut_segment()
+        with self._published:
+            if not self._published.wait_for(lambda: self._published_seq >= self._next_seq, self.close_timeout):
+                logger.warning(
+                    "Azure Speech: %d segment(s) still unrecognised at session end",
+                    self._next_seq - self._published_seq,
+                )
+
+    # ------------------------------------------------------------------
+    def _elapsed_str(self) -> str:
+        elapsed = time.time() - self.start_time
+        return f"{int(elapsed // 60):02d}:{int(elapsed % 60):02d}"
@@ -4,72 +4,98 @@ import json
 import queue
 import time
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional
 
+from src.asr.model_registry import ModelLease, get_model_registry
 from src.utils.audio import get_audio_config
+from ..emission import EmissionPolicy
 
 import logging
 
 logger = logging.getLogger("ambient_scribe")
 
 
-def _load_vosk_model(model_path: str):  # noqa: D401
-    from vosk import Model  # type: ignore
-
-    cache = getattr(_load_vosk_model, "_cache", {})
-    if model_path not in cache:
-        cache[model_path] = Model(model_path)
-        setattr(_load_vosk_model, "_cache", cache)
-    return cache[model_path]
-
-
 @dataclass
 class VoskStreamingHandler:  # noqa: D401 – already well-named
+    """Kaldi recogniser for real-time sessions.
+
+    Partials pass through an :class:`EmissionPolicy` (change-only, rate
+    limited).  Finals carry a ``segment_id``; in delta mode ``text`` holds
+    only the new segment instead of the cumulative transcript.
+    """
+
     model_path: str
     update_queue: queue.Queue
     rec: object = field(init=False)
+    _lease: Optional[ModelLease] = field(init=False, default=None, repr=False)
     transcriptions: List[str] = field(default_factory=list)
     last_final_text: str = ""
     start_time: float = field(default_factory=time.time)
+    emission: Optional[EmissionPolicy] = None  # None → settings
+    _full_text: str = field(init=False, default="", repr=False)
 
     def __post_init__(self) -> None:  # noqa: D401
         from vosk import KaldiRecognizer  # type: ignore
 
+        if self.emission is None:
+            self.emission = EmissionPolicy.from_settings()
+
         audio_cfg = get_audio_config()
-        self.rec = KaldiRecognizer(_load_vosk_model(self.model_path), audio_cfg["rate"])
+        self._lease = get_model_registry().acquire("vosk", self.model_path)
+        self.rec = KaldiRecognizer(self._lease.model, audio_cfg["rate"])
         self.rec.SetWords(True)
 
+    # ------------------------------------------------------------------
+    def close(self) -> None:  # noqa: D401
+        """Release the shared model reference held by this session."""
+        if self._lease is not None:
+            self._lease.release()
+            self._lease = None
+
     # ------------------------------------------------------------------
     def __call__(self, chunk: bytes) -> None:  # noqa: D401
         elapsed = time.time() - self.start_time
         elapsed_str = f"{int(elapsed // 60):02d}:{int(elapsed % 60):02d}"
 
         if self.rec.AcceptWaveform(chunk):
-            result = json.loads(self.rec.Result())
-            final_text = result.get("text", "").strip()
-            words_info = result.get("result", []) if final_text else []
-            if final_text and final_text != self.last_final_text:
-                self.last_final_text = final_text
-                self.transcriptions.append(final_text)
-                self.update_queue.put(
-                    {
-                        "text": " ".join(self.transcriptions),
-                        "words_info": words_info,
-                        "is_final": True,
-                        "elapsed": elapsed_str,
-                        "partial": "",
-                    }
-                )
+            self._emit_final(json.loads(self.rec.Result()), elapsed_str)
         else:
             partial_result = json.loads(self.rec.PartialResult())
             partial = partial_result.get("partial", "").strip()
-            if partial:
+            if partial and self.emission.accept_partial(partial):
                 self.update_queue.put(
                     {
-                        "text": " ".join(self.transcriptions),
+                        "text": "" if self.emission.delta else self._full_text,
                         "words_info": [],
                         "is_final": False,
                         "elapsed": elapsed_str,
                         "partial": partial,
+                        "segment_id": self.emission.next_segment_id,
                     }
-                ) 
\ No newline at end of file
+                )
+
+    # ------------------------------------------------------------------
+    def on_endpoint(self) -> None:  # noqa: D401
+        """Speech paused: finalise the current utterance without waiting."""
+        elapsed = time.time() - self.start_time
+        elapsed_str = f"{int(elapsed // 60):02d}:{int(elapsed % 60):02d}"
+        self._emit_final(json.loads(self.rec.FinalResult()), elapsed_str)
+
+    # ------------------------------------------------------------------
+    def _emit_final(self, result: dict, elapsed_str: str) -> None:
+        final_text = result.get("text", "").strip()
+        words_info = result.get("result", []) if final_text else []
+        if final_text and final_text != self.last_final_text:
+            self.last_final_text = final_text
+            self.transcriptions.append(final_text)
+            self._full_text = f"{self._full_text} {final_text}" if self._full_text else final_text
+            self.update_queue.put(
+                {
+                    "text": final_text if self.emission.delta else self._full_text,
+                    "words_info": words_info,
+                    "is_final": True,
+                    "elapsed": elapsed_str,
+                    "partial": "",
+                    "segment_id": self.emission.accept_final(),
+                }
+            )
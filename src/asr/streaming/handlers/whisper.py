@@ -3,9 +3,15 @@ from __future__ import annotations
 import queue
 import time
 from dataclasses import dataclass, field
-from typing import List
+from typing import Optional
 
+from src.asr.model_registry import ModelLease, get_model_registry
+from src.audio.ring_buffer import PCMRingBuffer
+from src.core.container import global_container
+from src.core.interfaces.config_service import IConfigurationService
 from src.utils.audio import get_audio_config
+from ..local_agreement import LocalAgreement, Word
+from ..whisper_batcher import WhisperBatchWorker, get_whisper_batcher
 import logging
 
 logger = logging.getLogger("ambient_scribe")
@@ -13,33 +19,88 @@ logger = logging.getLogger("ambient_scribe")
 
 @dataclass
 class WhisperStreamingHandler:
+    """Rolling-window Whisper recogniser for real-time sessions.
+
+    ``mode="window"`` re-decodes the last *window_duration* seconds every
+    *processing_interval* and replaces the transcript.  ``mode="local_agreement"``
+    only decodes the uncommitted tail, commits words two consecutive
+    hypotheses agree on, prompts with the committed text and trims the audio
+    it covers – producing append-only finals at a fraction of the CPU.
+    """
+
     model_size: str
     update_queue: queue.Queue
     model: object = field(init=False)
-    buf: List[bytes] = field(default_factory=list)
+    buf: PCMRingBuffer = field(init=False, repr=False)
     last_time: float = field(default_factory=time.time)
     start_time: float = field(default_factory=time.time)
     current_transcription: str = ""
     processing_interval: float = 1.5
     window_duration: float = 6.0
+    batched: Optional[bool] = None  # None → ``whisper_stream_batching`` setting
+    mode: Optional[str] = None  # "window" | "local_agreement"; None → ``whisper_stream_mode``
+    max_uncommitted: float = 12.0  # seconds of tail audio before a forced commit
+    _lease: Optional[ModelLease] = field(init=False, default=None, repr=False)
+    _batcher: Optional[WhisperBatchWorker] = field(init=False, default=None, repr=False)
+    _inflight: bool = field(init=False, default=False, repr=False)
+    _agreement: LocalAgreement = field(init=False, default_factory=LocalAgreement, repr=False)
 
     def __post_init__(self) -> None:
-        import whisper  # type: ignore
+        try:
+            cfg = global_container.resolve(IConfigurationService)
+            device = str(cfg.get("whisper_device", "cpu"))
+            batching = bool(cfg.get("whisper_stream_batching", True))
+            mode = str(cfg.get("whisper_stream_mode", "window"))
+        except Exception:  # pragma: no cover – DI not ready
+            device, batching, mode = "cpu", True, "window"
+        if self.mode is None:
+            self.mode = mode
+        if self.mode not in ("window", "local_agreement"):
+            raise ValueError(f"Unknown Whisper streaming mode '{self.mode}'")
+        if self.batched is None:
+            self.batched = batching
+        if self.mode == "local_agreement":
+            # Needs word timestamps, which the batched decode path lacks.
+            self.batched = False
+        if self.batched:
+            # The shared worker owns the model; sessions only submit windows.
+            self._batcher = get_whisper_batcher(self.model_size, device)
+            self.model = None
+        else:
+            self._lease = get_model_registry().acquire("whisper", self.model_size, device)
+            self.model = self._lease.model
+        # Room for one window plus the audio arriving between two decodes.
+        horizon = self.max_uncommitted if self.mode == "local_agreement" else self.window_duration
+        self.buf = PCMRingBuffer.for_duration(
+            horizon + self.processing_interval + 1.0, sample_rate=get_audio_config()["rate"]
+        )
 
-        self.model = whisper.load_model(self.model_size)
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Commit the pending hypothesis, then release the shared model reference."""
+        if self.mode == "local_agreement" and self._lease is not None:
+            if len(self.buf):
+                self._decode_tail(self.buf.as_float32(), endpoint=True)
+            # Words still pending when the last decode failed.
+            self._publish_committed(self._agreement.flush())
+        if self._lease is not None:
+            self._lease.release()
+            self._lease = None
 
     # ------------------------------------------------------------------
-    def __call__(self, chunk: bytes) -> None:
-        import numpy as np  # type: ignore
+    @property
+    def _buffer_offset(self) -> float:
+        """Session time (s) of the oldest buffered sample."""
+        return self.buf.start_sample / self.buf.sample_rate
 
+    # ------------------------------------------------------------------
+    def __call__(self, chunk: bytes) -> None:
         self.buf.append(chunk)
         elapsed = time.time() - self.start_time
         elapsed_str = f"{int(elapsed // 60):02d}:{int(elapsed % 60):02d}"
 
         if time.time() - self.last_time < self.processing_interval:
-            audio_cfg = get_audio_config()
-            total_bytes = sum(len(c) for c in self.buf)
-            audio_seconds = total_bytes / (audio_cfg["rate"] * 2)
+            audio_seconds = self.buf.duration
             partial_text = (
                 f"[Processing {audio_seconds:.1f}s of audio...]" if audio_seconds > 1.0 else ("..." if self.current_transcription else "")
             )
@@ -55,7 +116,16 @@ class WhisperStreamingHandler:
                 }
             )
             return
+        self._decode_now()
+
+    # ------------------------------------------------------------------
+    def on_endpoint(self) -> None:
+        """Speech paused: decode right away and commit the pending words."""
+        if len(self.buf):
+            self._decode_now(endpoint=True)
 
+    # ------------------------------------------------------------------
+    def _decode_now(self, *, endpoint: bool = False) -> None:
         self.last_time = time.time()
         self.update_queue.put(
             {
@@ -63,21 +133,36 @@ class WhisperStreamingHandler:
                 "text": self.current_transcription,
                 "words_info": [],
                 "is_final": False,
-                "elapsed": elapsed_str,
+                "elapsed": self._elapsed_str(),
                 "partial": "Processing audio...",
                 "processing": True,
             }
         )
 
-        audio_buffer = b"".join(self.buf)
-        audio_np = np.frombuffer(audio_buffer, dtype=np.int16).astype(np.float32) / 32768.0
-        try:
-            result = self.model.transcribe(audio_np, language="en", fp16=False, suppress_tokens=None)
-            txt = result.get("text", "").strip()
-            if txt:
-                self.current_transcription = txt
-                self.update_queue.put({"type": "final", "text": txt})
-        except Exception as exc:  # pragma: no cover
+        audio_np = self.buf.as_float32()
+        if self.mode == "local_agreement":
+            self._decode_tail(audio_np, endpoint=endpoint)
+            return
+        if self._batcher is not None:
+            # Skip this round if the previous window is still being decoded.
+            # The worker decodes later, so it gets a copy rather than a view.
+            if not self._inflight:
+                self._inflight = True
+                self._batcher.submit(audio_np.copy(), self._on_result)
+        else:
+            try:
+                result = self.model.transcribe(audio_np, language="en", fp16=False, suppress_tokens=None)
+                self._on_result(result.get("text", ""), None)
+            except Exception as exc:  # pragma: no cover
+                self._on_result(None, exc)
+
+        self.buf.keep_last(self.buf.seconds(self.window_duration))
+
+    # ------------------------------------------------------------------
+    def _on_result(self, text: Optional[str], exc: Optional[BaseException]) -> None:
+        """Publish a decode result; called inline or from the batch worker."""
+        self._inflight = False
+        if exc is not None:
             logger.error("Whisper transcription error: %s", exc)
             self.update_queue.put(
                 {
@@ -85,15 +170,85 @@ class WhisperStreamingHandler:
                     "text": self.current_transcription,
                     "words_info": [],
                     "is_final": False,
-                    "elapsed": elapsed_str,
+                    "elapsed": self._elapsed_str(),
                     "partial": f"Whisper Error: {str(exc)[:50]}...",
                 }
             )
+            return
+        txt = (text or "").strip()
+        if txt:
+            self.current_transcription = txt
+            self.update_queue.put({"type": "final", "text": txt})
 
-        audio_cfg = get_audio_config()
-        max_buf_bytes = int(self.window_duration * audio_cfg["rate"] * 2)
-        if len(audio_buffer) > max_buf_bytes:
-            start_byte = len(audio_buffer) - max_buf_bytes
-            new_buf = audio_buffer[start_byte:]
-            chunk_sz = audio_cfg["chunk"] * 2
-            self.buf = [new_buf[i : i + chunk_sz] for i in range(0, len(new_buf), chunk_sz)] 
\ No newline at end of file
+    # ------------------------------------------------------------------
+    def _elapsed_str(self) -> str:
+        elapsed = time.time() - self.start_time
+        return f"{int(elapsed // 60):02d}:{int(elapsed % 60):02d}"
+
+    # ------------------------------------------------------------------
+    # Local-agreement mode
+    # ------------------------------------------------------------------
+    def _publish_committed(self, new_words: list) -> None:
+        if new_words:
+            self.current_transcription = self._agreement.committed_text()
+            self.update_queue.put(
+                {
+                    "type": "final",
+                    "text": self.current_transcription,
+                    "delta": LocalAgreement.join(new_words),
+                }
+            )
+
+    # ------------------------------------------------------------------
+    def _decode_tail(self, audio_np, *, endpoint: bool = False) -> None:
+        """Decode the uncommitted tail, commit agreed words and trim their audio.
+
+        At a speech *endpoint* the whole hypothesis is committed.
+        """
+        rate = self.buf.sample_rate
+        offset = self._buffer_offset
+        committed_before = self._agreement.committed_text()
+        try:
+            result = self.model.transcribe(
+                audio_np,
+                language="en",
+                fp16=False,
+                initial_prompt=committed_before[-200:] or None,
+                condition_on_previous_text=False,
+                word_timestamps=True,
+            )
+        except Exception as exc:  # pragma: no cover
+            self._on_result(None, exc)
+            return
+
+        words = [
+            Word(offset + w["start"], offset + w["end"], w["word"])
+            for seg in result.get("segments", [])
+            for w in seg.get("words", [])
+        ]
+        new_words = self._agreement.update(words)
+        buffered = len(audio_np) / rate
+        if endpoint or (not new_words and buffered > self.max_uncommitted):
+            new_words += self._agreement.flush()
+
+        self._publish_committed(new_words)
+
+        # Drop audio already covered by committed words; cap silent tails.
+        cut = max(0.0, self._agreement.last_committed_end - offset)
+        if buffered - cut > self.max_uncommitted:
+            cut = buffered - self.window_duration
+        self.buf.consume(int(cut * rate))
+
+        pending = LocalAgreement.join(self._agreement.pending)
+        if pending:
+            self.update_queue.put(
+                {
+                    "type": "partial",
+                    "text": self.current_transcription,
+                    "words_info": [],
+                    "is_final": False,
+                    "elapsed": self._elapsed_str(),
+                    "partial": pending,
+                    "processing": False,
+                }
+            )
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+"""Audio codec negotiation for the streaming websockets.
+
+A client picks its uplink format either with query parameters
+(``?codec=mulaw&rate=8000``) or by sending a JSON text frame before any
+audio::
+
+    {"type": "config", "codec": "opus", "sample_rate": 48000}
+
+Without either, the first binary frame is taken as raw 16 kHz s16le PCM –
+the historical protocol – and handed back as the first audio chunk.
+"""
+
+import json
+from typing import Optional, Tuple
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from ...core.exceptions import ConfigurationError
+from src.audio.codecs import AudioDecoder
+
+__all__ = ["negotiate_decoder", "UNSUPPORTED_AUDIO_CLOSE_CODE"]
+
+UNSUPPORTED_AUDIO_CLOSE_CODE = 4415
+
+
+async def negotiate_decoder(ws: WebSocket, *, target_rate: int = 16000) -> Tuple[AudioDecoder, Optional[bytes]]:
+    """Return the connection's :class:`AudioDecoder` and any audio already read.
+
+    Raises :class:`ConfigurationError` for unsupported or malformed settings
+    and :class:`WebSocketDisconnect` if the client leaves before sending one.
+    """
+    params = ws.query_params
+    if "codec" in params or "rate" in params:
+        return AudioDecoder.from_params(params, target_rate=target_rate), None
+
+    message = await ws.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    if message.get("text") is not None:
+        try:
+            config = json.loads(message["text"])
+        except ValueError as exc:
+            raise ConfigurationError("Audio control frame is not valid JSON") from exc
+        if not isinstance(config, dict):
+            raise ConfigurationError("Audio control frame must be a JSON object")
+        return AudioDecoder.from_params(config, target_rate=target_rate), None
+    return AudioDecoder(target_rate=target_rate), message.get("bytes") or b""
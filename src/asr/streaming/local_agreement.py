@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+"""LocalAgreement-2 commit policy for incremental Whisper streaming.
+
+Whisper is re-run on the *uncommitted* tail of the audio.  A word becomes
+final once two consecutive hypotheses agree on it (the longest common
+prefix of the previous and the current hypothesis).  Committed words are
+never revised, which yields append-only finals, and the audio they cover
+can be trimmed from the decoding buffer.
+"""
+
+import re
+from typing import Iterable, List, NamedTuple, Sequence
+
+__all__ = ["Word", "LocalAgreement"]
+
+_NORMALISE_RE = re.compile(r"[^\w']+")
+
+
+class Word(NamedTuple):
+    start: float  # absolute seconds since session start
+    end: float
+    text: str
+
+
+def _norm(text: str) -> str:
+    return _NORMALISE_RE.sub("", text.lower())
+
+
+class LocalAgreement:
+    """Track hypotheses and commit the prefix stable across two decodes."""
+
+    def __init__(self, *, max_ngram_overlap: int = 5) -> None:
+        self.committed: List[Word] = []
+        self._hypothesis: List[Word] = []
+        self._max_ngram = max_ngram_overlap
+
+    # ------------------------------------------------------------------
+    @property
+    def last_committed_end(self) -> float:
+        return self.committed[-1].end if self.committed else 0.0
+
+    @property
+    def pending(self) -> List[Word]:
+        """Words of the latest hypothesis that are not yet committed."""
+        return list(self._hypothesis)
+
+    # ------------------------------------------------------------------
+    def _strip_overlap(self, words: List[Word]) -> List[Word]:
+        # Drop words that end before the committed frontier (tolerating a
+        # little timestamp jitter) ...
+        frontier = self.last_committed_end - 0.1
+        words = [w for w in words if w.end > frontier]
+        if not words or not self.committed:
+            return words
+        # ... and an n-gram that repeats the tail of the committed text.
+        for n in range(min(self._max_ngram, len(words), len(self.committed)), 0, -1):
+            tail = [_norm(w.text) for w in self.committed[-n:]]
+            head = [_norm(w.text) for w in words[:n]]
+            if tail == head:
+                return words[n:]
+        return words
+
+    # ------------------------------------------------------------------
+    def update(self, words: Iterable[Word]) -> List[Word]:
+        """Feed a new hypothesis and return the words committed by it."""
+        current = self._strip_overlap([w for w in words if _norm(w.text)])
+        agreed: List[Word] = []
+        for prev, new in zip(self._hypothesis, current):
+            if _norm(prev.text) != _norm(new.text):
+                break
+            agreed.append(new)
+        self.committed.extend(agreed)
+        self._hypothesis = current[len(agreed):]
+        return agreed
+
+    # ------------------------------------------------------------------
+    def flush(self) -> List[Word]:
+        """Commit the outstanding hypothesis (end of stream / forced trim)."""
+        tail = self._hypothesis
+        self.committed.extend(tail)
+        self._hypothesis = []
+        return tail
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def join(words: Sequence[Word]) -> str:
+        return "".join(w.text for w in words).strip()
+
+    # ------------------------------------------------------------------
+    def committed_text(self) -> str:
+        return self.join(self.committed)
@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+"""Thread pool running Kaldi recognition off the asyncio event loop.
+
+Each worker thread owns the *KaldiRecognizer* instances of the sessions
+pinned to it, so a recogniser is only ever touched by one thread and the
+chunks of a session are decoded strictly in order.  Websocket handlers feed
+audio through a bounded :class:`ChunkQueue` whose *overload policy* decides
+what happens when decoding falls behind the network:
+
+* ``block``    – the websocket reader waits until the queue has room
+* ``coalesce`` – pending chunks are merged into a single larger chunk
+* ``drop``     – the incoming chunk is discarded and counted
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, Optional
+
+from ...core.container import global_container
+from ...core.interfaces.config_service import IConfigurationService
+
+logger = logging.getLogger("ambient_scribe")
+
+__all__ = [
+    "OverloadPolicy",
+    "ChunkQueue",
+    "RecognitionSession",
+    "RecognitionWorkerPool",
+    "get_recognition_pool",
+]
+
+
+class OverloadPolicy(str, Enum):
+    """Strategy applied when a session's chunk queue is full."""
+
+    BLOCK = "block"
+    COALESCE = "coalesce"
+    DROP = "drop"
+
+    @classmethod
+    def parse(cls, value: str | OverloadPolicy | None) -> OverloadPolicy:  # noqa: D401
+        if isinstance(value, OverloadPolicy):
+            return value
+        try:
+            return cls((value or cls.BLOCK.value).lower())
+        except ValueError:
+            logger.warning("Unknown overload policy '%s' – using 'block'", value)
+            return cls.BLOCK
+
+
+class ChunkQueue:
+    """Bounded single-consumer async queue of PCM chunks with overload policy."""
+
+    def __init__(self, maxsize: int = 32, policy: OverloadPolicy = OverloadPolicy.BLOCK) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._items: Deque[bytes] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._closed = False
+        self.dropped_chunks = 0
+        self.dropped_bytes = 0
+        self.coalesced_chunks = 0
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # ------------------------------------------------------------------
+    async def put(self, chunk: bytes) -> None:  # noqa: D401
+        """Enqueue *chunk*, applying the overload policy when full."""
+        if self._closed:
+            return
+        if len(self._items) >= self.maxsize:
+            if self.policy is OverloadPolicy.DROP:
+                self.dropped_chunks += 1
+                self.dropped_bytes += len(chunk)
+                return
+            if self.policy is OverloadPolicy.COALESCE:
+                self.coalesced_chunks += len(self._items)
+                merged = b"".join(self._items) + chunk
+                self._items.clear()
+                self._items.append(merged)
+                self._not_empty.set()
+                return
+            while len(self._items) >= self.maxsize and not self._closed:
+                self._not_full.clear()
+                await self._not_full.wait()
+            if self._closed:
+                return
+        self._items.append(chunk)
+        self._not_empty.set()
+
+    # ------------------------------------------------------------------
+    async def get(self) -> Optional[bytes]:  # noqa: D401
+        """Return the next chunk or *None* once the queue is closed and drained."""
+        while not self._items:
+            if self._closed:
+                return None
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        chunk = self._items.popleft()
+        if len(self._items) < self.maxsize:
+            self._not_full.set()
+        return chunk
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:  # noqa: D401
+        self._closed = True
+        self._not_empty.set()
+        self._not_full.set()
+
+
+class _Worker:
+    """Single recognition thread owning the recognisers of its sessions."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.jobs: queue.Queue = queue.Queue()
+        self.recognizers: Dict[str, Any] = {}
+        self.sessions = 0
+        self.decoded_chunks = 0
+        self.decode_seconds = 0.0
+        self._thread = threading.Thread(
+            target=self._run, name=f"vosk-worker-{index}", daemon=True
+        )
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    def submit(self, job: tuple) -> None:
+        self.jobs.put(job)
+
+    # ------------------------------------------------------------------
+    def _run(self) -> None:  # noqa: D401
+        while True:
+            kind, session_id, payload, callback = self.jobs.get()
+            if kind == "stop":
+                return
+            result, error = None, None
+            try:
+                if kind == "open":
+                    result = self._open(session_id, *payload)
+                elif kind == "chunk":
+                    result = self._decode(session_id, payload)
+                elif kind == "close":
+                    self.recognizers.pop(session_id, None)
+                else:  # pragma: no cover – programming error
+                    raise ValueError(f"Unknown job kind {kind}")
+            except Exception as exc:  # pragma: no cover – Kaldi failure
+                logger.error("Vosk worker %s failed on %s job: %s", self.index, kind, exc)
+                error = exc
+            try:
+                callback(result, error)
+            except Exception as exc:  # e.g. the session's event loop is already closed
+                logger.warning(
+                    "Vosk worker %s could not deliver %s result for %s: %s",
+                    self.index, kind, session_id, exc,
+                )
+
+    # ------------------------------------------------------------------
+    def _open(self, session_id: str, model: Any, sample_rate: int) -> None:
+        from vosk import KaldiRecognizer  # type: ignore
+
+        recognizer = KaldiRecognizer(model, sample_rate)
+        recognizer.SetWords(True)
+        self.recognizers[session_id] = recognizer
+
+    # ------------------------------------------------------------------
+    def _decode(self, session_id: str, chunk: bytes) -> dict:
+        recognizer = self.recognizers[session_id]
+        started = time.perf_counter()
+        if recognizer.AcceptWaveform(chunk):
+            res = json.loads(recognizer.Result())
+            message = {
+                "type": "final",
+                "text": res.get("text", ""),
+                "result": res.get("result", []),
+            }
+        else:
+            res = json.loads(recognizer.PartialResult())
+            message = {"type": "partial", "text": res.get("partial", "")}
+        self.decode_seconds += time.perf_counter() - started
+        self.decoded_chunks += 1
+        return message
+
+    # ------------------------------------------------------------------
+    def stop(self) -> None:
+        self.jobs.put(("stop", "", None, None))
+
+
+class RecognitionSession:
+    """Handle returned by :meth:`RecognitionWorkerPool.open_session`."""
+
+    def __init__(
+        self,
+        pool: RecognitionWorkerPool,
+        worker: _Worker,
+        session_id: str,
+        chunks: ChunkQueue,
+    ) -> None:
+        self._pool = pool
+        self._worker = worker
+        self.session_id = session_id
+        self.chunks = chunks
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    async def submit(self, chunk: bytes) -> None:  # noqa: D401
+        """Queue *chunk* for recognition (may wait under the *block* policy)."""
+        await self.chunks.put(chunk)
+
+    # ------------------------------------------------------------------
+    async def next_result(self) -> Optional[dict]:  # noqa: D401
+        """Decode the next queued chunk on the worker thread and return its message.
+
+        Returns *None* once the session is closed and all chunks are consumed.
+        """
+        chunk = await self.chunks.get()
+        if chunk is None:
+            return None
+        return await self._pool._call(self._worker, "chunk", self.session_id, chunk)
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:  # noqa: D401
+        if self._closed:
+            return
+        self._closed = True
+        self.chunks.close()
+        self._pool._release(self)
+
+
+class RecognitionWorkerPool:
+    """Fixed pool of recognition threads shared by all */ws/vosk* sessions."""
+
+    def __init__(
+        self,
+        num_workers: int | None = None,
+        *,
+        queue_size: int = 32,
+        policy: OverloadPolicy | str = OverloadPolicy.BLOCK,
+    ) -> None:
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.policy = OverloadPolicy.parse(policy)
+        self._workers = [_Worker(i) for i in range(self.num_workers)]
+        self._sessions: Dict[str, RecognitionSession] = {}
+        self._lock = threading.Lock()
+        self._dropped_chunks = 0
+        self._dropped_bytes = 0
+        self._coalesced_chunks = 0
+
+    # ------------------------------------------------------------------
+    async def _call(self, worker: _Worker, kind: str, session_id: str, payload: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+
+        def _done(result: Any, exc: BaseException | None) -> None:
+            def _resolve() -> None:
+                if future.done():
+                    return
+                if exc is not None:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+
+            loop.call_soon_threadsafe(_resolve)
+
+        worker.submit((kind, session_id, payload, _done))
+        return await future
+
+    # ------------------------------------------------------------------
+    async def open_session(
+        self,
+        session_id: str,
+        model: Any,
+        sample_rate: int,
+        *,
+        policy: OverloadPolicy | str | None = None,
+        queue_size: int | None = None,
+    ) -> RecognitionSession:
+        """Create a recogniser for *session_id* on the least-loaded worker."""
+        with self._lock:
+            worker = min(self._workers, key=lambda w: w.sessions)
+            worker.sessions += 1
+        chunks = ChunkQueue(
+            maxsize=queue_size or self.queue_size,
+            policy=OverloadPolicy.parse(policy) if policy else self.policy,
+        )
+        session = RecognitionSession(self, worker, session_id, chunks)
+        try:
+            await self._call(worker, "open", session_id, (model, sample_rate))
+        except Exception:
+            with self._lock:
+                worker.sessions -= 1
+            raise
+        with self._lock:
+            self._sessions[session_id] = session
+        return session
+
+    # ------------------------------------------------------------------
+    def _release(self, session: RecognitionSession) -> None:
+        with self._lock:
+            if self._sessions.pop(session.session_id, None) is None:
+                return
+            session._worker.sessions -= 1
+            self._dropped_chunks += session.chunks.dropped_chunks
+            self._dropped_bytes += session.chunks.dropped_bytes
+            self._coalesced_chunks += session.chunks.coalesced_chunks
+        session._worker.submit(("close", session.session_id, None, lambda *_: None))
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:  # noqa: D401
+        """Return pool-wide counters for monitoring."""
+        with self._lock:
+            live = list(self._sessions.values())
+            return {
+                "workers": self.num_workers,
+                "policy": self.policy.value,
+                "active_sessions": len(live),
+                "queued_chunks": sum(len(s.chunks) for s in live),
+                "dropped_chunks": self._dropped_chunks + sum(s.chunks.dropped_chunks for s in live),
+                "dropped_bytes": self._dropped_bytes + sum(s.chunks.dropped_bytes for s in live),
+                "coalesced_chunks": self._coalesced_chunks
+                + sum(s.chunks.coalesced_chunks for s in live),
+                "per_worker": [
+                    {
+                        "sessions": w.sessions,
+                        "backlog": w.jobs.qsize(),
+                        "decoded_chunks": w.decoded_chunks,
+                        "decode_seconds": w.decode_seconds,
+                    }
+                    for w in self._workers
+                ],
+            }
+
+    # ------------------------------------------------------------------
+    def shutdown(self) -> None:  # noqa: D401
+        for worker in self._workers:
+            worker.stop()
+
+
+_POOL: RecognitionWorkerPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_recognition_pool() -> RecognitionWorkerPool:
+    """Return the process-wide pool, configured from *IConfigurationService*."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            try:
+                cfg = global_container.resolve(IConfigurationService)
+                workers = int(cfg.get("vosk_worker_threads", 0) or 0)
+                queue_size = int(cfg.get("vosk_queue_size", 32))
+                policy = cfg.get("vosk_overload_policy", OverloadPolicy.BLOCK.value)
+            except Exception:  # pragma: no cover – DI not ready
+                workers, queue_size, policy = 0, 32, OverloadPolicy.BLOCK.value
+            _POOL = RecognitionWorkerPool(workers or None, queue_size=queue_size, policy=policy)
+            logger.info(
+                "Vosk recognition pool started: %d workers, queue=%d, policy=%s",
+                _POOL.num_workers,
+                queue_size,
+                _POOL.policy.value,
+            )
+        return _POOL
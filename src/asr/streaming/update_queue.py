@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+"""Thread-safe transcription update queue with asyncio wake-ups.
+
+Streaming handlers publish update dictionaries from whichever thread runs
+them.  :class:`UpdateQueue` keeps the familiar :class:`queue.Queue` API for
+producers while letting an asyncio consumer *await* new items instead of
+polling, and stamps every item with the moment it was produced so the
+delivery latency to the client can be measured.
+
+:class:`CoalescingUpdateQueue` is the variant used by the async service: a
+put never blocks, only the newest pending partial is kept and finals (and
+any other event) are never dropped, so a slow client cannot back-pressure
+recognition.
+"""
+
+import asyncio
+import math
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, List, Optional, Tuple
+
+__all__ = ["UpdateQueue", "CoalescingUpdateQueue", "LatencyTracker"]
+
+
+class UpdateQueue(queue.Queue):
+    """:class:`queue.Queue` that records production time and wakes async waiters."""
+
+    def __init__(self, maxsize: int = 0) -> None:
+        super().__init__(maxsize)
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+    # ------------------------------------------------------------------
+    # queue.Queue hooks – always called with ``self.mutex`` held
+    # ------------------------------------------------------------------
+    def _put(self, item: Any) -> None:
+        self.queue.append((time.perf_counter(), item))
+        for loop, event in self._waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # pragma: no cover – loop already closed
+                pass
+
+    # ------------------------------------------------------------------
+    def get(self, block: bool = True, timeout: float | None = None) -> Any:  # noqa: D401
+        return super().get(block, timeout)[1]
+
+    # ------------------------------------------------------------------
+    def get_timed_nowait(self) -> Tuple[float, Any]:  # noqa: D401
+        """Return ``(produced_at, item)`` without blocking; raise *queue.Empty*."""
+        return super().get(block=False)
+
+    # ------------------------------------------------------------------
+    async def wait(self, timeout: float | None = None) -> bool:  # noqa: D401
+        """Wait until at least one item is queued; return *False* on timeout."""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = (loop, event)
+        with self.mutex:
+            if self._qsize():
+                return True
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self.mutex:
+                self._waiters.remove(waiter)
+
+
+def _is_partial(update: Any) -> bool:
+    if not isinstance(update, dict):
+        return False
+    kind = update.get("type")
+    return kind == "partial" or (kind is None and update.get("is_final") is False)
+
+
+def _is_final(update: Any) -> bool:
+    if not isinstance(update, dict):
+        return False
+    return update.get("type") == "final" or update.get("is_final") is True
+
+
+class CoalescingUpdateQueue:
+    """Unbounded update queue that keeps only the newest pending partial.
+
+    Producers may run on any thread, so the queue is a lock-protected deque
+    with loop-safe wake-ups (``asyncio.Queue`` itself is not thread-safe).
+    Finals are delivered in order; the single pending partial is always
+    delivered after them and is discarded when a newer final arrives.
+    """
+
+    def __init__(self) -> None:
+        self._items: Deque[Tuple[float, Any]] = deque()
+        self._partial: Optional[Tuple[float, Any]] = None
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        self._closed = False
+        self.coalesced = 0  # partials replaced before the consumer saw them
+
+    # ------------------------------------------------------------------
+    def put(self, item: Any, block: bool = True, timeout: float | None = None) -> None:  # noqa: D401
+        """Enqueue *item*; never blocks (arguments kept for ``queue.Queue`` parity)."""
+        entry = (time.perf_counter(), item)
+        with self._lock:
+            if self._closed:
+                return
+            if _is_partial(item):
+                if self._partial is not None:
+                    self.coalesced += 1
+                self._partial = entry
+            else:
+                if _is_final(item) and self._partial is not None:
+                    self.coalesced += 1
+                    self._partial = None
+                self._items.append(entry)
+            for loop, event in self._waiters:
+                try:
+                    loop.call_soon_threadsafe(event.set)
+                except RuntimeError:  # pragma: no cover – loop already closed
+                    pass
+
+    put_nowait = put
+
+    # ------------------------------------------------------------------
+    def get_timed_nowait(self) -> Tuple[float, Any]:  # noqa: D401
+        """Return ``(produced_at, item)`` without blocking; raise *queue.Empty*."""
+        with self._lock:
+            if self._items:
+                return self._items.popleft()
+            if self._partial is not None:
+                entry, self._partial = self._partial, None
+                return entry
+        raise queue.Empty
+
+    def get_nowait(self) -> Any:  # noqa: D401
+        return self.get_timed_nowait()[1]
+
+    # ------------------------------------------------------------------
+    def qsize(self) -> int:  # noqa: D401
+        with self._lock:
+            return len(self._items) + (self._partial is not None)
+
+    def empty(self) -> bool:  # noqa: D401
+        return not self.qsize()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Stop accepting items; consumers drain what is left, then stop."""
+        with self._lock:
+            self._closed = True
+            for loop, event in self._waiters:
+                try:
+                    loop.call_soon_threadsafe(event.set)
+                except RuntimeError:  # pragma: no cover – loop already closed
+                    pass
+
+    # ------------------------------------------------------------------
+    async def wait(self, timeout: float | None = None) -> bool:  # noqa: D401
+        """Wait until an item is queued (or the queue closes); *False* on timeout."""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = (loop, event)
+        with self._lock:
+            if self._items or self._partial is not None or self._closed:
+                return True
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.remove(waiter)
+
+    # ------------------------------------------------------------------
+    async def get_timed(self) -> Tuple[float, Any]:  # noqa: D401
+        """Await the next ``(produced_at, item)``; raise *queue.Empty* once closed and drained."""
+        while True:
+            try:
+                return self.get_timed_nowait()
+            except queue.Empty:
+                if self._closed:
+                    raise
+            await self.wait()
+
+    # ------------------------------------------------------------------
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        while True:
+            try:
+                _produced_at, item = await self.get_timed()
+            except queue.Empty:
+                return
+            yield item
+
+
+class LatencyTracker:
+    """Bounded window of latency samples with percentile summaries."""
+
+    def __init__(self, window: int = 512) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    # ------------------------------------------------------------------
+    def record(self, seconds: float) -> None:  # noqa: D401
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    # ------------------------------------------------------------------
+    def percentile(self, pct: float) -> float:  # noqa: D401
+        """Return the *pct* percentile (0–100) of the recent window in seconds."""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        rank = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+        return ordered[rank]
+
+    # ------------------------------------------------------------------
+    def summary(self) -> dict:  # noqa: D401
+        """Return a JSON-friendly summary in milliseconds."""
+        return {
+            "count": self.count,
+            "avg_ms": (self.total / self.count * 1000.0) if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000.0,
+            "p95_ms": self.percentile(95) * 1000.0,
+            "p99_ms": self.percentile(99) * 1000.0,
+            "max_ms": self.max * 1000.0,
+        }
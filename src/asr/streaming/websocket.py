@@ -7,17 +7,21 @@ streaming handlers under *src.asr.streaming*.
 It exposes a `router` object that can be included by the backend layer.
 """
 
-import json
+import asyncio
 import logging
-import os
+import uuid
 from pathlib import Path
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from vosk import Model, KaldiRecognizer  # type: ignore
 
 from ...core.container import global_container
+from ...core.exceptions import ConfigurationError
 from ...core.interfaces.config_service import IConfigurationService
+from ..model_registry import get_model_registry
 from .connection_manager import ConnectionManager
+from .emission import EmissionPolicy
+from .ingest import UNSUPPORTED_AUDIO_CLOSE_CODE, negotiate_decoder
+from .recognition_pool import RecognitionSession, get_recognition_pool
 
 logger = logging.getLogger("ambient_scribe")
 
@@ -54,9 +58,10 @@ if not MODEL_DIR.exists():
     else:
         raise RuntimeError("No Vosk models found in app_data/models – please add one.")
 
-logger.info("Loading Vosk model for streaming WebSocket from %s", MODEL_DIR)
-_VOSK_MODEL = Model(str(MODEL_DIR))
-logger.info("Vosk model loaded for streaming.")
+# Load the default model in the background and keep it resident; connections
+# made before it finishes simply wait on the in-flight load.
+logger.info("Preloading Vosk model for streaming WebSocket from %s", MODEL_DIR)
+get_model_registry().preload("vosk", MODEL_DIR, pin=True)
 
 SAMPLE_RATE = 16000  # Hz – expected by small English model
 
@@ -66,50 +71,106 @@ router = APIRouter()
 _connections = ConnectionManager()
 
 
+async def _send_results(ws: WebSocket, session: RecognitionSession, emission: EmissionPolicy) -> None:
+    """Forward decoded results to the client, filtering partials via *emission*."""
+    while True:
+        message = await session.next_result()
+        if message is None:
+            return
+        if message["type"] == "partial":
+            if not emission.accept_partial(message["text"]):
+                continue
+            message["segment_id"] = emission.next_segment_id
+        else:
+            message["segment_id"] = emission.accept_final()
+        await ws.send_json(message)
+
+
+@router.get("/ws/vosk/stats")
+def vosk_stats() -> dict:
+    """Return open connections and recognition pool counters for ``/ws/vosk``."""
+    return {"connections": len(_connections), "pool": get_recognition_pool().stats()}
+
+
 @router.websocket("/ws/vosk")
 async def websocket_vosk(ws: WebSocket) -> None:  # noqa: D401
     """Real-time speech-to-text WebSocket endpoint.
 
-    The browser must stream raw 16-bit little-endian mono PCM at 16-kHz.
-    Outgoing messages:
-        { "type": "partial", "text": "..." }
-        { "type": "final",  "text": "..." }
+    The browser streams raw 16-bit little-endian mono PCM at 16-kHz, or
+    negotiates another codec/rate (``?codec=mulaw&rate=8000`` or a first
+    ``{"type": "config", ...}`` text frame, see :mod:`.ingest`).  Decoding
+    runs on the shared :class:`RecognitionWorkerPool`; the optional
+    ``?overload=block|coalesce|drop`` query parameter overrides the
+    configured backpressure policy for this connection.
+    Outgoing messages (partials only when changed, at most one per
+    ``streaming_partial_min_interval_ms``):
+        { "type": "partial", "text": "...", "segment_id": n }
+        { "type": "final",  "text": "...", "segment_id": n }
     """
     await _connections.connect(ws)
 
     # Switch model if specified via query (?model=name)
     model_param = ws.query_params.get("model")
     if model_param and model_param != "default":
-        candidate_dir = MODELS_BASE / model_param
-        if not candidate_dir.exists():
+        model_dir = MODELS_BASE / model_param
+        if not model_dir.exists():
             await ws.close(code=4404, reason=f"Model '{model_param}' not found")
             return
-        recognizer_model = Model(str(candidate_dir))
     else:
-        recognizer_model = _VOSK_MODEL
+        model_dir = MODEL_DIR
+
+    try:
+        decoder, first_chunk = await negotiate_decoder(ws, target_rate=SAMPLE_RATE)
+    except WebSocketDisconnect:
+        _connections.disconnect(ws)
+        return
+    except ConfigurationError as exc:
+        await ws.close(code=UNSUPPORTED_AUDIO_CLOSE_CODE, reason=str(exc)[:120])
+        _connections.disconnect(ws)
+        return
 
-    recognizer = KaldiRecognizer(recognizer_model, SAMPLE_RATE)
-    recognizer.SetWords(True)
+    # Loading (first use only) happens off the event loop.
+    lease = await asyncio.to_thread(get_model_registry().acquire, "vosk", model_dir)
 
+    pool = get_recognition_pool()
     try:
+        session = await pool.open_session(
+            uuid.uuid4().hex,
+            lease.model,
+            SAMPLE_RATE,
+            policy=ws.query_params.get("overload"),
+        )
+    except Exception:
+        lease.release()
+        raise
+    emission = EmissionPolicy.from_settings()
+    sender = asyncio.create_task(_send_results(ws, session, emission))
+
+    try:
+        if first_chunk:
+            await session.submit(first_chunk)
         while True:
-            audio_bytes = await ws.receive_bytes()
-            if recognizer.AcceptWaveform(audio_bytes):
-                res = json.loads(recognizer.Result())
-                await ws.send_json(
-                    {
-                        "type": "final",
-                        "text": res.get("text", ""),
-                        "result": res.get("result", []),
-                    }
-                )
-            else:
-                res = json.loads(recognizer.PartialResult())
-                await ws.send_json({"type": "partial", "text": res.get("partial", "")})
+            if sender.done():
+                # Surface send-side failures (e.g. client went away mid-frame)
+                sender.result()
+                break
+            audio_bytes = decoder.decode(await ws.receive_bytes())
+            if audio_bytes:
+                await session.submit(audio_bytes)
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected from /ws/vosk")
         _connections.disconnect(ws)
     except Exception as exc:  # pragma: no cover
         logger.error("WebSocket /ws/vosk error: %s", exc)
         await ws.close(code=1011)
-        _connections.disconnect(ws) 
\ No newline at end of file
+        _connections.disconnect(ws)
+    finally:
+        session.close()
+        sender.cancel()
+        lease.release()
+        if session.chunks.dropped_chunks:
+            logger.warning(
+                "/ws/vosk session dropped %d chunks (%d bytes) under overload",
+                session.chunks.dropped_chunks,
+                session.chunks.dropped_bytes,
+            )
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+"""Shared Whisper inference worker batching windows across streaming sessions.
+
+Instead of every :class:`WhisperStreamingHandler` running its own
+``model.transcribe`` call, sessions submit their due audio window here.  A
+single worker thread per ``(model, device)`` collects the windows that
+arrive within ``max_wait`` seconds (up to ``max_batch_size``), converts them
+to padded log-mel spectrograms and runs them through one batched
+``whisper.decode`` forward pass.  Each result is handed back through the
+callback supplied with the request, typically writing to the session's
+update queue.
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...core.container import global_container
+from ...core.interfaces.config_service import IConfigurationService
+from ..model_registry import get_model_registry
+
+logger = logging.getLogger("ambient_scribe")
+
+__all__ = ["WhisperBatchWorker", "get_whisper_batcher", "batched_busy_seconds"]
+
+ResultCallback = Callable[[Optional[str], Optional[BaseException]], None]
+
+
+@dataclass
+class _Request:
+    audio: Any  # float32 numpy array in [-1, 1]
+    callback: ResultCallback
+    prompt: Optional[str] = None
+    submitted_at: float = field(default_factory=time.perf_counter)
+
+
+class WhisperBatchWorker:
+    """Background thread running batched Whisper decodes for many sessions."""
+
+    def __init__(
+        self,
+        model_size: str,
+        device: str = "cpu",
+        *,
+        max_batch_size: int = 8,
+        max_wait: float = 0.05,
+        language: str = "en",
+    ) -> None:
+        self.model_size = model_size
+        self.device = device
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+        self.language = language
+        self._lease = get_model_registry().acquire("whisper", model_size, device)
+        self._requests: queue.Queue = queue.Queue()
+        self._batches = 0
+        self._items = 0
+        self._wait_seconds = 0.0
+        self._forward_seconds = 0.0
+        self._thread = threading.Thread(
+            target=self._run, name=f"whisper-batch-{model_size}", daemon=True
+        )
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    def submit(self, audio: Any, callback: ResultCallback, *, prompt: str | None = None) -> None:  # noqa: D401
+        """Queue a float32 *audio* window; *callback* receives ``(text, error)``."""
+        self._requests.put(_Request(audio=audio, callback=callback, prompt=prompt))
+
+    # ------------------------------------------------------------------
+    def _collect(self) -> List[_Request]:
+        batch = [self._requests.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    # ------------------------------------------------------------------
+    def _run(self) -> None:  # noqa: D401
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            self._wait_seconds += sum(started - r.submitted_at for r in batch)
+
+            # DecodingOptions carry one prompt, so split by prompt.
+            groups: Dict[Optional[str], List[_Request]] = {}
+            for req in batch:
+                groups.setdefault(req.prompt, []).append(req)
+            for prompt, reqs in groups.items():
+                try:
+                    texts = self._decode([r.audio for r in reqs], prompt)
+                except Exception as exc:  # pragma: no cover – model failure
+                    logger.error("Batched Whisper decode failed: %s", exc)
+                    for req in reqs:
+                        self._deliver(req, None, exc)
+                    continue
+                for req, text in zip(reqs, texts):
+                    self._deliver(req, text, None)
+
+            self._forward_seconds += time.perf_counter() - started
+            self._batches += 1
+            self._items += len(batch)
+
+    # ------------------------------------------------------------------
+    def _decode(self, windows: List[Any], prompt: Optional[str]) -> List[str]:
+        import torch  # type: ignore
+        import whisper  # type: ignore
+
+        model = self._lease.model
+        n_mels = getattr(getattr(model, "dims", None), "n_mels", 80)
+        mels = [
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=n_mels)
+            for audio in windows
+        ]
+        mel = torch.stack(mels).to(model.device)
+        options = whisper.DecodingOptions(
+            language=self.language,
+            prompt=prompt,
+            without_timestamps=True,
+            fp16=self.device != "cpu",
+        )
+        results = whisper.decode(model, mel, options)
+        return [r.text.strip() for r in results]
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _deliver(req: _Request, text: Optional[str], exc: Optional[BaseException]) -> None:
+        try:
+            req.callback(text, exc)
+        except Exception as cb_exc:  # pragma: no cover – misbehaving session
+            logger.error("Whisper batch callback failed: %s", cb_exc)
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:  # noqa: D401
+        """Return batching efficiency counters."""
+        return {
+            "model": self.model_size,
+            "device": self.device,
+            "batches": self._batches,
+            "windows": self._items,
+            "avg_batch_size": self._items / self._batches if self._batches else 0.0,
+            "avg_wait_ms": self._wait_seconds / self._items * 1000.0 if self._items else 0.0,
+            "avg_batch_ms": self._forward_seconds / self._batches * 1000.0 if self._batches else 0.0,
+            "busy_seconds": self._forward_seconds,
+            "queued": self._requests.qsize(),
+        }
+
+
+_WORKERS: Dict[Tuple[str, str], WhisperBatchWorker] = {}
+_WORKERS_LOCK = threading.Lock()
+
+
+def get_whisper_batcher(model_size: str, device: str = "cpu") -> WhisperBatchWorker:
+    """Return the shared batch worker for *model_size* on *device*.
+
+    Batch size and max-wait come from ``whisper_batch_size`` and
+    ``whisper_batch_max_wait_ms``.
+    """
+    key = (model_size, device)
+    with _WORKERS_LOCK:
+        worker = _WORKERS.get(key)
+        if worker is None:
+            try:
+                cfg = global_container.resolve(IConfigurationService)
+                batch_size = int(cfg.get("whisper_batch_size", 8))
+                max_wait_ms = float(cfg.get("whisper_batch_max_wait_ms", 50))
+            except Exception:  # pragma: no cover – DI not ready
+                batch_size, max_wait_ms = 8, 50.0
+            worker = WhisperBatchWorker(
+                model_size,
+                device,
+                max_batch_size=batch_size,
+                max_wait=max_wait_ms / 1000.0,
+            )
+            _WORKERS[key] = worker
+        return worker
+
+
+def batched_busy_seconds() -> float:
+    """Total decode time spent by all batch workers so far (seconds)."""
+    with _WORKERS_LOCK:
+        workers = list(_WORKERS.values())
+    return sum(worker._forward_seconds for worker in workers)
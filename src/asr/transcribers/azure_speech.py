@@ -1,14 +1,25 @@
 from __future__ import annotations
 
-"""Azure Speech transcriber (REST) extracted from legacy azure.py during Phase-6."""
+"""Azure Speech transcriber (REST) extracted from legacy azure.py during Phase-6.
+
+The REST endpoint accepts at most 60 s of audio per request, so recordings
+are cut into chunks of up to ``chunk_seconds``, at the quietest point of
+the last few seconds before each limit so no word is split.  Chunks are
+recognised concurrently, at most ``max_concurrent`` at a time
+(``azure_batch_max_uploads``), and reassembled in order.  Chunks answered
+with 429 or 5xx, or that hit a connection error, are retried up to
+``max_retries`` times with jittered exponential backoff, honouring
+``Retry-After``.  Per-chunk upload time and throughput are logged and kept
+in :attr:`AzureSpeechTranscriber.chunk_results`.
+"""
 
-import io
-import wave
 import asyncio
 import logging
-from dataclasses import dataclass
+import random
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, List, Optional
 
 import requests
 
@@ -28,6 +39,30 @@ def _cfg_get(key: str, default=None):  # noqa: D401
     return _cfg.get(key, default) if _cfg else default
 
 
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+_BACKOFF_CAP_S = 20.0
+
+
+@dataclass
+class ChunkResult:
+    """Outcome and upload throughput of one recognised chunk."""
+
+    index: int
+    start_s: float
+    duration_s: float
+    bytes_sent: int
+    attempts: int = 0
+    upload_s: float = 0.0
+    status: int = 0
+    text: str = ""
+    error: Optional[str] = None
+
+    @property
+    def realtime_factor(self) -> float:
+        """Seconds of audio recognised per second spent uploading."""
+        return self.duration_s / self.upload_s if self.upload_s else 0.0
+
+
 @dataclass
 class AzureSpeechTranscriber(Transcriber):
     """Transcriber using Azure Speech service with optional OpenAI post-processing."""
@@ -38,9 +73,20 @@ class AzureSpeechTranscriber(Transcriber):
     openai_endpoint: Optional[str] = None
     language: str = "en-US"
     return_raw: bool = False
+    max_concurrent: Optional[int] = None
+    max_retries: Optional[int] = None
+    chunk_seconds: float = 45.0
+    backoff_s: float = 0.5
+    post: Optional[Callable[..., Any]] = field(default=None, repr=False)
 
     def __post_init__(self) -> None:  # noqa: D401
         self.language = self.language or "en-US"
+        if self.max_concurrent is None:
+            self.max_concurrent = int(_cfg_get("azure_batch_max_uploads", 4))
+        if self.max_retries is None:
+            self.max_retries = int(_cfg_get("azure_batch_max_retries", 3))
+        self.max_concurrent = max(1, self.max_concurrent)
+        self.chunk_results: List[ChunkResult] = []
 
     # ------------------------------------------------------------------
     def _get_provider(self):  # noqa: D401
@@ -81,52 +127,96 @@ class AzureSpeechTranscriber(Transcriber):
             logger.error("Azure OpenAI post-processing error: %s", exc)
             return transcript
 
+    # ------------------------------------------------------------------
+    def _backoff(self, attempt: int, resp: Any = None) -> float:
+        retry_after = (getattr(resp, "headers", None) or {}).get("Retry-After")
+        try:
+            if retry_after is not None:
+                return min(_BACKOFF_CAP_S, float(retry_after))
+        except ValueError:  # HTTP-date form
+            pass
+        # Full jitter keeps retries of concurrent chunks from moving in lockstep.
+        return random.uniform(0, min(_BACKOFF_CAP_S, self.backoff_s * 2 ** attempt))
+
+    async def _recognize_chunk(self, result: ChunkResult, wav: bytes, abort: asyncio.Event) -> ChunkResult:
+        url = f"{self.speech_endpoint.rstrip('/')}/speech/recognition/conversation/cognitiveservices/v1"
+        headers = {"api-key": self.speech_key, "Content-Type": "audio/wav"}
+        params = {"language": self.language}
+        post = self.post or requests.post
+        started = time.perf_counter()
+        while not abort.is_set():
+            result.attempts += 1
+            resp = None
+            try:
+                resp = await asyncio.to_thread(post, url, headers=headers, params=params, data=wav, timeout=60)
+                result.status = resp.status_code
+            except requests.RequestException as exc:
+                result.status, result.error = 0, f"ERROR: Azure Speech request failed (Chunk {result.index + 1}): {exc}"
+            if resp is not None and resp.status_code == 200:
+                res_json = resp.json()
+                if res_json.get("RecognitionStatus") == "Success":
+                    result.text = res_json.get("DisplayText", "").strip()
+                result.error = None
+                break
+            if resp is not None:
+                result.error = (
+                    f"ERROR: Azure Speech API error (Chunk {result.index + 1}): {resp.status_code} - {resp.text[:200]}"
+                )
+                if "language" in resp.text.lower() and resp.status_code not in _RETRY_STATUS:
+                    result.error = f"ERROR: Invalid language '{self.language}' for Azure Speech."
+            retryable = resp is None or resp.status_code in _RETRY_STATUS
+            if not retryable or result.attempts > self.max_retries:
+                abort.set()  # no point uploading the rest
+                break
+            delay = self._backoff(result.attempts - 1, resp)
+            logger.warning("%s; retrying in %.2fs", result.error, delay)
+            await asyncio.sleep(delay)
+        result.upload_s = time.perf_counter() - started
+        if result.error is None:
+            logger.info(
+                "Azure chunk %d: %.1fs audio, %d bytes in %.2fs (%.1fx realtime, %d attempt(s))",
+                result.index + 1, result.duration_s, result.bytes_sent, result.upload_s,
+                result.realtime_factor, result.attempts,
+            )
+        return result
+
     # ------------------------------------------------------------------
     async def transcribe(self, audio_path: Path, **kwargs) -> str:  # noqa: D401
         if not self.speech_key or not self.speech_endpoint:
             return "ERROR: Azure Speech requires API key and endpoint for transcription."
         try:
-            transcript_parts: list[str] = []
-            with wave.open(str(audio_path), "rb") as wf:
-                channels, sampwidth, framerate, nframes = (
-                    wf.getnchannels(),
-                    wf.getsampwidth(),
-                    wf.getframerate(),
-                    wf.getnframes(),
-                )
-                max_chunk_s = 45
-                frames_per_chunk = int(framerate * max_chunk_s)
-                num_chunks = (nframes + frames_per_chunk - 1) // frames_per_chunk
-                for i in range(num_chunks):
-                    wf.setpos(i * frames_per_chunk)
-                    chunk_frames = wf.readframes(frames_per_chunk)
-                    if not chunk_frames:
-                        continue
-                    with io.BytesIO() as chunk_io, wave.open(chunk_io, "wb") as chunk_w:
-                        chunk_w.setnchannels(channels)
-                        chunk_w.setsampwidth(sampwidth)
-                        chunk_w.setframerate(framerate)
-                        chunk_w.writeframes(chunk_frames)
-                        chunk_data = chunk_io.getvalue()
-                    url = f"{self.speech_endpoint.rstrip('/')}" \
-                          "/speech/recognition/conversation/cognitiveservices/v1"
-                    headers = {"api-key": self.speech_key, "Content-Type": "audio/wav"}
-                    params = {"language": self.language}
-                    resp = requests.post(url, headers=headers, params=params, data=chunk_data, timeout=60)
-                    if resp.status_code == 200:
-                        res_json = resp.json()
-                        if res_json.get("RecognitionStatus") == "Success":
-                            text = res_json.get("DisplayText", "").strip()
-                            if text:
-                                transcript_parts.append(text)
-                    else:
-                        err_text = (
-                            f"Azure Speech API error (Chunk {i+1}): {resp.status_code} - {resp.text[:200]}"
-                        )
-                        logger.error(err_text)
-                        if "language" in resp.text.lower():
-                            return f"ERROR: Invalid language '{self.language}' for Azure Speech."
-                        return err_text
+            from ...audio.pcm_store import get_pcm_store
+            from ...audio.vad import split_at_pauses
+
+            audio = get_pcm_store().open(audio_path)
+            bounds = split_at_pauses(audio.samples, audio.rate, self.chunk_seconds, search_seconds=5.0)
+            semaphore = asyncio.Semaphore(self.max_concurrent)
+            abort = asyncio.Event()
+
+            async def _chunk(index: int, start: int, end: int) -> ChunkResult:
+                result = ChunkResult(index, start / audio.rate, (end - start) / audio.rate, 0)
+                async with semaphore:
+                    if abort.is_set():
+                        return result
+                    wav = audio.wav_bytes(start, end)
+                    result.bytes_sent = len(wav)
+                    return await self._recognize_chunk(result, wav, abort)
+
+            started = time.perf_counter()
+            self.chunk_results = list(
+                await asyncio.gather(*(_chunk(i, start, end) for i, (start, end) in enumerate(bounds)))
+            )
+            elapsed = time.perf_counter() - started
+            failed = next((r for r in self.chunk_results if r.error), None)
+            if failed is not None:
+                logger.error(failed.error)
+                return failed.error
+            logger.info(
+                "Azure Speech recognised %.1fs of audio in %d chunk(s) in %.2fs (%.1fx realtime, %d concurrent)",
+                audio.duration, len(bounds), elapsed, audio.duration / elapsed if elapsed else 0.0,
+                self.max_concurrent,
+            )
+            transcript_parts = [r.text for r in self.chunk_results if r.text]
             combined_transcript = " ".join(transcript_parts).strip()
             if not combined_transcript:
                 return "NOTE: Azure Speech generated empty transcript."
@@ -138,4 +228,4 @@ class AzureSpeechTranscriber(Transcriber):
             return f"ERROR: Azure Speech pipeline failed: {exc}"
 
 
-__all__ = ["AzureSpeechTranscriber"] 
\ No newline at end of file
+__all__ = ["AzureSpeechTranscriber", "ChunkResult"] 
\ No newline at end of file
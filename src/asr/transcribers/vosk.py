@@ -11,6 +11,7 @@ import requests
 from dataclasses import dataclass
 
 from ..base import Transcriber  # one level up to src.asr.base
+from ..model_registry import get_model_registry
 from ...core.container import global_container
 from ...core.interfaces.config_service import IConfigurationService
 
@@ -97,23 +98,21 @@ class VoskTranscriber(Transcriber):
     # ------------------------------------------------------------------
     async def transcribe(self, audio_path: Path, **kwargs) -> str:  # noqa: D401
         try:
-            from vosk import Model, KaldiRecognizer  # type: ignore
+            from vosk import KaldiRecognizer  # type: ignore
         except ImportError:
             return (
                 "ERROR: 'vosk' library not installed. "
                 "Please install it (e.g., pip install vosk)."
             )
 
-        # Ensure WAV format
+        # Canonical 16 kHz mono PCM, decoded once and shared with other engines
         try:
-            from ...audio.utils import convert_to_wav  # use new audio utils path
+            from ...audio.pcm_store import get_pcm_store
 
-            logger.info("Converting audio file: %s", audio_path)
-            converted_path = convert_to_wav(audio_path)
-            audio_path = Path(converted_path)
-            logger.info("Audio converted to: %s", audio_path)
+            audio = get_pcm_store().open(audio_path)
         except Exception as exc:
-            logger.error("Audio conversion failed, using original file: %s", exc)
+            logger.error("Audio decoding failed (file: %s): %s", audio_path, exc)
+            return f"ERROR: Audio conversion failed: {exc}"
 
         err = self._ensure_model()
         if err:
@@ -121,8 +120,13 @@ class VoskTranscriber(Transcriber):
             return err
 
         try:
-            logger.info("Loading Vosk model from: %s", self.model_path)
-            model = Model(str(self.model_path))
+            lease = get_model_registry().acquire("vosk", self.model_path)
+        except Exception as exc:
+            logger.error("Vosk model load failed (model: %s): %s", self.model_path, exc)
+            return f"ERROR: Vosk transcription failed: {exc}"
+
+        try:
+            model = lease.model
 
             # Obtain sample rate from config
             sample_rate = 16000
@@ -136,29 +140,13 @@ class VoskTranscriber(Transcriber):
             rec = KaldiRecognizer(model, sample_rate)
             rec.SetWords(True)
 
-            import wave  # stdlib
-
-            logger.info("Opening WAV file: %s", audio_path)
-            with wave.open(str(audio_path), "rb") as wf:
-                channels = wf.getnchannels()
-                rate = wf.getframerate()
-                frames = wf.getnframes()
-                logger.info("WAV format: %s ch, %s Hz, %s frames", channels, rate, frames)
-
-                if channels != 1:
-                    logger.warning("Audio has %s channels, expected 1 (mono)", channels)
-                if rate != sample_rate:
-                    logger.warning("Audio sample rate is %s, expected %s", rate, sample_rate)
-
-                total_frames_processed = 0
-                while True:
-                    audio_frames = wf.readframes(4000)
-                    if not audio_frames:
-                        break
-                    rec.AcceptWaveform(audio_frames)
-                    total_frames_processed += len(audio_frames)
+            if audio.rate != sample_rate:
+                logger.warning("Audio sample rate is %s, expected %s", audio.rate, sample_rate)
 
-                logger.info("Processed %s audio bytes", total_frames_processed)
+            samples = audio.samples
+            for start in range(0, len(samples), 4000):
+                rec.AcceptWaveform(samples[start : start + 4000].tobytes())
+            logger.info("Processed %.1fs of audio from %s", audio.duration, audio.path)
 
             logger.info("Retrieving final result from Vosk …")
             final_result = json.loads(rec.FinalResult())
@@ -169,5 +157,7 @@ class VoskTranscriber(Transcriber):
         except Exception as exc:  # pragma: no cover – runtime failure
             logger.error("Vosk recognition failed (model: %s): %s", self.model_path, exc)
             return f"ERROR: Vosk transcription failed: {exc}"
+        finally:
+            lease.release()
 
 __all__ = ["VoskTranscriber"] 
\ No newline at end of file
@@ -5,7 +5,10 @@ import subprocess
 from pathlib import Path
 import logging
 
+import numpy as np
+
 from ..base import Transcriber
+from ..model_registry import get_model_registry
 from ...core.container import global_container
 from ...core.interfaces.config_service import IConfigurationService
 
@@ -27,7 +30,6 @@ class WhisperTranscriber(Transcriber):
     """Transcriber using local Whisper models."""
 
     # ------------------------------------------------------------------
-    _MODEL_CACHE: dict[str, "whisper.Whisper"] = {}
     _FFMPEG_CHECKED = False
     _FFMPEG_AVAILABLE = False
 
@@ -125,30 +127,31 @@ class WhisperTranscriber(Transcriber):
         if not WhisperTranscriber._FFMPEG_AVAILABLE:
             logger.warning("FFmpeg not available - Whisper will work with limited audio format support")
 
-        import whisper  # type: ignore
-
         custom_model_dir = Path(str(_cfg_get("whisper_models_dir", Path("./app_data/whisper_models"))))
         custom_model_dir.mkdir(parents=True, exist_ok=True)
 
         device_to_use = str(_cfg_get("whisper_device", "cpu"))
         try:
-            if self.size in WhisperTranscriber._MODEL_CACHE:
-                model = WhisperTranscriber._MODEL_CACHE[self.size]
-            else:
-                logger.info("Loading Whisper model '%s' from %s", self.size, custom_model_dir)
-                model = whisper.load_model(
-                    name=self.size,
-                    download_root=str(custom_model_dir),
-                    device=device_to_use,
-                )
-                WhisperTranscriber._MODEL_CACHE[self.size] = model
+            lease = get_model_registry().acquire("whisper", self.size, device_to_use)
         except Exception as exc:  # pragma: no cover – download
             logger.error("Failed to load Whisper model %s: %s", self.size, exc)
             return f"ERROR: Failed to load Whisper model: {exc}"
+        model = lease.model
+
+        # Whisper accepts float32 samples at 16 kHz directly; feeding them from
+        # the shared PCM store skips Whisper's own ffmpeg decode.
+        try:
+            from ...audio.pcm_store import get_pcm_store
+
+            samples = get_pcm_store().open(audio_path).samples
+            audio = np.multiply(samples, 1 / 32768.0, dtype=np.float32)
+        except Exception as exc:
+            logger.warning("PCM store unavailable, Whisper will decode %s itself: %s", audio_path, exc)
+            audio = str(audio_path)
 
         try:
             result = model.transcribe(
-                str(audio_path),
+                audio,
                 language="en",
                 fp16=False if device_to_use == "cpu" else True,
             )
@@ -156,5 +159,7 @@ class WhisperTranscriber(Transcriber):
         except Exception as exc:  # pragma: no cover – runtime
             logger.error("Local Whisper recognition failed (size=%s): %s", self.size, exc)
             return f"ERROR: Local Whisper transcription failed: {exc}"
+        finally:
+            lease.release()
 
 __all__ = ["WhisperTranscriber"] 
\ No newline at end of file
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+"""Content-addressed cache of finished transcripts.
+
+Clinicians often upload the same recording again, e.g. to try another note
+template, and each upload used to pay for a full decode.
+:func:`transcribe_audio` now looks the transcript up first, keyed by
+
+    sha256(audio bytes) + engine + factory options (model size / path) + language
+
+Entries live under ``<base_dir>/transcript_cache`` and are encrypted with
+the application key through :class:`ISecurityService`, like the encrypted
+recordings.  The cache is bounded by ``asr_transcript_cache_mb`` (least
+recently used entries are evicted first) and entries older than
+``asr_transcript_cache_ttl_s`` are treated as misses and deleted.
+
+Concurrent requests for the same key share a single decode
+(*singleflight*): the first caller starts it, later callers await the same
+task.  The decode keeps running if its first caller disconnects, so the
+others still get their result and the transcript is still cached.
+
+File times double as the index: ``mtime`` records when the entry was written
+(for the TTL) and ``atime`` records its last hit (for LRU).  Both are set
+explicitly, so the index can be rebuilt from a directory listing at start-up.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+from ..core.container import global_container
+from ..core.interfaces.config_service import IConfigurationService
+from ..core.interfaces.security_service import ISecurityService
+
+logger = logging.getLogger("ambient_scribe")
+
+__all__ = ["TranscriptCache", "get_transcript_cache", "transcript_key"]
+
+_SUFFIX = ".enc"
+
+
+def transcript_key(audio_hash: str, engine: str, options: Mapping[str, Any], language: Optional[str]) -> str:
+    """Return the cache key of *audio_hash* decoded by *engine* with *options*."""
+    identity = json.dumps(
+        {"audio": audio_hash, "engine": engine, "options": dict(options), "language": language or ""},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+class TranscriptCache:
+    """Encrypted on-disk transcript store with size-bounded LRU, TTL and singleflight."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        max_bytes: int,
+        ttl_seconds: float = 0.0,
+        security: Optional[ISecurityService] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._security = security
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()  # key → size, oldest access first
+        self._bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expired = 0
+        self._load_index()
+
+    @property
+    def security(self) -> ISecurityService:
+        if self._security is None:
+            try:
+                self._security = global_container.resolve(ISecurityService)
+            except Exception:  # not registered in this container
+                from ..core.services.security_service import SecurityService
+
+                self._security = SecurityService()
+        return self._security
+
+    # ------------------------------------------------------------------
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def _load_index(self) -> None:
+        if not self.directory.is_dir():
+            return
+        found = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            found.append((st.st_atime, path.stem, st.st_size))
+        for _atime, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+        with self._lock:
+            self._evict_locked()
+
+    def _forget_locked(self, key: str) -> None:
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._bytes -= size
+
+    def _drop_locked(self, key: str) -> None:
+        self._forget_locked(key)
+        self._path(key).unlink(missing_ok=True)
+
+    def _evict_locked(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._drop_locked(key)
+            self.evictions += 1
+
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached transcript for *key*, or ``None``."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self._path(key)
+            try:
+                written = path.stat().st_mtime
+                if self.ttl_seconds > 0 and time.time() - written > self.ttl_seconds:
+                    self._drop_locked(key)
+                    self.expired += 1
+                    self.misses += 1
+                    return None
+                cipher = path.read_bytes()
+                os.utime(path, (time.time(), written))
+            except OSError:
+                self._drop_locked(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        try:
+            transcript = json.loads(self.security.decrypt_data(cipher))["transcript"]
+        except Exception as exc:  # corrupt entry or rotated key
+            logger.warning("Discarding unreadable transcript cache entry %s: %s", key[:12], exc)
+            with self._lock:
+                self._drop_locked(key)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return transcript
+
+    def put(self, key: str, transcript: str) -> None:
+        """Store *transcript* under *key*, evicting least recently used entries."""
+        cipher = self.security.encrypt_data(json.dumps({"transcript": transcript}).encode())
+        if len(cipher) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(cipher)
+            os.replace(tmp, path)
+            self._forget_locked(key)
+            self._entries[key] = len(cipher)
+            self._bytes += len(cipher)
+            self._evict_locked()
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._drop_locked(key)
+
+    # ------------------------------------------------------------------
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[str]]) -> str:
+        """Return the cached transcript or run *compute* once for all concurrent callers.
+
+        Exceptions from *compute* are propagated to every waiting caller and
+        are not cached.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            with self._lock:
+                self.coalesced += 1
+            return await asyncio.shield(task)
+
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            return cached
+        task = self._inflight.get(key)  # another caller started while we read the disk
+        if task is not None:
+            with self._lock:
+                self.coalesced += 1
+            return await asyncio.shield(task)
+
+        async def _fill() -> str:
+            transcript = await compute()
+            try:
+                await asyncio.to_thread(self.put, key, transcript)
+            except Exception as exc:
+                logger.warning("Could not cache transcript %s: %s", key[:12], exc)
+            return transcript
+
+        task = asyncio.ensure_future(_fill())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._inflight),
+                "evictions": self.evictions,
+                "expired": self.expired,
+            }
+
+
+_CACHE: TranscriptCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_transcript_cache() -> Optional[TranscriptCache]:
+    """Return the process-wide cache, or ``None`` when ``asr_transcript_cache_mb`` is 0."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            try:
+                cfg = global_container.resolve(IConfigurationService)
+                base_dir = Path(cfg.get("base_dir", Path("./app_data")))
+                max_mb = float(cfg.get("asr_transcript_cache_mb", 64))
+                ttl = float(cfg.get("asr_transcript_cache_ttl_s", 7 * 24 * 3600))
+            except Exception:  # pragma: no cover – DI not ready
+                base_dir, max_mb, ttl = Path("./app_data"), 64.0, 7 * 24 * 3600.0
+            if max_mb <= 0:
+                return None
+            _CACHE = TranscriptCache(base_dir / "transcript_cache", max_bytes=int(max_mb * 1024 * 1024), ttl_seconds=ttl)
+        return _CACHE
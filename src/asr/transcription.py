@@ -1,13 +1,17 @@
 """Unified entry point for ASR transcribers."""
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 from typing import Optional, Union
 
 from core.bootstrap import container  # DI bootstrap
 from core.factories.transcriber_factory import TranscriberFactory
+from ..utils.file import get_file_hash
+from .executor import get_transcription_executor
 from .model_spec import ModelSpec, parse_model_spec
 from .exceptions import TranscriptionError
+from .transcript_cache import get_transcript_cache, transcript_key
 
 
 async def transcribe_audio(
@@ -21,12 +25,17 @@ async def transcribe_audio(
     openai_endpoint: Optional[str] = None,
     language: Optional[str] = "en-US",
     return_raw: bool = False,
+    use_cache: bool = True,
 ) -> str:
     """Dispatch transcription to the requested backend.
 
     ``model`` may be either the legacy string (e.g. ``"whisper_tiny"``)
     coming from the front-end or the new :class:`ModelSpec` object. The helper
     :func:`parse_model_spec` is used to normalise the value.
+
+    Finished transcripts are cached by audio content, engine, model and
+    language (see :mod:`asr.transcript_cache`); pass ``use_cache=False`` to
+    force a fresh decode.
     """
 
     wav_file = Path(audio_path)
@@ -41,16 +50,20 @@ async def transcribe_audio(
     provider_type, options = spec.to_factory_args()
 
     factory = container.resolve(TranscriberFactory)
+    if provider_type not in factory.get_supported_providers():
+        raise TranscriptionError(f"Transcriber provider '{provider_type}' not supported")
 
-    try:
-        transcriber = factory.create(provider_type, **options)  # type: ignore[arg-type]
-    except Exception as exc:  # pragma: no cover – factory mis-config
-        raise TranscriptionError(str(exc)) from exc
-
-    transcript = await transcriber.transcribe(wav_file)
+    async def _decode() -> str:
+        # Decoding runs in the engine's worker pool so the event loop stays free.
+        transcript = await get_transcription_executor().run(provider_type, options, wav_file)
 
-    # Legacy providers may return error strings – normalise them
-    if isinstance(transcript, str) and transcript.startswith("ERROR"):
-        raise TranscriptionError(transcript.removeprefix("ERROR:").strip())
+        # Legacy providers may return error strings – normalise them
+        if isinstance(transcript, str) and transcript.startswith("ERROR"):
+            raise TranscriptionError(transcript.removeprefix("ERROR:").strip())
+        return transcript
 
-    return transcript
+    cache = get_transcript_cache() if use_cache else None
+    audio_hash = await asyncio.to_thread(get_file_hash, wav_file) if cache is not None else ""
+    if not audio_hash:
+        return await _decode()
+    return await cache.get_or_compute(transcript_key(audio_hash, provider_type, options, language), _decode)
@@ -25,7 +25,7 @@ def _get_audio_config():
         base_dir = config_service.get("base_dir", Path("./app_data"))
         return {
             "rate": 16000,  # Default sample rate
-            "ffmpeg_path": None,  # Will be determined later
+            "ffmpeg_path": config_service.get("ffmpeg_path", None),
             "base_dir": base_dir,
         }
     except Exception:
@@ -97,10 +97,15 @@ def format_elapsed_time(start_time, current_time=None):
 
 # ---------------------------------------------------------------------------
 # Universal helper: convert any audio container to 16-kHz mono 16-bit WAV
-def convert_to_wav(in_path: str | Path) -> str:
+def convert_to_wav(in_path: str | Path, out_path: str | Path | None = None) -> str:
     """
     Convert any audio format to WAV (16-kHz, mono, PCM-s16le) using ffmpeg.
     Always verifies the file is proper WAV format, even if extension is .wav.
+
+    The result is written to *out_path* when given, otherwise next to the
+    input as ``converted_<stem>.wav``.  Prefer
+    :meth:`src.audio.pcm_store.PCMStore.open`, which decodes each input once
+    and shares the result.
     """
     in_path = Path(in_path)
     
@@ -113,19 +118,27 @@ def convert_to_wav(in_path: str | Path) -> str:
             import wave
             with wave.open(str(in_path), 'rb') as wf:
                 # If we can read it as WAV and it's the right format, keep it
-                if wf.getnchannels() == 1 and wf.getframerate() == int(audio_config["rate"]):
+                if (
+                    wf.getnchannels() == 1
+                    and wf.getsampwidth() == 2
+                    and wf.getframerate() == int(audio_config["rate"])
+                ):
                     is_proper_wav = True
                     logger.info(f"File is already proper WAV format: {in_path}")
         except Exception as e:
             logger.info(f"File appears to be non-WAV despite .wav extension: {e}")
     
     if is_proper_wav:
+        if out_path is not None:
+            import shutil
+            shutil.copyfile(in_path, out_path)
+            return str(out_path)
         return str(in_path)
 
     # Create unique output filename to avoid conflicts
     import tempfile
     temp_dir = Path(in_path).parent
-    out_path = str(temp_dir / f"converted_{Path(in_path).stem}.wav")
+    out_path = str(out_path or temp_dir / f"converted_{Path(in_path).stem}.wav")
     
     # Determine FFmpeg path
     ffmpeg_path = ""
@@ -140,6 +153,11 @@ def convert_to_wav(in_path: str | Path) -> str:
             "ffmpeg", "bin", "ffmpeg.exe" if os.name == "nt" else "ffmpeg",
         )
 
+    if not os.path.exists(ffmpeg_path):
+        # Fall back to the configured binary, then to the one on PATH.
+        import shutil
+        ffmpeg_path = audio_config["ffmpeg_path"] or shutil.which("ffmpeg") or ffmpeg_path
+
     if not os.path.exists(ffmpeg_path):
         logger.error(f"FFmpeg not found at expected path: {ffmpeg_path}")
         raise RuntimeError(f"FFmpeg not found at {ffmpeg_path}")
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+"""Single-producer / multi-consumer byte ring for captured audio.
+
+The capture callback is the only writer of :class:`FanoutRing`.  Like a
+seqlock, it first announces how far the block will reach (``writing``),
+then copies it into a fixed ``bytearray`` and only then publishes the new
+write position (``written``).  It never takes a lock and never waits for
+a reader.  Every
+consumer owns a :class:`RingCursor` with its own read position, so a slow
+ASR handler cannot stall the disk writer or the level meter.  A consumer
+that falls more than ``capacity`` bytes behind skips forward to the oldest
+retained byte; the skipped bytes are counted in ``dropped_bytes``.  The
+copy a reader makes is validated against ``writing`` afterwards, so bytes
+the producer overwrote during the copy, including by a write that is not
+yet published, are discarded the same way.  Readers never return torn
+audio.
+
+Each cursor tracks its backlog (``lag``), the worst backlog seen and drops,
+so an overloaded consumer shows up in :meth:`FanoutRing.stats`.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+__all__ = ["FanoutRing", "RingCursor"]
+
+
+class RingCursor:
+    """One consumer's read position in a :class:`FanoutRing`."""
+
+    def __init__(self, ring: FanoutRing, name: str, position: int) -> None:
+        self.ring = ring
+        self.name = name
+        self.position = position  # absolute byte offset of the next read
+        self.read_bytes = 0
+        self.dropped_bytes = 0
+        self.max_lag_bytes = 0
+        self._wake = threading.Event()
+
+    # ------------------------------------------------------------------
+    @property
+    def lag_bytes(self) -> int:
+        """Bytes written but not yet read by this consumer."""
+        return min(self.ring.written - self.position, self.ring.capacity)
+
+    def read(self, max_bytes: Optional[int] = None, timeout: Optional[float] = None) -> bytes:
+        """Return the next available bytes, waiting up to *timeout* for some.
+
+        Returns ``b""`` on timeout or once the ring is closed and drained.
+        """
+        ring = self.ring
+        while ring.written == self.position:
+            if ring.closed:
+                return b""
+            self._wake.clear()
+            # Re-check after clearing so a write in between is not missed.
+            if ring.written != self.position or ring.closed:
+                continue
+            if not self._wake.wait(timeout):
+                return b""
+
+        written = ring.written
+        backlog = written - self.position
+        self.max_lag_bytes = max(self.max_lag_bytes, backlog)
+        if backlog > ring.capacity:
+            self._skip(backlog - ring.capacity)
+            backlog = ring.capacity
+        n = backlog if max_bytes is None else min(backlog, max_bytes)
+        data = ring._copy(self.position, n)
+
+        # The producer may have lapped us while copying, or be overwriting
+        # our bytes right now: drop the clobbered prefix.
+        oldest = ring.writing - ring.capacity
+        if oldest > self.position:
+            clobbered = min(n, oldest - self.position)
+            data = data[clobbered:]
+            self.dropped_bytes += clobbered
+        self.position += n
+        self.read_bytes += len(data)
+        return data
+
+    def _skip(self, n: int) -> None:
+        self.position += n
+        self.dropped_bytes += n
+
+    def close(self) -> None:
+        """Detach from the ring; the producer stops tracking this cursor."""
+        self.ring._detach(self)
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:  # noqa: D401
+        bps = self.ring.bytes_per_second
+        lag = self.lag_bytes
+        return {
+            "read_bytes": self.read_bytes,
+            "lag_bytes": lag,
+            "lag_seconds": lag / bps if bps else None,
+            "max_lag_bytes": self.max_lag_bytes,
+            "max_lag_seconds": self.max_lag_bytes / bps if bps else None,
+            "dropped_bytes": self.dropped_bytes,
+        }
+
+
+class FanoutRing:
+    """Fixed-size byte ring with one writer and independent reader cursors."""
+
+    def __init__(self, capacity: int, *, bytes_per_second: Optional[int] = None) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self.bytes_per_second = bytes_per_second
+        self._buf = bytearray(self.capacity)
+        self.written = 0  # absolute bytes published
+        self.writing = 0  # end of the block being copied in (>= written)
+        self.closed = False
+        self._cursors: List[RingCursor] = []
+
+    @classmethod
+    def for_duration(cls, seconds: float, *, bytes_per_second: int = 32000) -> FanoutRing:
+        return cls(max(1, int(seconds * bytes_per_second)), bytes_per_second=bytes_per_second)
+
+    # ------------------------------------------------------------------
+    def cursor(self, name: str) -> RingCursor:
+        """Register a consumer that reads everything written from now on."""
+        cursor = RingCursor(self, name, self.written)
+        # Copy-on-write so the producer can iterate without a lock.
+        self._cursors = self._cursors + [cursor]
+        return cursor
+
+    def _detach(self, cursor: RingCursor) -> None:
+        self._cursors = [c for c in self._cursors if c is not cursor]
+
+    # ------------------------------------------------------------------
+    def write(self, data: bytes) -> None:
+        """Append *data* and wake all consumers (producer thread only)."""
+        n = len(data)
+        if not n or self.closed:
+            return
+        written = self.written
+        if n > self.capacity:
+            # Only the newest ``capacity`` bytes can be retained.
+            written += n - self.capacity
+            data = memoryview(data)[n - self.capacity :]
+            n = self.capacity
+        self.writing = written + n  # announce the overwrite before the copy
+        pos = written % self.capacity
+        first = min(n, self.capacity - pos)
+        self._buf[pos : pos + first] = data[:first]
+        if first < n:
+            self._buf[: n - first] = data[first:]
+        self.written = written + n  # publish only after the copy
+        for cursor in self._cursors:
+            cursor._wake.set()
+
+    def _copy(self, position: int, n: int) -> bytes:
+        pos = position % self.capacity
+        first = min(n, self.capacity - pos)
+        if first == n:
+            return bytes(self._buf[pos : pos + n])
+        return bytes(self._buf[pos:]) + bytes(self._buf[: n - first])
+
+    def close(self) -> None:
+        """Stop accepting writes; readers drain what is left, then get ``b""``."""
+        self.closed = True
+        for cursor in self._cursors:
+            cursor._wake.set()
+
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, dict]:
+        """Per-consumer read, lag and drop counters."""
+        return {cursor.name: cursor.stats() for cursor in self._cursors}
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+"""Per-session audio quality metrics computed on raw int16 samples.
+
+:class:`AudioQualityMetrics` is fed the int16 view of every chunk a
+streaming session receives.  All reductions run on the integer samples with
+64-bit integer accumulators, so no float copy of the chunk is made.  Per
+chunk it derives RMS, peak, clipped-sample count and DC offset.  Chunk levels
+go into fixed-bucket dBFS histograms and a rolling window from which a
+noise-floor based SNR estimate is taken.  Memory is constant per session.
+"""
+
+import bisect
+import math
+from collections import deque
+from typing import Deque, Dict, List
+
+import numpy as np
+
+__all__ = ["AudioQualityMetrics"]
+
+_FULL_SCALE = 32768.0
+_CLIP_LEVEL = 32767  # |sample| at or above this counts as clipped
+# dBFS bucket edges shared by the level histograms: [-inf, -90), [-90, -84) … [-6, 0]
+_DBFS_EDGES: List[float] = [float(e) for e in range(-90, 1, 6)]
+_SNR_EDGES: List[float] = [float(e) for e in range(0, 61, 5)]
+
+
+def _dbfs(level: float) -> float:
+    return 20.0 * math.log10(level) if level > 0 else -math.inf
+
+
+class _Histogram:
+    """Counts of values falling into fixed buckets (plus under/overflow)."""
+
+    __slots__ = ("edges", "counts")
+
+    def __init__(self, edges: List[float]) -> None:
+        self.edges = edges
+        self.counts = [0] * (len(edges) + 1)
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_right(self.edges, value)] += 1
+
+    def to_dict(self) -> Dict[str, list]:
+        return {"edges": list(self.edges), "counts": list(self.counts)}
+
+
+class AudioQualityMetrics:
+    """Accumulate RMS, peak, clipping, DC offset and SNR for one session."""
+
+    def __init__(self, *, snr_window: int = 200) -> None:
+        self.chunks = 0
+        self.samples = 0
+        self._sum = 0  # Σx   (int, exact)
+        self._sum_sq = 0  # Σx²  (int, exact)
+        self._peak = 0
+        self._clipped = 0
+        self._chunk_rms_sum = 0.0
+        self._chunk_rms_max = 0.0
+        self._recent: Deque[float] = deque(maxlen=snr_window)
+        self.rms_hist = _Histogram(_DBFS_EDGES)
+        self.peak_hist = _Histogram(_DBFS_EDGES)
+        self.snr_hist = _Histogram(_SNR_EDGES)
+
+    # ------------------------------------------------------------------
+    def update(self, samples: np.ndarray) -> float:
+        """Account for one chunk of int16 *samples*; return its RMS (0–1)."""
+        n = len(samples)
+        if not n:
+            return 0.0
+        sum_sq = int(np.einsum("i,i->", samples, samples, dtype=np.int64))
+        total = int(samples.sum(dtype=np.int64))
+        peak = max(int(samples.max()), -int(samples.min()))
+        clipped = int(np.count_nonzero(samples >= _CLIP_LEVEL)) + int(np.count_nonzero(samples <= -_CLIP_LEVEL))
+
+        self.chunks += 1
+        self.samples += n
+        self._sum += total
+        self._sum_sq += sum_sq
+        self._clipped += clipped
+        self._peak = max(self._peak, peak)
+
+        rms = math.sqrt(sum_sq / n) / _FULL_SCALE
+        self._chunk_rms_sum += rms
+        self._chunk_rms_max = max(self._chunk_rms_max, rms)
+        self._recent.append(rms)
+        self.rms_hist.add(_dbfs(rms))
+        self.peak_hist.add(_dbfs(peak / _FULL_SCALE))
+        snr = self.snr_db()
+        if snr is not None:
+            self.snr_hist.add(snr)
+        return rms
+
+    # ------------------------------------------------------------------
+    def snr_db(self) -> float | None:
+        """Rolling SNR: loud (90th pct) over quiet (10th pct) recent chunks."""
+        if len(self._recent) < 10:
+            return None
+        levels = sorted(self._recent)
+        noise = levels[len(levels) // 10]
+        signal = levels[(len(levels) * 9) // 10]
+        if noise <= 0:
+            # Digital silence as the floor: report the top of the scale.
+            return None if signal <= 0 else _SNR_EDGES[-1]
+        return 20.0 * math.log10(signal / noise)
+
+    # ------------------------------------------------------------------
+    @property
+    def avg_chunk_rms(self) -> float:
+        return self._chunk_rms_sum / self.chunks if self.chunks else 0.0
+
+    @property
+    def max_chunk_rms(self) -> float:
+        return self._chunk_rms_max
+
+    # ------------------------------------------------------------------
+    def summary(self) -> dict:  # noqa: D401
+        """Return session-level metrics and histograms (levels in 0–1 / dBFS)."""
+        n = self.samples or 1
+        rms = math.sqrt(self._sum_sq / n) / _FULL_SCALE
+        peak = self._peak / _FULL_SCALE
+        return {
+            "chunks": self.chunks,
+            "samples": self.samples,
+            "rms": rms,
+            "rms_dbfs": _dbfs(rms) if rms > 0 else None,
+            "peak": peak,
+            "peak_dbfs": _dbfs(peak) if peak > 0 else None,
+            "clipping_ratio": self._clipped / n if self.samples else 0.0,
+            "dc_offset": self._sum / n / _FULL_SCALE if self.samples else 0.0,
+            "snr_db": self.snr_db(),
+            "histograms": {
+                "chunk_rms_dbfs": self.rms_hist.to_dict(),
+                "chunk_peak_dbfs": self.peak_hist.to_dict(),
+                "snr_db": self.snr_hist.to_dict(),
+            },
+        }
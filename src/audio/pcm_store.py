@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+"""Decoded-audio store shared by all batch engines.
+
+Every engine used to decode its input again.  Vosk ran ffmpeg into a
+``converted_<stem>.wav`` that was never removed, Whisper ran its own ffmpeg
+pass, and Azure re-read the WAV and re-encoded chunks.
+:class:`PCMStore` decodes each input once into canonical 16 kHz mono int16
+PCM, and consumers read it as a memory-mapped numpy view
+(:class:`DecodedAudio`):
+
+* inputs that already are canonical PCM WAV are mapped in place, so no
+  decode and no copy happens;
+* anything else is decoded by ffmpeg into ``<base_dir>/pcm/<sha256>.wav``,
+  keyed by the content hash of the input.  The same recording uploaded
+  again, or transcribed by another engine in another worker process, maps
+  the existing file.  A lock file next to the entry makes concurrent
+  processes wait for the first decode instead of repeating it.
+
+The store is bounded by ``audio_pcm_store_mb`` and evicts the entries used
+least recently first.  Entries unused for ``audio_pcm_store_ttl_s`` are
+deleted as well.  On POSIX, views that are already open stay valid after
+their entry is evicted.
+
+Entries are decoded patient audio in plain PCM.  Unlike the transcript
+cache they are not encrypted, so keep ``base_dir`` on encrypted storage
+and the TTL as short as the batch workload allows.
+"""
+
+import logging
+import os
+import shutil
+import struct
+import threading
+import time
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from ..core.container import global_container
+from ..core.interfaces.config_service import IConfigurationService
+from ..utils.file import get_file_hash
+
+logger = logging.getLogger("ambient_scribe")
+
+__all__ = ["DecodedAudio", "PCMStore", "get_pcm_store"]
+
+RATE = 16000
+_LOCK_STALE_S = 600.0  # a decode lock older than this belongs to a dead process
+_LOCK_POLL_S = 0.05
+_SWEEP_INTERVAL_S = 300.0  # at most one expiry scan per interval
+
+
+def _data_chunk(path: Path) -> tuple[int, int]:
+    """Return ``(offset, nbytes)`` of the ``data`` chunk of the RIFF file *path*."""
+    size = path.stat().st_size
+    with open(path, "rb") as fh:
+        riff, _size, wave_id = struct.unpack("<4sI4s", fh.read(12))
+        if riff != b"RIFF" or wave_id != b"WAVE":
+            raise ValueError(f"{path} is not a RIFF/WAVE file")
+        pos = 12
+        while pos + 8 <= size:
+            fh.seek(pos)
+            chunk_id, chunk_size = struct.unpack("<4sI", fh.read(8))
+            if chunk_id == b"data":
+                # Streamed or truncated files may carry a placeholder size.
+                return pos + 8, min(chunk_size, size - pos - 8)
+            pos += 8 + chunk_size + (chunk_size & 1)
+    raise ValueError(f"{path} has no data chunk")
+
+
+def _is_canonical(path: Path, rate: int) -> bool:
+    try:
+        with wave.open(str(path), "rb") as wf:
+            return (
+                wf.getnchannels() == 1
+                and wf.getsampwidth() == 2
+                and wf.getframerate() == rate
+                and wf.getcomptype() == "NONE"
+            )
+    except (wave.Error, EOFError, OSError):
+        return False
+
+
+@dataclass(frozen=True)
+class DecodedAudio:
+    """Canonical mono int16 PCM backed by a memory-mapped WAV file."""
+
+    path: Path
+    samples: np.ndarray
+    rate: int = RATE
+
+    @classmethod
+    def map(cls, path: Union[str, Path], rate: int = RATE) -> DecodedAudio:
+        """Map the canonical PCM WAV *path* without reading it."""
+        path = Path(path)
+        offset, nbytes = _data_chunk(path)
+        count = nbytes // 2
+        if count == 0:
+            samples = np.zeros(0, dtype="<i2")
+        else:
+            samples = np.memmap(path, dtype="<i2", mode="r", offset=offset, shape=(count,))
+        return cls(path, samples, rate)
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.rate
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Zero-copy slice of samples ``start:end``."""
+        return self.samples[start:end]
+
+    def wav_bytes(self, start: int = 0, end: Optional[int] = None) -> bytes:
+        """Samples ``start:end`` as a standalone WAV file (for upload)."""
+        pcm = self.view(start, end)
+        header = struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36 + pcm.nbytes, b"WAVE",
+            b"fmt ", 16, 1, 1, self.rate, self.rate * 2, 2, 16,
+            b"data", pcm.nbytes,
+        )
+        return header + pcm.tobytes()
+
+    def write_wav(self, path: Union[str, Path], start: int = 0, end: Optional[int] = None) -> Path:
+        """Write samples ``start:end`` to *path* as a canonical WAV file."""
+        path = Path(path)
+        with wave.open(str(path), "wb") as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(self.rate)
+            out.writeframes(self.view(start, end))
+        return path
+
+
+class PCMStore:
+    """Content-addressed store of decoded audio under *directory*."""
+
+    def __init__(
+        self, directory: Union[str, Path], *, max_bytes: int = 0, ttl_seconds: float = 0.0, rate: int = RATE
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes  # 0 → unbounded
+        self.ttl_seconds = ttl_seconds  # since last use; 0 → no expiry
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, list] = {}  # key → [lock, threads using it]
+        self._last_sweep = 0.0
+        self.direct = 0
+        self.hits = 0
+        self.decodes = 0
+        self.evictions = 0
+        self.expired = 0
+        self.decode_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    def open(self, audio_path: Union[str, Path]) -> DecodedAudio:
+        """Return canonical PCM for *audio_path*, decoding it at most once."""
+        audio_path = Path(audio_path)
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        if _is_canonical(audio_path, self.rate):
+            with self._lock:
+                self.direct += 1
+            return DecodedAudio.map(audio_path, self.rate)
+
+        key = get_file_hash(audio_path)
+        if not key:
+            raise OSError(f"Could not hash {audio_path}")
+        entry = self.directory / f"{key}.wav"
+        with self._lock:
+            slot = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            slot[1] += 1
+        try:
+            with slot[0]:
+                if self._touch(entry):
+                    with self._lock:
+                        self.hits += 1
+                else:
+                    self._decode_locked(audio_path, entry)
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if not slot[1]:
+                    del self._key_locks[key]
+        if time.time() - self._last_sweep > _SWEEP_INTERVAL_S:
+            self._evict(keep=entry)
+        return DecodedAudio.map(entry, self.rate)
+
+    def _touch(self, entry: Path) -> bool:
+        try:
+            os.utime(entry)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _decode_locked(self, audio_path: Path, entry: Path) -> None:
+        """Decode into *entry*, or wait for another process already doing so."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lock = entry.with_suffix(".lock")
+        while True:
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                if self._touch(entry):
+                    with self._lock:
+                        self.hits += 1
+                    return
+                try:
+                    if time.time() - lock.stat().st_mtime > _LOCK_STALE_S:
+                        lock.unlink(missing_ok=True)
+                except FileNotFoundError:
+                    pass
+                time.sleep(_LOCK_POLL_S)
+        try:
+            os.close(fd)
+            if self._touch(entry):  # finished while we were taking the lock
+                with self._lock:
+                    self.hits += 1
+                return
+            started = time.perf_counter()
+            tmp = entry.with_name(f"{entry.stem}.{os.getpid()}.tmp.wav")
+            try:
+                from .audio_processing import convert_to_wav
+
+                convert_to_wav(audio_path, out_path=tmp)
+                os.replace(tmp, entry)
+            finally:
+                tmp.unlink(missing_ok=True)
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.decodes += 1
+                self.decode_seconds += elapsed
+            logger.info("Decoded %s into PCM store in %.2fs", audio_path.name, elapsed)
+        finally:
+            lock.unlink(missing_ok=True)
+        self._evict(keep=entry)
+
+    def _evict(self, keep: Path) -> None:
+        """Delete expired entries, then the least recently used over budget."""
+        self._last_sweep = time.time()
+        if self.max_bytes <= 0 and self.ttl_seconds <= 0:
+            return
+        if not self.directory.is_dir():
+            return
+        entries = []
+        for path in self.directory.glob("*.wav"):
+            if path.name.endswith(".tmp.wav"):
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_atime, path, st.st_size))
+        if self.ttl_seconds > 0:
+            horizon = time.time() - self.ttl_seconds
+            fresh = []
+            for atime, path, size in entries:
+                if atime >= horizon or path == keep:
+                    fresh.append((atime, path, size))
+                    continue
+                try:
+                    path.unlink()
+                except OSError:  # still mapped on Windows
+                    fresh.append((atime, path, size))
+                    continue
+                with self._lock:
+                    self.expired += 1
+            entries = fresh
+        if self.max_bytes <= 0:
+            return
+        total = sum(size for _atime, _path, size in entries)
+        for _atime, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:  # still mapped on Windows
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    # ------------------------------------------------------------------
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "direct": self.direct,
+                "hits": self.hits,
+                "decodes": self.decodes,
+                "decode_seconds": self.decode_seconds,
+                "evictions": self.evictions,
+                "expired": self.expired,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_STORE: PCMStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_pcm_store() -> PCMStore:
+    """Return the process-wide store under ``<base_dir>/pcm``."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            try:
+                cfg = global_container.resolve(IConfigurationService)
+                base_dir = Path(cfg.get("base_dir", Path("./app_data")))
+                max_mb = float(cfg.get("audio_pcm_store_mb", 2048))
+                ttl = float(cfg.get("audio_pcm_store_ttl_s", 24 * 3600))
+            except Exception:  # pragma: no cover – DI not ready
+                base_dir, max_mb, ttl = Path("./app_data"), 2048.0, 24 * 3600.0
+            _STORE = PCMStore(base_dir / "pcm", max_bytes=int(max_mb * 1024 * 1024), ttl_seconds=ttl)
+        return _STORE
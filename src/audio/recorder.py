@@ -1,24 +1,39 @@
 """
 Three-state audio recorder for Streamlit
 
-    ▶  start()   – begin capture (spawns a background thread)
-    ⏸  pause()   – temporary halt (non-blocking)
+    ▶  start()   – begin capture (PyAudio callback mode)
+    ⏸  pause()   – temporary halt (stops the input stream, nothing spins)
     ▶  resume()  – continue after pause
-    ■  stop()    – stop & write a 16 kHz mono 16-bit WAV; returns Path
+    ■  stop()    – stop & finalise the 16 kHz mono 16-bit WAV; returns Path
 
 NEW: optional on_chunk callback allows live ASR.
+
+The PortAudio callback only copies each block into a :class:`FanoutRing`.
+Consumers – the disk writer, the ``on_chunk`` callback and anything added
+with :meth:`StreamRecorder.add_consumer` (e.g. a level meter) – each run on
+their own thread with their own read cursor.  A slow ASR callback therefore
+builds up lag (see :meth:`StreamRecorder.stats`) instead of causing input
+overflows or delaying the WAV file.
+
+Audio is streamed to the WAV file as it is captured; only the last
+``tail_seconds`` are kept in memory (see :meth:`StreamRecorder.tail`), so
+memory stays flat however long the session runs and ``stop()`` merely
+patches the WAV header.
 """
 
 from __future__ import annotations
-import datetime, threading, wave
+import datetime, threading
 import logging
 from pathlib import Path
-from typing import List, Optional, Callable
+from typing import Callable, Dict, List, Optional
 
 import pyaudio
 
 from ..core.container import global_container
 from ..core.interfaces.config_service import IConfigurationService
+from .fanout import FanoutRing, RingCursor
+from .ring_buffer import PCMRingBuffer
+from .wav_writer import StreamingWavWriter
 
 # Setup logging using the standard Python logging module
 logger = logging.getLogger("ambient_scribe")
@@ -48,18 +63,40 @@ def _get_audio_config():
 
 
 class StreamRecorder:
-    """Thread-based audio grabber with pause / resume and live-chunk hook."""
-
-    def __init__(self, on_chunk: Callable[[bytes], None] | None = None) -> None:
+    """Callback-driven audio grabber with pause / resume and live-chunk hooks."""
+
+    def __init__(
+        self,
+        on_chunk: Callable[[bytes], None] | None = None,
+        *,
+        tail_seconds: float = 30.0,
+        buffer_seconds: float = 10.0,
+    ) -> None:
         self._audio:   Optional[pyaudio.PyAudio]  = None
         self._stream:  Optional[pyaudio.Stream]   = None
-        self._thread:  Optional[threading.Thread] = None
-        self._frames:  List[bytes]                = []
+        self._writer:  Optional[StreamingWavWriter] = None
+        self._ring:    Optional[FanoutRing]       = None
+        self._workers: List[threading.Thread]     = []
+        self._consumers: Dict[str, Callable[[bytes], None]] = {}
+        self._tail_seconds = tail_seconds
+        self._buffer_seconds = buffer_seconds
+        self._tail:    Optional[PCMRingBuffer]    = None
+        self._tail_lock = threading.Lock()
         self._running = False
         self._paused  = False
-        self._on_chunk = on_chunk                 # NEW — callback per CHUNK
+        self.overflows = 0                        # blocks PortAudio flagged
+        if on_chunk:                              # NEW — callback per CHUNK
+            self._consumers["on_chunk"] = on_chunk
 
     # ── user controls ──────────────────────────────────────────────────────
+    def add_consumer(self, name: str, fn: Callable[[bytes], None]) -> None:
+        """Deliver every captured chunk to *fn* on its own thread."""
+        if name == "disk" or name in self._consumers:
+            raise ValueError(f"Consumer '{name}' already registered")
+        self._consumers[name] = fn
+        if self._running:
+            self._spawn(name, fn)
+
     def start(self) -> None:
         if self._running:           # ignore double-starts
             return
@@ -69,25 +106,47 @@ class StreamRecorder:
         audio_config["cache_dir"].mkdir(parents=True, exist_ok=True)
         
         self._audio  = pyaudio.PyAudio()
+        fmt = getattr(pyaudio, audio_config["format_str"])
+        sample_width = self._audio.get_sample_size(fmt)
+        out = (audio_config["cache_dir"] /
+               f"rec_{datetime.datetime.now():%Y%m%d_%H%M%S}.wav")
+        self._writer = StreamingWavWriter(
+            out,
+            channels=audio_config["channels"],
+            sample_width=sample_width,
+            rate=audio_config["rate"],
+        )
+        self._tail = PCMRingBuffer.for_duration(
+            self._tail_seconds, sample_rate=audio_config["rate"])
+        self._ring = FanoutRing.for_duration(
+            self._buffer_seconds,
+            bytes_per_second=audio_config["rate"] * audio_config["channels"] * sample_width,
+        )
+        self._spawn("disk", self._write_chunk)
+        for name, fn in self._consumers.items():
+            self._spawn(name, fn)
+
+        self._running = True
+        self._paused  = False
         self._stream = self._audio.open(
-            format=getattr(pyaudio, audio_config["format_str"]),
+            format=fmt,
             channels=audio_config["channels"],
             rate=audio_config["rate"],
             input=True,
             frames_per_buffer=audio_config["chunk"],
+            stream_callback=self._on_audio,
         )
-        self._running = True
-        self._paused  = False
-        self._thread  = threading.Thread(target=self._loop, daemon=True)
-        self._thread.start()
         logger.info("Recorder ▶ started.")
 
     def pause(self) -> None:
+        if self._running and not self._paused:
+            self._stream.stop_stream()
         self._paused = True
         logger.debug("Recorder ⏸ paused.")
 
     def resume(self) -> None:
-        if self._running:
+        if self._running and self._paused:
+            self._stream.start_stream()
             self._paused = False
             logger.debug("Recorder ▶ resumed.")
 
@@ -95,45 +154,79 @@ class StreamRecorder:
         if not self._running:
             raise RuntimeError("Recorder not running.")
         self._running = False
-        self._thread.join()
 
         # tidy up PortAudio resources
         self._stream.stop_stream(); self._stream.close()
         self._audio.terminate()
 
-        # write WAV
-        audio_config = _get_audio_config()
-        out = (audio_config["cache_dir"] /
-               f"rec_{datetime.datetime.now():%Y%m%d_%H%M%S}.wav")
-        with wave.open(str(out), "wb") as wf:
-            wf.setnchannels(audio_config["channels"])
-            wf.setsampwidth(self._audio.get_sample_size(
-                getattr(pyaudio, audio_config["format_str"])))
-            wf.setframerate(audio_config["rate"])
-            wf.writeframes(b"".join(self._frames))
+        # let every consumer drain what was captured
+        self._ring.close()
+        for worker in self._workers:
+            worker.join()
+
+        # audio is already on disk – only the header sizes are patched
+        out = self._writer.close()
 
         # reset all internal state
-        self._frames.clear()
-        self._thread = self._stream = self._audio = None
+        self._workers = []
+        self._stream = self._audio = self._writer = self._ring = None
         logger.info(f"Recorder ■ stopped → {out}")
         return out
 
-    # ── internal capture loop ──────────────────────────────────────────────
-    def _loop(self) -> None:
-        audio_config = _get_audio_config()
-        while self._running:
-            if self._paused:
+    @property
+    def duration(self) -> float:
+        """Seconds of audio written to the current recording."""
+        return self._writer.duration if self._writer else 0.0
+
+    def tail(self, seconds: float | None = None) -> bytes:
+        """Return the most recent captured PCM (at most ``tail_seconds``)."""
+        with self._tail_lock:
+            if self._tail is None:
+                return b""
+            last = None if seconds is None else self._tail.seconds(seconds)
+            return self._tail.to_bytes(last)
+
+    def stats(self) -> dict:
+        """Overflow count and per-consumer read / lag / drop counters."""
+        ring = self._ring
+        return {
+            "duration": self.duration,
+            "overflows": self.overflows,
+            "consumers": ring.stats() if ring else {},
+        }
+
+    # ── capture & fan-out ─────────────────────────────────────────────────
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """PortAudio callback: publish the block, never block or call out."""
+        if status:
+            self.overflows += 1
+        self._ring.write(in_data)
+        return None, pyaudio.paContinue
+
+    def _spawn(self, name: str, fn: Callable[[bytes], None]) -> None:
+        cursor = self._ring.cursor(name)
+        worker = threading.Thread(
+            target=self._drain, args=(cursor, fn), name=f"recorder-{name}", daemon=True)
+        self._workers.append(worker)
+        worker.start()
+
+    @staticmethod
+    def _drain(cursor: RingCursor, fn: Callable[[bytes], None]) -> None:
+        while True:
+            data = cursor.read(timeout=0.5)
+            if not data:
+                if cursor.ring.closed and cursor.lag_bytes == 0:
+                    return
                 continue
             try:
-                data = self._stream.read(
-                    audio_config["chunk"], exception_on_overflow=False)
+                fn(data)
             except Exception as e:
-                logger.warning(f"Recorder read error: {e}")
-                continue
-
-            self._frames.append(data)
-            if self._on_chunk and not self._paused:
-                try:
-                    self._on_chunk(data)
-                except Exception as e:
-                    logger.debug(f"on_chunk callback error (ignored): {e}")
+                logger.debug(f"{cursor.name} consumer error (ignored): {e}")
+
+    def _write_chunk(self, data: bytes) -> None:
+        try:
+            self._writer.write(data)
+        except OSError as e:
+            logger.error(f"Recorder write error: {e}")
+        with self._tail_lock:
+            self._tail.append(data)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+"""Preallocated PCM buffer shared by the real-time streaming handlers.
+
+:class:`PCMRingBuffer` stores 16-bit mono samples in a fixed numpy array
+that is twice the requested capacity.  Appends copy only the new samples,
+windows are returned as zero-copy views of contiguous memory and trimming
+merely moves an index.  When the write position reaches the end of the
+storage the live window is moved back to the front once – an amortised
+O(1) cost per sample.
+
+A float32 mirror in ``[-1, 1]`` is maintained lazily: samples are converted
+the first time :meth:`as_float32` asks for them and never again.
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+
+__all__ = ["PCMRingBuffer"]
+
+_SCALE = 1.0 / 32768.0
+
+
+class PCMRingBuffer:
+    """Bounded int16 sample buffer with zero-copy views and O(1) append."""
+
+    def __init__(self, capacity: int, *, sample_rate: int = 16000) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self.sample_rate = sample_rate
+        self._pcm = np.zeros(self.capacity * 2, dtype=np.int16)
+        self._f32: Optional[np.ndarray] = None  # allocated on first as_float32()
+        self._start = 0
+        self._end = 0
+        self._f32_lo = self._f32_hi = 0  # storage range mirrored in _f32
+        self._carry = b""  # odd trailing byte of a chunk split mid-sample
+        self.total_samples = 0  # samples appended since creation / clear()
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def for_duration(cls, seconds: float, *, sample_rate: int = 16000) -> PCMRingBuffer:
+        return cls(max(1, int(seconds * sample_rate)), sample_rate=sample_rate)
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio currently buffered."""
+        return len(self) / self.sample_rate
+
+    @property
+    def start_sample(self) -> int:
+        """Absolute index (since creation) of the oldest buffered sample."""
+        return self.total_samples - len(self)
+
+    # ------------------------------------------------------------------
+    def append(self, data: Union[bytes, bytearray, memoryview, np.ndarray]) -> np.ndarray:
+        """Append PCM bytes or int16 samples; return a view of what was added.
+
+        If more than *capacity* samples would be held the oldest are dropped.
+        """
+        if isinstance(data, np.ndarray):
+            samples = data.astype(np.int16, copy=False).ravel()
+        else:
+            raw = self._carry + bytes(data) if self._carry else data
+            usable = len(raw) - (len(raw) & 1)
+            self._carry = bytes(raw[usable:])
+            samples = np.frombuffer(raw, dtype=np.int16, count=usable // 2)
+
+        n = len(samples)
+        if n == 0:
+            return self._pcm[self._end : self._end]
+        if n >= self.capacity:
+            samples = samples[-self.capacity :]
+            self.total_samples += n - self.capacity
+            n = self.capacity
+            self._start = self._end = 0
+            self._f32_lo = self._f32_hi = 0
+
+        overflow = len(self) + n - self.capacity
+        if overflow > 0:
+            self._start += overflow
+        if self._end + n > len(self._pcm):
+            self._compact()
+
+        self._pcm[self._end : self._end + n] = samples
+        self._end += n
+        self.total_samples += n
+        return self._pcm[self._end - n : self._end]
+
+    # ------------------------------------------------------------------
+    def _compact(self) -> None:
+        live = len(self)
+        f_lo = max(self._f32_lo, self._start)
+        f_hi = self._f32_hi
+        self._pcm[:live] = self._pcm[self._start : self._end]
+        if self._f32 is not None and f_lo < f_hi:
+            self._f32[f_lo - self._start : f_hi - self._start] = self._f32[f_lo:f_hi]
+            self._f32_lo, self._f32_hi = f_lo - self._start, f_hi - self._start
+        else:
+            self._f32_lo = self._f32_hi = 0
+        self._start, self._end = 0, live
+
+    # ------------------------------------------------------------------
+    def _window(self, last: Optional[int]) -> tuple[int, int]:
+        if last is None or last >= len(self):
+            return self._start, self._end
+        return self._end - max(0, last), self._end
+
+    # ------------------------------------------------------------------
+    def view(self, last: Optional[int] = None) -> np.ndarray:
+        """Return a zero-copy int16 view of the newest *last* samples (all by default)."""
+        lo, hi = self._window(last)
+        return self._pcm[lo:hi]
+
+    # ------------------------------------------------------------------
+    def as_float32(self, last: Optional[int] = None) -> np.ndarray:
+        """Return a float32 view in ``[-1, 1]``, converting only unseen samples."""
+        lo, hi = self._window(last)
+        if self._f32 is None:
+            self._f32 = np.empty(len(self._pcm), dtype=np.float32)
+        f_lo, f_hi = max(self._f32_lo, self._start), self._f32_hi
+        if f_lo >= f_hi or hi < f_lo or lo > f_hi:
+            self._convert(lo, hi)
+            self._f32_lo, self._f32_hi = lo, hi
+        else:
+            if lo < f_lo:
+                self._convert(lo, f_lo)
+            if hi > f_hi:
+                self._convert(f_hi, hi)
+            self._f32_lo, self._f32_hi = min(lo, f_lo), max(hi, f_hi)
+        return self._f32[lo:hi]
+
+    # ------------------------------------------------------------------
+    def _convert(self, lo: int, hi: int) -> None:
+        if lo < hi:
+            np.multiply(self._pcm[lo:hi], _SCALE, out=self._f32[lo:hi], casting="unsafe")
+
+    # ------------------------------------------------------------------
+    def seconds(self, duration: float) -> int:
+        """Convert *duration* seconds to a sample count."""
+        return int(duration * self.sample_rate)
+
+    # ------------------------------------------------------------------
+    def to_bytes(self, last: Optional[int] = None) -> bytes:
+        """Return a copy of the buffered PCM as little-endian bytes."""
+        return self.view(last).tobytes()
+
+    # ------------------------------------------------------------------
+    def consume(self, n: int) -> None:
+        """Drop the oldest *n* samples without reallocating."""
+        self._start = min(self._end, self._start + max(0, n))
+        if self._start == self._end:
+            self._start = self._end = 0
+            self._f32_lo = self._f32_hi = 0
+
+    # ------------------------------------------------------------------
+    def keep_last(self, n: int) -> None:
+        """Drop everything but the newest *n* samples."""
+        self.consume(len(self) - max(0, n))
+
+    # ------------------------------------------------------------------
+    def clear(self) -> None:
+        self._start = self._end = 0
+        self._f32_lo = self._f32_hi = 0
+        self._carry = b""
+        self.total_samples = 0
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+"""Voice-activity gating for real-time streaming sessions.
+
+:class:`EnergyVAD` sits between :meth:`StreamingService.process_chunk` and
+the recogniser.  Chunks are split into fixed frames and classified in one
+vectorised pass: a frame is speech when its RMS energy clears the threshold
+and its zero-crossing rate is speech-like (very loud frames always count).
+A hangover keeps the gate open briefly after speech so word endings are not
+clipped, and a pre-roll replays the frames just before speech onset.
+
+Non-speech is either dropped (``policy="skip"``) or shortened to at most
+``compress_ms`` per pause (``policy="compress"``) so recognisers still see a
+gap.  The end of every speech run is reported as an *endpoint*, which
+handlers use to finalise early.
+
+For batch audio, :func:`next_cut` and :func:`split_at_pauses` place segment
+boundaries in the quietest frame near each hard limit, so words are not
+split between segments.
+"""
+
+from collections import deque
+from typing import Deque, List, NamedTuple, Tuple
+
+import numpy as np
+
+__all__ = ["VADDecision", "EnergyVAD", "next_cut", "split_at_pauses"]
+
+_CUT_FRAME_S = 0.02
+
+
+class VADDecision(NamedTuple):
+    audio: bytes  # PCM to forward to the recogniser (may be empty)
+    speech: bool  # gate open at the end of the chunk
+    endpoint: bool  # a speech run ended inside this chunk
+
+
+class EnergyVAD:
+    """Energy + zero-crossing voice-activity detector with hangover and pre-roll."""
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = 16000,
+        frame_ms: int = 20,
+        energy_threshold: float = 0.01,
+        zcr_threshold: float = 0.25,
+        hangover_ms: int = 300,
+        preroll_ms: int = 200,
+        policy: str = "compress",
+        compress_ms: int = 200,
+    ) -> None:
+        if policy not in ("skip", "compress"):
+            raise ValueError(f"Unknown VAD policy '{policy}'")
+        self.sample_rate = sample_rate
+        self.frame_len = max(1, sample_rate * frame_ms // 1000)
+        self.energy_threshold = energy_threshold
+        self.zcr_threshold = zcr_threshold
+        self.policy = policy
+        self._hangover_frames = hangover_ms // frame_ms
+        self._compress_frames = compress_ms // frame_ms if policy == "compress" else 0
+        self._preroll: Deque[np.ndarray] = deque(maxlen=max(0, preroll_ms // frame_ms))
+        self._carry = np.zeros(0, dtype=np.int16)
+        self._carry_byte = b""
+        self._in_speech = False
+        self._hang = 0  # hangover frames left
+        self._gap = 0  # non-speech frames forwarded in the current pause
+        self.frames_total = 0
+        self.frames_forwarded = 0
+        self.endpoints = 0
+
+    # ------------------------------------------------------------------
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        """Return a boolean speech mask for an ``(n, frame_len)`` int16 array."""
+        x = frames.astype(np.float32) * (1.0 / 32768.0)
+        rms = np.sqrt(np.einsum("ij,ij->i", x, x) / frames.shape[1])
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frames.shape[1] - 1 or 1)
+        voiced = (rms >= self.energy_threshold) & (zcr <= self.zcr_threshold)
+        return voiced | (rms >= 4 * self.energy_threshold)
+
+    # ------------------------------------------------------------------
+    def process(self, chunk: bytes) -> VADDecision:
+        """Gate *chunk*; incomplete frames are held back until the next call."""
+        raw = self._carry_byte + chunk if self._carry_byte else chunk
+        usable = len(raw) - (len(raw) & 1)
+        self._carry_byte = bytes(raw[usable:])
+        samples = np.frombuffer(raw, dtype=np.int16, count=usable // 2)
+        if len(self._carry):
+            samples = np.concatenate((self._carry, samples))
+        n_frames = len(samples) // self.frame_len
+        self._carry = samples[n_frames * self.frame_len :].copy()
+        if not n_frames:
+            return VADDecision(b"", self._in_speech, False)
+
+        frames = samples[: n_frames * self.frame_len].reshape(n_frames, self.frame_len)
+        mask = self.classify(frames)
+
+        out = []
+        endpoint = False
+        for frame, is_speech in zip(frames, mask):
+            if is_speech:
+                if not self._in_speech:
+                    out.extend(self._preroll)
+                    self._preroll.clear()
+                self._in_speech = True
+                self._hang = self._hangover_frames
+                self._gap = 0
+                out.append(frame)
+            elif self._in_speech and self._hang > 0:
+                self._hang -= 1
+                out.append(frame)
+            else:
+                if self._in_speech:
+                    self._in_speech = False
+                    endpoint = True
+                    self.endpoints += 1
+                if self._gap < self._compress_frames:
+                    self._gap += 1
+                    out.append(frame)
+                else:
+                    self._preroll.append(frame.copy())
+
+        self.frames_total += n_frames
+        self.frames_forwarded += len(out)
+        audio = np.concatenate(out).tobytes() if out else b""
+        return VADDecision(audio, self._in_speech, endpoint)
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:  # noqa: D401
+        """Return how much audio the gate let through."""
+        return {
+            "frames_total": self.frames_total,
+            "frames_forwarded": self.frames_forwarded,
+            "forwarded_ratio": self.frames_forwarded / self.frames_total if self.frames_total else 0.0,
+            "endpoints": self.endpoints,
+            "in_speech": self._in_speech,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Pause-aligned segmentation
+# ---------------------------------------------------------------------------
+
+def next_cut(samples: np.ndarray, rate: int, *, final: bool, search_seconds: float = 2.0) -> int:
+    """Sample index at which to end a segment read as *samples*.
+
+    The whole block is used for the last segment; otherwise the cut moves
+    back to the quietest 20 ms frame within the final *search_seconds* so
+    words are not split between segments.
+    """
+    if final or len(samples) == 0:
+        return len(samples)
+    frame = max(1, int(rate * _CUT_FRAME_S))
+    lo = max(0, len(samples) - int(rate * search_seconds))
+    tail = samples[lo : lo + (len(samples) - lo) // frame * frame].astype(np.float32)
+    if len(tail) < frame:
+        return len(samples)
+    energy = np.square(tail).reshape(-1, frame).mean(axis=1)
+    # Prefer the latest of equally quiet frames to keep segments long.
+    quietest = len(energy) - 1 - int(np.argmin(energy[::-1]))
+    return lo + (quietest + 1) * frame
+
+
+def split_at_pauses(
+    samples: np.ndarray, rate: int, max_seconds: float, *, search_seconds: float = 2.0
+) -> List[Tuple[int, int]]:
+    """``(start, end)`` sample ranges of at most *max_seconds*, cut at pauses."""
+    limit = max(1, int(max_seconds * rate))
+    bounds: List[Tuple[int, int]] = []
+    position, total = 0, len(samples)
+    while position < total:
+        block = samples[position : position + limit]
+        cut = next_cut(block, rate, final=position + limit >= total, search_seconds=search_seconds)
+        bounds.append((position, position + cut))
+        position += cut
+    return bounds
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+"""Incremental PCM WAV writer with an O(1) close.
+
+:class:`StreamingWavWriter` writes a 44-byte RIFF header with placeholder
+sizes when it opens the file, then appends PCM to disk as it arrives.  Only
+the two size fields are patched on :meth:`close`.  A long recording
+therefore never needs to hold its audio in memory or join it at the end.
+
+The header is also patched every ``header_interval`` seconds of audio, so a
+process that dies mid-recording leaves a playable file that lacks at most
+that much audio.
+"""
+
+import struct
+from pathlib import Path
+from typing import BinaryIO, Union
+
+__all__ = ["StreamingWavWriter"]
+
+_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+_RIFF_SIZE_OFFSET = 4
+_DATA_SIZE_OFFSET = 40
+_MAX_DATA = 0xFFFFFFFF - 36  # RIFF sizes are 32-bit
+
+
+class StreamingWavWriter:
+    """Append-only PCM WAV file whose header is finalised on close."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        channels: int = 1,
+        sample_width: int = 2,
+        rate: int = 16000,
+        header_interval: float = 5.0,
+        buffering: int = 64 * 1024,
+    ) -> None:
+        self.path = Path(path)
+        self.channels = channels
+        self.sample_width = sample_width
+        self.rate = rate
+        self.bytes_written = 0
+        self._block_align = channels * sample_width
+        self._patch_every = max(1, int(header_interval * rate)) * self._block_align
+        self._next_patch = self._patch_every
+        self._fh: BinaryIO | None = open(self.path, "wb", buffering=buffering)  # noqa: SIM115 – closed in close()
+        self._fh.write(
+            _HEADER.pack(
+                b"RIFF", 36, b"WAVE",
+                b"fmt ", 16, 1, channels, rate, rate * self._block_align, self._block_align, sample_width * 8,
+                b"data", 0,
+            )
+        )
+
+    # ------------------------------------------------------------------
+    @property
+    def closed(self) -> bool:
+        return self._fh is None
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio written so far."""
+        return self.bytes_written / (self.rate * self._block_align)
+
+    # ------------------------------------------------------------------
+    def write(self, data: bytes) -> None:
+        """Append raw PCM frames."""
+        if self._fh is None:
+            raise ValueError("write to closed WAV writer")
+        if self.bytes_written + len(data) > _MAX_DATA:
+            raise OSError("WAV data would exceed the 4 GiB RIFF limit")
+        self._fh.write(data)
+        self.bytes_written += len(data)
+        if self.bytes_written >= self._next_patch:
+            self._next_patch = self.bytes_written + self._patch_every
+            self._patch_header()
+            self._fh.flush()
+
+    def _patch_header(self) -> None:
+        assert self._fh is not None
+        # Only whole frames count; a torn trailing sample is ignored by readers.
+        size = self.bytes_written - self.bytes_written % self._block_align
+        self._fh.seek(_RIFF_SIZE_OFFSET)
+        self._fh.write(struct.pack("<I", 36 + size + (size & 1)))
+        self._fh.seek(_DATA_SIZE_OFFSET)
+        self._fh.write(struct.pack("<I", size))
+        self._fh.seek(0, 2)
+
+    # ------------------------------------------------------------------
+    def close(self) -> Path:
+        """Patch the header sizes, close the file and return its path."""
+        if self._fh is None:
+            return self.path
+        if (self.bytes_written - self.bytes_written % self._block_align) & 1:
+            self._fh.write(b"\x00")  # RIFF chunks are word aligned
+        self._patch_header()
+        self._fh.close()
+        self._fh = None
+        return self.path
+
+    def __enter__(self) -> StreamingWavWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -38,8 +38,31 @@ from .interfaces.audio_service import IAudioService  # noqa: E402
 if IAudioService not in container.registrations:
     container.register_instance(IAudioService, AudioService())
 
+# Security service (encryption key, encrypted audio / transcript cache)
+from .interfaces.security_service import ISecurityService  # noqa: E402
+from .services.security_service import SecurityService  # noqa: E402
+
+if ISecurityService not in container.registrations:
+    container.register_instance(ISecurityService, SecurityService())
+
 # Streaming service singleton
 from .interfaces.streaming_service import IStreamingService  # noqa: E402
 
 if IStreamingService not in container.registrations:
-    container.register_instance(IStreamingService, StreamingService()) 
\ No newline at end of file
+    container.register_instance(IStreamingService, StreamingService())
+
+from .interfaces.streaming_service import IAsyncStreamingService  # noqa: E402
+from .services.async_streaming_service import AsyncStreamingService  # noqa: E402
+from .services.sharded_streaming_service import ShardedStreamingService  # noqa: E402
+from .interfaces.config_service import IConfigurationService  # noqa: E402
+
+if IAsyncStreamingService not in container.registrations:
+    try:
+        _shards = int(container.resolve(IConfigurationService).get("streaming_shards", 0))
+    except Exception:  # pragma: no cover – config not ready
+        _shards = 0
+    # Shard processes start lazily with the first session.
+    container.register_instance(
+        IAsyncStreamingService,
+        ShardedStreamingService(_shards) if _shards > 0 else AsyncStreamingService(),
+    )
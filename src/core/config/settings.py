@@ -43,11 +43,50 @@ class ApplicationSettings(BaseSettings):
 
     # Audio / tool paths
     ffmpeg_path: Optional[str] = Field(None, env="FFMPEG_PATH")
+    audio_pcm_store_mb: float = Field(2048, env="AUDIO_PCM_STORE_MB")  # decoded uploads under base_dir/pcm; 0 → unbounded
+    audio_pcm_store_ttl_s: float = Field(24 * 3600, env="AUDIO_PCM_STORE_TTL_S")  # since last use; 0 → no expiry
 
     # Whisper related
     whisper_device: str = Field("cpu", env="WHISPER_DEVICE")
     whisper_models_dir: Path = Field(Path("./app_data/whisper_models"), env="WHISPER_MODELS_DIR")
 
+    # Shared ASR model registry
+    asr_model_memory_budget_mb: int = Field(0, env="ASR_MODEL_MEMORY_BUDGET_MB")  # 0 → unlimited
+    asr_preload_models: str = Field("", env="ASR_PRELOAD_MODELS")  # e.g. "vosk:small-english,whisper:tiny"
+    asr_pool_workers: str = Field("", env="ASR_POOL_WORKERS")  # e.g. "vosk=2,whisper=1"; 0 → thread
+    asr_job_workers: int = Field(2, env="ASR_JOB_WORKERS")  # background jobs decoded concurrently
+    asr_job_segment_s: float = Field(30, env="ASR_JOB_SEGMENT_S")  # progress granularity of /jobs
+    asr_job_max_attempts: int = Field(3, env="ASR_JOB_MAX_ATTEMPTS")  # restarts a job may survive before it fails
+    asr_transcript_cache_mb: float = Field(64, env="ASR_TRANSCRIPT_CACHE_MB")  # 0 → disabled
+    asr_transcript_cache_ttl_s: float = Field(7 * 24 * 3600, env="ASR_TRANSCRIPT_CACHE_TTL_S")  # 0 → no expiry
+
+    # Real-time streaming
+    vosk_worker_threads: int = Field(0, env="VOSK_WORKER_THREADS")  # 0 → one per core
+    vosk_queue_size: int = Field(32, env="VOSK_QUEUE_SIZE")
+    vosk_overload_policy: str = Field("block", env="VOSK_OVERLOAD_POLICY")
+    whisper_stream_mode: str = Field("window", env="WHISPER_STREAM_MODE")  # or "local_agreement"
+    whisper_stream_batching: bool = Field(True, env="WHISPER_STREAM_BATCHING")
+    whisper_batch_size: int = Field(8, env="WHISPER_BATCH_SIZE")
+    whisper_batch_max_wait_ms: int = Field(50, env="WHISPER_BATCH_MAX_WAIT_MS")
+    azure_stream_max_uploads: int = Field(4, env="AZURE_STREAM_MAX_UPLOADS")
+    azure_batch_max_uploads: int = Field(4, env="AZURE_BATCH_MAX_UPLOADS")  # concurrent chunks per upload
+    azure_batch_max_retries: int = Field(3, env="AZURE_BATCH_MAX_RETRIES")  # per chunk, on 429 / 5xx
+    azure_stream_mode: str = Field("window", env="AZURE_STREAM_MODE")  # or "segment"
+    streaming_vad_enabled: bool = Field(False, env="STREAMING_VAD_ENABLED")
+    streaming_vad_policy: str = Field("compress", env="STREAMING_VAD_POLICY")  # or "skip"
+    streaming_vad_energy_threshold: float = Field(0.01, env="STREAMING_VAD_ENERGY_THRESHOLD")
+    streaming_vad_hangover_ms: int = Field(300, env="STREAMING_VAD_HANGOVER_MS")
+    streaming_vad_preroll_ms: int = Field(200, env="STREAMING_VAD_PREROLL_MS")
+    streaming_partial_min_interval_ms: int = Field(200, env="STREAMING_PARTIAL_MIN_INTERVAL_MS")
+    streaming_partial_only_on_change: bool = Field(True, env="STREAMING_PARTIAL_ONLY_ON_CHANGE")
+    streaming_delta_updates: bool = Field(False, env="STREAMING_DELTA_UPDATES")
+    streaming_shards: int = Field(0, env="STREAMING_SHARDS")  # 0 → sessions run in the API process
+    streaming_capacity_cores: float = Field(0, env="STREAMING_CAPACITY_CORES")  # 0 → os.cpu_count()
+    streaming_capacity_target: float = Field(0.8, env="STREAMING_CAPACITY_TARGET")
+    streaming_admission_policy: str = Field("reject", env="STREAMING_ADMISSION_POLICY")  # queue | downgrade | off
+    streaming_admission_queue_timeout_s: float = Field(10, env="STREAMING_ADMISSION_QUEUE_TIMEOUT_S")
+    streaming_downgrades: str = Field("", env="STREAMING_DOWNGRADES")  # e.g. "whisper:base=whisper:tiny,whisper=vosk:/models/small"
+
     # Feature toggles & misc
     skip_openai_summarization: bool = Field(False, env="SKIP_OPENAI_SUMMARIZATION")
     token_management_approach: str = Field("chunking", env="TOKEN_MANAGEMENT_APPROACH")
@@ -42,6 +42,17 @@ class ModelLoadError(TranscriptionError):
     pass
 
 
+class CapacityExceededError(AmbientScribeError):
+    """Raised when the host has no capacity for another streaming session."""
+
+    def __init__(self, message: str, retry_after: float = 0.0) -> None:
+        super().__init__(message, retry_after)
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        return self.args[0]
+
+
 class LLMError(AmbientScribeError):
     """Base exception for LLM-related errors."""
     pass
@@ -80,6 +91,7 @@ __all__ = [
     "TranscriberNotFoundError",
     "AudioProcessingError",
     "ModelLoadError",
+    "CapacityExceededError",
     "LLMError",
     "LLMProviderError", 
     "LLMConnectionError",
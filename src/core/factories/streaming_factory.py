@@ -38,6 +38,11 @@ class StreamingHandlerFactory:  # noqa: D401
         # Provider-specific defaults
         if key == "whisper":
             kwargs = {"model_size": kwargs.get("model_size", "tiny"), **kwargs}
+        elif key == "vosk" and not kwargs.get("model_path"):
+            # Same default model as /ws/vosk (``default_vosk_model``).
+            from src.asr.streaming.websocket import MODEL_DIR
+
+            kwargs = {**kwargs, "model_path": str(MODEL_DIR)}
 
         try:
             return handler_cls(**kwargs)
@@ -3,9 +3,9 @@ from __future__ import annotations
 """Interface for real-time audio streaming services (Phase-5)."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Iterable
+from typing import Any, AsyncIterator, Iterable, Tuple
 
-__all__ = ["IStreamingService"]
+__all__ = ["IStreamingService", "IAsyncStreamingService"]
 
 
 class IStreamingService(ABC):  # noqa: D401
@@ -23,6 +23,46 @@ class IStreamingService(ABC):  # noqa: D401
     def get_updates(self, session_id: str) -> Iterable[dict]:  # noqa: D401
         """Yield pending transcription updates for *session_id*."""
 
+    @abstractmethod
+    def get_timed_updates(self, session_id: str) -> Iterable[Tuple[float, dict]]:  # noqa: D401
+        """Yield ``(produced_at, update)`` pairs; *produced_at* is ``time.perf_counter()``."""
+
+    @abstractmethod
+    async def wait_for_updates(self, session_id: str, timeout: float | None = None) -> bool:  # noqa: D401
+        """Wait until *session_id* has pending updates; return *False* on timeout."""
+
+    @abstractmethod
+    def record_delivery(self, session_id: str, produced_at: float) -> None:  # noqa: D401
+        """Record that an update produced at *produced_at* reached the client."""
+
+    @abstractmethod
+    def get_session_stats(self, session_id: str) -> dict:  # noqa: D401
+        """Return live statistics (e.g. delivery latency) for *session_id*."""
+
     @abstractmethod
     def end_session(self, session_id: str) -> None:  # noqa: D401
-        """Close the session and free resources.""" 
\ No newline at end of file
+        """Close the session and free resources."""
+
+
+class IAsyncStreamingService(ABC):  # noqa: D401
+    """Asyncio-native session manager; publishing updates never blocks."""
+
+    @abstractmethod
+    async def start_session(self, engine: str, **options: Any) -> str:  # noqa: D401
+        """Open a new streaming session and return its *session_id*."""
+
+    @abstractmethod
+    async def process_chunk(self, session_id: str, chunk: bytes) -> None:  # noqa: D401
+        """Feed raw PCM *chunk* into the recogniser for *session_id*."""
+
+    @abstractmethod
+    def updates(self, session_id: str) -> AsyncIterator[dict]:  # noqa: D401
+        """Iterate over updates until the session ends; stale partials are coalesced."""
+
+    @abstractmethod
+    def get_session_stats(self, session_id: str) -> dict:  # noqa: D401
+        """Return live statistics (e.g. delivery latency) for *session_id*."""
+
+    @abstractmethod
+    async def end_session(self, session_id: str) -> None:  # noqa: D401
+        """Close the session; its update iterator finishes after draining."""
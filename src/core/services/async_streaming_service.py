@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+"""Asyncio-native facade over :class:`StreamingService`.
+
+Sessions publish into a :class:`CoalescingUpdateQueue`: handler puts never
+block, a lagging consumer only ever sees the newest partial and finals are
+never dropped.  Consumers iterate over :meth:`AsyncStreamingService.updates`
+instead of polling.
+"""
+
+import asyncio
+import queue
+from typing import Any, AsyncIterator
+
+from ..interfaces.streaming_service import IAsyncStreamingService
+from .capacity import CapacityModel
+from .streaming_service import StreamingService
+from src.asr.streaming.update_queue import CoalescingUpdateQueue
+
+__all__ = ["AsyncStreamingService"]
+
+
+class _CoalescingStreamingService(StreamingService):
+    """:class:`StreamingService` whose sessions use coalescing update queues."""
+
+    @staticmethod
+    def _new_queue() -> Any:
+        return CoalescingUpdateQueue()
+
+
+class AsyncStreamingService(IAsyncStreamingService):  # noqa: D401
+    """Manage streaming sessions from asyncio code without back-pressure."""
+
+    def __init__(self, *, inactivity_timeout: int = 60, capacity: CapacityModel | None = None) -> None:  # noqa: D401
+        self._service = _CoalescingStreamingService(inactivity_timeout=inactivity_timeout, capacity=capacity)
+
+    # ------------------------------------------------------------------
+    async def start_session(self, engine: str, **options: Any) -> str:  # noqa: D401
+        # Handler construction may load a model – keep it off the loop.
+        return await asyncio.to_thread(self._service.start_session, engine, **options)
+
+    # ------------------------------------------------------------------
+    async def process_chunk(self, session_id: str, chunk: bytes) -> None:  # noqa: D401
+        self._service.process_chunk(session_id, chunk)
+
+    # ------------------------------------------------------------------
+    async def updates(self, session_id: str) -> AsyncIterator[dict]:  # noqa: D401
+        q: CoalescingUpdateQueue = self._service._get_session(session_id)["queue"]
+        while True:
+            try:
+                produced_at, update = await q.get_timed()
+            except queue.Empty:  # session ended and drained
+                return
+            yield update
+            # Resumed by the consumer, i.e. the update has been sent.
+            self._service.record_delivery(session_id, produced_at)
+
+    # ------------------------------------------------------------------
+    def get_session_stats(self, session_id: str) -> dict:  # noqa: D401
+        stats = self._service.get_session_stats(session_id)
+        stats["coalesced_partials"] = self._service._get_session(session_id)["queue"].coalesced
+        return stats
+
+    # ------------------------------------------------------------------
+    def get_capacity(self) -> dict:  # noqa: D401
+        return self._service.get_capacity()
+
+    # ------------------------------------------------------------------
+    async def end_session(self, session_id: str) -> None:  # noqa: D401
+        # Handlers may decode their remaining audio on close – keep it off the loop.
+        await asyncio.to_thread(self._service.end_session, session_id)
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+"""Admission control for real-time streaming sessions.
+
+A live session occupies roughly its engine's real-time factor (RTF) in CPU
+cores.  For example, a recogniser needing 0.3 s of processing per second of
+audio keeps 0.3 of a core busy for as long as the session streams.
+
+:class:`CapacityModel` keeps an RTF estimate per *profile*: the engine
+name, or ``engine:model`` for a Whisper model size or Vosk model path, so
+large and small models are measured separately.  Estimates start from
+conservative priors and follow the processing time actually measured.  A
+new session is admitted while the summed estimate of live sessions stays
+within ``cores × target_utilisation``.  Once the budget is spent, the
+policy decides:
+
+* ``reject`` raises :class:`CapacityExceededError` with a retry-after hint.
+* ``queue`` waits up to ``queue_timeout`` seconds for capacity, then rejects.
+* ``downgrade`` follows the downgrade rules (``whisper=vosk``,
+  ``vosk:/models/large=vosk:/models/small``) to the first profile that
+  fits, and rejects if none does.
+* ``off`` admits everything; measurements are still taken.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..container import global_container
+from ..exceptions import CapacityExceededError, ConfigurationError
+from ..interfaces.config_service import IConfigurationService
+from src.asr.streaming.whisper_batcher import batched_busy_seconds
+
+__all__ = ["Admission", "CapacityModel", "get_capacity_model", "parse_downgrades"]
+
+# Cores one session needs before anything has been measured.
+_PRIORS: Dict[str, float] = {"vosk": 0.3, "whisper": 1.0, "azure_speech": 0.05}
+_DEFAULT_PRIOR = 0.5
+# Handler option naming the model, per engine.
+_MODEL_OPTIONS: Dict[str, str] = {"vosk": "model_path", "whisper": "model_size"}
+_WINDOW_AUDIO = 5.0  # seconds of audio (all sessions) per estimate update
+_POLICIES = ("reject", "queue", "downgrade", "off")
+
+
+class Admission(NamedTuple):
+    engine: str
+    options: Dict[str, Any]
+    profile: str
+    downgraded_from: Optional[str]  # requested profile when downgraded
+
+
+def parse_downgrades(spec: str) -> Dict[str, str]:
+    """Parse ``"whisper=vosk, whisper:base=whisper:tiny"`` into a mapping."""
+    rules: Dict[str, str] = {}
+    for item in spec.split(","):
+        source, sep, target = item.partition("=")
+        if not sep:
+            if item.strip():
+                raise ConfigurationError(f"Invalid downgrade rule '{item.strip()}'")
+            continue
+        rules[source.strip().lower()] = target.strip()
+    return rules
+
+
+class CapacityModel:
+    """RTF budget over live sessions with reject / queue / downgrade policies."""
+
+    def __init__(
+        self,
+        *,
+        cores: float | None = None,
+        target_utilisation: float = 0.8,
+        policy: str = "reject",
+        queue_timeout: float = 10.0,
+        downgrades: Dict[str, str] | None = None,
+        priors: Dict[str, float] | None = None,
+        alpha: float = 0.3,
+        external_work: Dict[str, Callable[[], float]] | None = None,
+        default_retry_after: float = 10.0,
+    ) -> None:
+        if policy not in _POLICIES:
+            raise ConfigurationError(f"Unknown admission policy '{policy}' (expected one of {', '.join(_POLICIES)})")
+        self.cores = float(cores or os.cpu_count() or 1)
+        self.budget = self.cores * target_utilisation
+        self.policy = policy
+        self.queue_timeout = queue_timeout
+        self.alpha = alpha
+        self.default_retry_after = default_retry_after
+        self._downgrades = dict(downgrades or {})
+        self._priors = {**_PRIORS, **(priors or {})}
+        self._rtf: Dict[str, float] = {}  # measured estimates
+        self._live: Dict[str, int] = {}
+        self._window: Dict[str, List[float]] = {}  # profile → [audio_s, busy_s]
+        self._window_audio = 0.0
+        # Work done off the session threads (e.g. the shared Whisper batcher),
+        # reported as a cumulative seconds counter per engine.
+        self._external = dict(external_work or {})
+        self._external_last = {engine: self._probe(fn) for engine, fn in self._external.items()}
+        self._durations: Deque[float] = deque(maxlen=50)
+        self._cond = threading.Condition()
+        self.admitted = 0
+        self.rejected = 0
+        self.queued = 0
+        self.downgraded = 0
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_settings(cls, *, share: float = 1.0) -> CapacityModel:
+        """Build a model from the ``streaming_capacity_*`` / ``streaming_admission_*`` settings.
+
+        *share* scales the core count, e.g. ``1 / shards`` in a worker process.
+        """
+        external = {"whisper": batched_busy_seconds}
+        try:
+            cfg = global_container.resolve(IConfigurationService)
+            cores = float(cfg.get("streaming_capacity_cores", 0)) or os.cpu_count() or 1
+            return cls(
+                cores=cores * share,
+                target_utilisation=float(cfg.get("streaming_capacity_target", 0.8)),
+                policy=str(cfg.get("streaming_admission_policy", "reject")),
+                queue_timeout=float(cfg.get("streaming_admission_queue_timeout_s", 10)),
+                downgrades=parse_downgrades(str(cfg.get("streaming_downgrades", ""))),
+                external_work=external,
+            )
+        except Exception:  # pragma: no cover – DI not ready
+            return cls(cores=(os.cpu_count() or 1) * share, external_work=external)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def profile(engine: str, options: Dict[str, Any]) -> str:
+        """Return ``engine`` or ``engine:model`` for a session request."""
+        engine = engine.lower()
+        option = _MODEL_OPTIONS.get(engine)
+        model = options.get(option) if option else None
+        return f"{engine}:{model}" if model else engine
+
+    # ------------------------------------------------------------------
+    def estimate(self, profile: str) -> float:
+        """Cores one session of *profile* is expected to use."""
+        if profile in self._rtf:
+            return self._rtf[profile]
+        engine = profile.split(":", 1)[0]
+        return self._priors.get(profile, self._priors.get(engine, _DEFAULT_PRIOR))
+
+    def load(self) -> float:
+        """Cores the live sessions are expected to use."""
+        return sum(count * self.estimate(p) for p, count in self._live.items())
+
+    def _fits(self, profile: str) -> bool:
+        # A lone session is always admitted, whatever its estimate.
+        return not self._live or self.load() + self.estimate(profile) <= self.budget
+
+    # ------------------------------------------------------------------
+    def admit(self, engine: str, options: Dict[str, Any]) -> Admission:
+        """Reserve capacity for a session or raise :class:`CapacityExceededError`.
+
+        The returned :class:`Admission` names the engine and options to use,
+        which differ from the request when the session was downgraded.
+        """
+        options = dict(options)
+        requested = self.profile(engine, options)
+        with self._cond:
+            if self.policy == "off" or self._fits(requested):
+                return self._take(engine, options, requested, None)
+            if self.policy == "downgrade":
+                for alt_engine, alt_options, alt_profile in self._downgrade_chain(engine, options):
+                    if self._fits(alt_profile):
+                        self.downgraded += 1
+                        return self._take(alt_engine, alt_options, alt_profile, requested)
+            elif self.policy == "queue":
+                self.queued += 1
+                deadline = time.monotonic() + self.queue_timeout
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                    if self._fits(requested):
+                        return self._take(engine, options, requested, None)
+            self.rejected += 1
+            raise CapacityExceededError(
+                f"Streaming capacity exhausted ({self.load():.1f} of {self.budget:.1f} cores in use)",
+                self._retry_after(),
+            )
+
+    def _take(self, engine: str, options: Dict[str, Any], profile: str, downgraded_from: Optional[str]) -> Admission:
+        self._live[profile] = self._live.get(profile, 0) + 1
+        self.admitted += 1
+        return Admission(engine, options, profile, downgraded_from)
+
+    def _downgrade_chain(self, engine: str, options: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any], str]]:
+        seen = {self.profile(engine, options)}
+        while True:
+            target = self._downgrades.get(self.profile(engine, options)) or self._downgrades.get(engine.lower())
+            if not target or target in seen:
+                return
+            seen.add(target)
+            new_engine, _, model = target.partition(":")
+            if new_engine != engine.lower():
+                options = {}  # handler options are engine specific
+            option = _MODEL_OPTIONS.get(new_engine)
+            if option:
+                options = {k: v for k, v in options.items() if k != option}
+                if model:
+                    options[option] = model
+            engine = new_engine
+            yield engine, options, self.profile(engine, options)
+
+    def _retry_after(self) -> float:
+        """Seconds until a session is likely to end (mean duration / live)."""
+        live = sum(self._live.values())
+        if not self._durations or not live:
+            return self.default_retry_after
+        mean = sum(self._durations) / len(self._durations)
+        return float(min(300, max(1, math.ceil(mean / live))))
+
+    # ------------------------------------------------------------------
+    def release(self, profile: str, duration: float | None = None) -> None:
+        """Return the capacity held by a finished session of *profile*."""
+        with self._cond:
+            count = self._live.get(profile, 0) - 1
+            if count > 0:
+                self._live[profile] = count
+            else:
+                self._live.pop(profile, None)
+            if duration is not None:
+                self._durations.append(duration)
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    def observe(self, profile: str, audio_seconds: float, busy_seconds: float) -> None:
+        """Record *busy_seconds* of processing spent on *audio_seconds* of audio."""
+        with self._cond:
+            window = self._window.setdefault(profile, [0.0, 0.0])
+            window[0] += audio_seconds
+            window[1] += busy_seconds
+            self._window_audio += audio_seconds
+            if self._window_audio >= _WINDOW_AUDIO:
+                self._update_estimates()
+
+    def _update_estimates(self) -> None:
+        # Share off-thread work among the engine's profiles by audio.
+        for engine, probe in self._external.items():
+            total = self._probe(probe)
+            spent, self._external_last[engine] = total - self._external_last[engine], total
+            shares = {p: w[0] for p, w in self._window.items() if p.split(":", 1)[0] == engine}
+            audio = sum(shares.values())
+            if spent > 0 and audio > 0:
+                for p, share in shares.items():
+                    self._window[p][1] += spent * share / audio
+        for profile, (audio, busy) in self._window.items():
+            if audio > 0:
+                previous = self.estimate(profile)
+                self._rtf[profile] = previous + self.alpha * (busy / audio - previous)
+        self._window.clear()
+        self._window_audio = 0.0
+        self._cond.notify_all()
+
+    @staticmethod
+    def _probe(fn: Callable[[], float]) -> float:
+        try:
+            return float(fn())
+        except Exception:  # pragma: no cover – probe unavailable
+            return 0.0
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:  # noqa: D401
+        """Return budget, load, per-profile estimates and admission counters."""
+        with self._cond:
+            load = self.load()
+            profiles = set(self._priors) | set(self._rtf) | set(self._live)
+            return {
+                "policy": self.policy,
+                "cores": self.cores,
+                "budget": self.budget,
+                "load": load,
+                "headroom": self.budget - load,
+                "live": dict(self._live),
+                "rtf": {p: self.estimate(p) for p in sorted(profiles)},
+                "measured": sorted(self._rtf),
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "queued": self.queued,
+                "downgraded": self.downgraded,
+            }
+
+
+_MODEL: CapacityModel | None = None
+_MODEL_LOCK = threading.Lock()
+
+
+def get_capacity_model() -> CapacityModel:
+    """Return the process-wide capacity model shared by all streaming services."""
+    global _MODEL
+    with _MODEL_LOCK:
+        if _MODEL is None:
+            _MODEL = CapacityModel.from_settings()
+        return _MODEL
@@ -0,0 +1,541 @@
+from __future__ import annotations
+
+"""Streaming sessions spread over worker processes.
+
+:class:`StreamingService` runs every recogniser in the API process, so all
+sessions share one interpreter.  :class:`ShardedStreamingService` starts
+``shards`` worker processes instead.  Each worker runs its own
+:class:`StreamingService` and warms the models listed in
+``asr_preload_models`` through its model registry.  The API process only
+routes messages: PCM frames and requests go down a per-shard pipe, and
+updates come back up the same pipe into a :class:`CoalescingUpdateQueue`.
+
+* New sessions go to the shard with the most capacity headroom for the
+  requested engine, from its latest report less the sessions placed since
+  (ties broken by fewer sessions, then the lower real-time factor).
+  Admission itself still happens in the worker, against its share of the
+  cores.  :meth:`ShardedStreamingService.get_capacity` sums the reports.
+* Every worker reports its load once per second: sessions, real-time factor
+  (processing seconds per second of audio) and process CPU.
+  :meth:`ShardedStreamingService.shard_stats` returns the latest reports.
+
+Frames for one shard are written by a dedicated sender thread.  A saturated
+worker therefore delays only its own sessions and never blocks the event
+loop.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from ..interfaces.streaming_service import IAsyncStreamingService
+from .capacity import _DEFAULT_PRIOR, CapacityModel
+from .streaming_service import StreamingService
+from src.asr.streaming.update_queue import CoalescingUpdateQueue, LatencyTracker
+
+logger = logging.getLogger("ambient_scribe")
+
+__all__ = ["ShardedStreamingService"]
+
+_BYTES_PER_SECOND = 16000 * 2  # streaming contract: 16-kHz s16le mono
+_REPORT_INTERVAL = 1.0  # seconds between worker load reports
+_RPC_TIMEOUT = 5.0  # seconds a synchronous stats request may take
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+class _PipeQueue:
+    """Shard-side update queue forwarding every update to the router."""
+
+    def __init__(self, send: Callable[[tuple], None]) -> None:
+        self._send = send
+        self._lock = threading.Lock()
+        self._session_id: Optional[str] = None
+        self._early: List[Any] = []  # updates produced before the id was known
+        self._closed_early = False
+
+    def bind(self, session_id: str) -> None:  # noqa: D401
+        with self._lock:
+            self._session_id = session_id
+            for item in self._early:
+                self._send(("update", session_id, item))
+            self._early = []
+            if self._closed_early:
+                self._send(("closed", session_id))
+
+    def put(self, item: Any, block: bool = True, timeout: float | None = None) -> None:  # noqa: D401
+        with self._lock:
+            if self._session_id is None:
+                self._early.append(item)
+            else:
+                self._send(("update", self._session_id, item))
+
+    put_nowait = put
+
+    def qsize(self) -> int:  # noqa: D401
+        return 0  # nothing is held here; pending updates live in the router
+
+    def close(self) -> None:  # noqa: D401
+        with self._lock:
+            if self._session_id is None:
+                self._closed_early = True
+            else:
+                self._send(("closed", self._session_id))
+
+
+class _ShardWorkerService(StreamingService):
+    """:class:`StreamingService` whose updates leave through the shard pipe."""
+
+    def __init__(self, send: Callable[[tuple], None], **kwargs: Any) -> None:
+        self._send = send
+        self._unpublished: Dict[str, _PipeQueue] = {}
+        super().__init__(**kwargs)
+
+    def _new_queue(self) -> Any:  # type: ignore[override]
+        return _PipeQueue(self._send)
+
+    def start_session(self, engine: str, **options: Any) -> str:  # noqa: D401
+        session_id = super().start_session(engine, **options)
+        self._unpublished[session_id] = self._sessions[session_id]["queue"]
+        return session_id
+
+    def publish(self, session_id: str) -> None:  # noqa: D401
+        """Start forwarding updates of *session_id*, including those already produced.
+
+        Called after the start reply was sent: the router only routes
+        updates for sessions it has registered.
+        """
+        self._unpublished.pop(session_id).bind(session_id)
+
+    @property
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+
+class _ShardLoad:
+    """Audio and processing time accumulated by one worker."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.audio_seconds = 0.0
+        self.busy_seconds = 0.0
+        self._last = (time.monotonic(), time.process_time(), 0.0, 0.0)
+
+    def add(self, nbytes: int, busy: float) -> None:  # noqa: D401
+        with self._lock:
+            self.audio_seconds += nbytes / _BYTES_PER_SECOND
+            self.busy_seconds += busy
+
+    def report(self, sessions: int, capacity: dict) -> dict:  # noqa: D401
+        """Return load since the previous report plus lifetime totals."""
+        now, cpu = time.monotonic(), time.process_time()
+        with self._lock:
+            audio, busy = self.audio_seconds, self.busy_seconds
+        last_now, last_cpu, last_audio, last_busy = self._last
+        self._last = (now, cpu, audio, busy)
+        d_audio = audio - last_audio
+        return {
+            "pid": os.getpid(),
+            "sessions": sessions,
+            "rtf": (busy - last_busy) / d_audio if d_audio > 0 else 0.0,
+            "rtf_total": busy / audio if audio > 0 else 0.0,
+            "cpu_percent": (cpu - last_cpu) / (now - last_now) * 100.0 if now > last_now else 0.0,
+            "audio_seconds": audio,
+            "busy_seconds": busy,
+            "capacity": capacity,
+        }
+
+
+def _shard_main(shard_id: int, conn: Any, inactivity_timeout: int, capacity_share: float) -> None:
+    """Entry point of a worker process: serve requests until the pipe closes."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the API process handles Ctrl-C
+    try:
+        import src.core.bootstrap  # noqa: F401 – registers configuration & factories
+    except Exception as exc:  # pragma: no cover – optional engines not installed
+        logger.warning("Shard %d could not bootstrap services: %s", shard_id, exc)
+    send_lock = threading.Lock()
+
+    def send(message: tuple) -> None:
+        with send_lock:
+            conn.send(message)
+
+    # Every worker admits sessions against its share of the host's cores.
+    service = _ShardWorkerService(
+        send,
+        inactivity_timeout=inactivity_timeout,
+        capacity=CapacityModel.from_settings(share=capacity_share),
+    )
+    try:
+        from src.asr.model_registry import get_model_registry
+
+        get_model_registry()  # starts warming ``asr_preload_models``
+    except Exception as exc:  # pragma: no cover – engines not installed
+        logger.warning("Shard %d could not preload models: %s", shard_id, exc)
+
+    load = _ShardLoad()
+
+    def _reporter() -> None:
+        while True:
+            time.sleep(_REPORT_INTERVAL)
+            try:
+                send(("load", load.report(service.session_count, service.get_capacity())))
+            except (BrokenPipeError, EOFError, OSError):
+                return
+
+    threading.Thread(target=_reporter, name=f"shard-{shard_id}-load", daemon=True).start()
+
+    def _serve(op: str, request_id: int, args: list) -> None:
+        try:
+            result = requests[op](*args)
+        except Exception as exc:  # noqa: BLE001 – forwarded to the caller
+            try:
+                send(("reply", request_id, None, exc))
+            except Exception:  # unpicklable exception
+                send(("reply", request_id, None, RuntimeError(repr(exc))))
+            return
+        send(("reply", request_id, result, None))
+        if op == "start":
+            service.publish(result)
+
+    requests: Dict[str, Callable[..., Any]] = {
+        "start": lambda engine, options: service.start_session(engine, **options),
+        "stats": service.get_session_stats,
+        "end": service.end_session,
+    }
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        op = message[0]
+        if op == "chunk":
+            _op, session_id, chunk = message
+            started = time.perf_counter()
+            try:
+                service.process_chunk(session_id, chunk)
+            except KeyError:
+                pass  # session expired while frames were in flight
+            except Exception as exc:
+                logger.error("Shard %d failed on session %s: %s", shard_id, session_id, exc)
+            load.add(len(chunk), time.perf_counter() - started)
+        elif op == "stop":
+            break
+        elif op == "start":
+            # Admission may wait for capacity (``queue`` policy); frames and
+            # the ``end`` requests that free capacity must keep flowing.
+            _op, request_id, *args = message
+            threading.Thread(target=_serve, args=(op, request_id, args), daemon=True).start()
+        else:
+            _op, request_id, *args = message
+            _serve(op, request_id, args)
+
+
+# ---------------------------------------------------------------------------
+# Router side
+# ---------------------------------------------------------------------------
+
+class _Shard:
+    """API-process handle of one worker: pipe, sender thread and load."""
+
+    def __init__(self, index: int, ctx: Any, inactivity_timeout: int, capacity_share: float) -> None:
+        self.index = index
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_shard_main,
+            args=(index, child, inactivity_timeout, capacity_share),
+            name=f"streaming-shard-{index}",
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+        self.alive = True
+        self.sessions = 0
+        self.reserved = 0  # placements awaiting the worker's reply
+        self.load: dict = {}
+        self._outbox: "queue.SimpleQueue[Optional[tuple]]" = queue.SimpleQueue()
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._send_loop, name=f"shard-{index}-send", daemon=True).start()
+
+    # ------------------------------------------------------------------
+    def send(self, message: tuple) -> None:  # noqa: D401
+        self._outbox.put(message)
+
+    def call(self, op: str, *args: Any, on_done: Callable[[Future], None] | None = None) -> Future:
+        """Send request *op* and return a future for the worker's reply."""
+        future: Future = Future()
+        if on_done is not None:
+            # Attached before sending so it runs on the reader thread, ahead
+            # of any message the worker sends after replying.
+            future.add_done_callback(on_done)
+        if not self.alive:
+            future.set_exception(RuntimeError(f"Streaming shard {self.index} is not running"))
+            return future
+        with self._lock:
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+        self.send((op, request_id, *args))
+        return future
+
+    def resolve(self, request_id: int, result: Any, error: BaseException | None) -> None:  # noqa: D401
+        with self._lock:
+            future = self._pending.pop(request_id, None)
+        if future is None:
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def fail_pending(self) -> None:  # noqa: D401
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError(f"Streaming shard {self.index} exited"))
+
+    # ------------------------------------------------------------------
+    def _send_loop(self) -> None:
+        while True:
+            message = self._outbox.get()
+            if message is None:
+                return
+            try:
+                self.conn.send(message)
+            except (BrokenPipeError, EOFError, OSError):
+                return
+
+    def stop(self) -> None:  # noqa: D401
+        self.send(("stop",))
+        self._outbox.put(None)
+        self.process.join(timeout=5)
+        if self.process.is_alive():  # pragma: no cover – stuck recogniser
+            self.process.terminate()
+        self.alive = False
+
+    # ------------------------------------------------------------------
+    def headroom(self, profile: str) -> float:
+        """Cores left for a *profile* session: the last report less placements since."""
+        capacity = self.load.get("capacity") or {}
+        if "headroom" not in capacity:
+            return math.inf  # not reported yet
+        rtf = capacity.get("rtf", {})
+        cost = rtf.get(profile, rtf.get(profile.split(":", 1)[0], _DEFAULT_PRIOR))
+        unreported = self.sessions + self.reserved - self.load.get("sessions", 0)
+        return capacity["headroom"] - unreported * cost
+
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:  # noqa: D401
+        return {
+            "shard": self.index,
+            "pid": self.process.pid,
+            "alive": self.alive and self.process.is_alive(),
+            "sessions": self.sessions,
+            "pending_frames": self._outbox.qsize(),
+            "rtf": self.load.get("rtf", 0.0),
+            "rtf_total": self.load.get("rtf_total", 0.0),
+            "cpu_percent": self.load.get("cpu_percent", 0.0),
+            "audio_seconds": self.load.get("audio_seconds", 0.0),
+            "busy_seconds": self.load.get("busy_seconds", 0.0),
+            "capacity": self.load.get("capacity", {}),
+        }
+
+
+class _RoutedSession:
+    __slots__ = ("shard", "queue", "delivery_latency")
+
+    def __init__(self, shard: _Shard) -> None:
+        self.shard = shard
+        self.queue = CoalescingUpdateQueue()
+        self.delivery_latency = LatencyTracker()
+
+
+class ShardedStreamingService(IAsyncStreamingService):  # noqa: D401
+    """Route streaming sessions to a pool of recogniser processes."""
+
+    def __init__(
+        self,
+        shards: int | None = None,
+        *,
+        inactivity_timeout: int = 60,
+        start_method: str = "spawn",
+    ) -> None:  # noqa: D401
+        self.num_shards = max(1, shards or os.cpu_count() or 1)
+        self._inactivity_timeout = inactivity_timeout
+        self._start_method = start_method
+        self._shards: List[_Shard] = []
+        self._sessions: Dict[str, _RoutedSession] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def _ensure_started(self) -> None:
+        """Start the workers on first use, not at import/registration time."""
+        with self._lock:
+            if self._shards:
+                return
+            ctx = multiprocessing.get_context(self._start_method)
+            for index in range(self.num_shards):
+                shard = _Shard(index, ctx, self._inactivity_timeout, 1.0 / self.num_shards)
+                threading.Thread(
+                    target=self._read_loop, args=(shard,), name=f"shard-{index}-recv", daemon=True
+                ).start()
+                self._shards.append(shard)
+            logger.info("Started %d streaming shard processes", self.num_shards)
+
+    # ------------------------------------------------------------------
+    def _pick_shard(self, profile: str) -> _Shard:
+        with self._lock:
+            alive = [s for s in self._shards if s.alive]
+            if not alive:
+                raise RuntimeError("No streaming shard is running")
+            shard = min(
+                alive,
+                key=lambda s: (-s.headroom(profile), s.sessions + s.reserved, s.load.get("rtf", 0.0)),
+            )
+            shard.reserved += 1
+            return shard
+
+    # ------------------------------------------------------------------
+    def _read_loop(self, shard: _Shard) -> None:
+        """Dispatch replies, updates and load reports coming from *shard*."""
+        while True:
+            try:
+                message = shard.conn.recv()
+            except (EOFError, OSError):
+                break
+            kind = message[0]
+            if kind == "update":
+                _kind, session_id, update = message
+                routed = self._sessions.get(session_id)
+                if routed is None:
+                    continue
+                if isinstance(update, dict) and update.get("type") == "metrics":
+                    update["delivery_latency"] = routed.delivery_latency.summary()
+                    update["shard"] = shard.index
+                routed.queue.put(update)
+            elif kind == "closed":
+                with self._lock:
+                    routed = self._sessions.pop(message[1], None)
+                    if routed is not None:
+                        shard.sessions -= 1
+                if routed is not None:
+                    routed.queue.close()
+            elif kind == "reply":
+                shard.resolve(*message[1:])
+            elif kind == "load":
+                shard.load = message[1]
+
+        shard.alive = False
+        shard.fail_pending()
+        with self._lock:
+            orphaned = [sid for sid, r in self._sessions.items() if r.shard is shard]
+            routed_sessions = [self._sessions.pop(sid) for sid in orphaned]
+            shard.sessions = 0
+        for routed in routed_sessions:
+            routed.queue.put({"type": "error", "error": f"Streaming shard {shard.index} exited"})
+            routed.queue.close()
+        if orphaned:
+            logger.error("Streaming shard %d exited with %d live sessions", shard.index, len(orphaned))
+
+    # ------------------------------------------------------------------
+    def _register(self, shard: _Shard, future: Future) -> None:
+        """Reader-thread callback for a start reply: route the new session."""
+        with self._lock:
+            shard.reserved -= 1
+            if future.exception() is None:
+                self._sessions[future.result()] = _RoutedSession(shard)
+                shard.sessions += 1
+
+    # ------------------------------------------------------------------
+    def _get(self, session_id: str) -> _RoutedSession:
+        routed = self._sessions.get(session_id)
+        if routed is None:
+            raise KeyError(session_id)
+        return routed
+
+    # ------------------------------------------------------------------
+    async def start_session(self, engine: str, **options: Any) -> str:  # noqa: D401
+        self._ensure_started()
+        shard = self._pick_shard(CapacityModel.profile(engine, options))
+        future = shard.call("start", engine, options, on_done=lambda f: self._register(shard, f))
+        return await asyncio.wrap_future(future)
+
+    # ------------------------------------------------------------------
+    async def process_chunk(self, session_id: str, chunk: bytes) -> None:  # noqa: D401
+        self._get(session_id).shard.send(("chunk", session_id, chunk))
+
+    # ------------------------------------------------------------------
+    async def updates(self, session_id: str) -> AsyncIterator[dict]:  # noqa: D401
+        routed = self._get(session_id)
+        while True:
+            try:
+                produced_at, update = await routed.queue.get_timed()
+            except queue.Empty:  # session ended and drained
+                return
+            yield update
+            routed.delivery_latency.record(time.perf_counter() - produced_at)
+
+    # ------------------------------------------------------------------
+    def get_session_stats(self, session_id: str) -> dict:  # noqa: D401
+        routed = self._get(session_id)
+        try:
+            stats = routed.shard.call("stats", session_id).result(timeout=_RPC_TIMEOUT)
+        except KeyError:
+            raise
+        except Exception as exc:
+            logger.debug("Shard stats for %s unavailable: %s", session_id, exc)
+            stats = {}
+        stats["pending_updates"] = routed.queue.qsize()
+        stats["delivery_latency"] = routed.delivery_latency.summary()
+        stats["coalesced_partials"] = routed.queue.coalesced
+        stats["shard"] = routed.shard.index
+        return stats
+
+    # ------------------------------------------------------------------
+    async def end_session(self, session_id: str) -> None:  # noqa: D401
+        routed = self._sessions.get(session_id)
+        if routed is None:
+            return
+        # Frames already queued for the shard are processed first.
+        try:
+            await asyncio.wrap_future(routed.shard.call("end", session_id))
+        except RuntimeError:  # shard gone; the reader already closed the session
+            pass
+
+    # ------------------------------------------------------------------
+    def get_capacity(self) -> dict:  # noqa: D401
+        """Return the summed admission budget and load of all shards, plus each shard's report."""
+        shards = [dict(s.load.get("capacity") or {}, shard=s.index) for s in self._shards]
+        reported = [c for c in shards if "budget" in c]
+        totals: dict = {"policy": reported[0]["policy"] if reported else None}
+        for key in ("cores", "budget", "load", "headroom", "admitted", "rejected", "queued", "downgraded"):
+            totals[key] = sum(c[key] for c in reported)
+        live: Dict[str, int] = {}
+        for capacity in reported:
+            for profile, count in capacity["live"].items():
+                live[profile] = live.get(profile, 0) + count
+        totals["live"] = live
+        totals["shards"] = shards
+        return totals
+
+    # ------------------------------------------------------------------
+    def shard_stats(self) -> List[dict]:  # noqa: D401
+        """Return the latest load report of every shard."""
+        return [shard.stats() for shard in self._shards]
+
+    # ------------------------------------------------------------------
+    def shutdown(self) -> None:  # noqa: D401
+        """Stop all workers; live sessions receive an error event."""
+        for shard in self._shards:
+            shard.stop()
@@ -6,10 +6,17 @@ import queue
 import threading
 import time
 import uuid
-from typing import Any, Dict, Iterable
+from typing import Any, Dict, Iterable, Tuple
 
+from ..container import global_container
+from ..interfaces.config_service import IConfigurationService
 from ..interfaces.streaming_service import IStreamingService
 from ..factories.streaming_factory import StreamingHandlerFactory
+from .capacity import CapacityModel, get_capacity_model
+from src.asr.streaming.update_queue import LatencyTracker, UpdateQueue
+from src.audio.metrics import AudioQualityMetrics
+from src.audio.ring_buffer import PCMRingBuffer
+from src.audio.vad import EnergyVAD
 from src.utils import monitor_resources
 
 
@@ -17,66 +24,182 @@ class StreamingService(IStreamingService):  # noqa: D401
     """Manage multiple concurrent streaming sessions and resource metrics."""
 
     _CLEANUP_INTERVAL = 10  # seconds between house-keeping runs
+    _RECENT_AUDIO_SECONDS = 2.0  # per-session ring of the latest PCM
+    _BYTES_PER_SECOND = 16000 * 2  # 16-kHz s16le mono
 
-    def __init__(self, *, inactivity_timeout: int = 60) -> None:  # noqa: D401
+    @staticmethod
+    def _new_queue() -> Any:
+        return UpdateQueue(maxsize=256)
+
+    def __init__(self, *, inactivity_timeout: int = 60, capacity: CapacityModel | None = None) -> None:  # noqa: D401
         self._sessions: Dict[str, dict] = {}
+        self._capacity = capacity or get_capacity_model()
         self._lock = threading.Lock()
         self._inactivity_timeout = inactivity_timeout
         self._housekeeper = threading.Thread(target=self._cleanup_loop, daemon=True)
         self._housekeeper.start()
 
     # ------------------------------------------------------------------
-    def start_session(self, engine: str, **options: Any) -> str:  # noqa: D401
+    def start_session(self, engine: str, *, vad: Any = None, **options: Any) -> str:  # noqa: D401
+        """Open a session; *vad* is ``True``/``False``, a detector with a
+        ``process(chunk)`` method, or ``None`` for ``streaming_vad_enabled``.
+
+        Raises :class:`CapacityExceededError` when the host has no room for
+        the session.  A downgraded session starts with a ``downgrade`` event.
+        """
+        admission = self._capacity.admit(engine, options)
         session_id = uuid.uuid4().hex
-        updates_q: queue.Queue = queue.Queue(maxsize=256)
-        handler = StreamingHandlerFactory.create(engine, update_queue=updates_q, **options)
+        updates_q = self._new_queue()
+        try:
+            handler = StreamingHandlerFactory.create(admission.engine, update_queue=updates_q, **admission.options)
+        except Exception:
+            self._capacity.release(admission.profile)
+            raise
+        if admission.downgraded_from is not None:
+            updates_q.put(
+                {
+                    "type": "downgrade",
+                    "reason": "capacity",
+                    "requested": admission.downgraded_from,
+                    "profile": admission.profile,
+                    "engine": admission.engine,
+                }
+            )
         measure, get_results = monitor_resources()
         self._sessions[session_id] = {
             "handler": handler,
+            "profile": admission.profile,
+            "started": time.time(),
             "queue": updates_q,
             "measure": measure,
             "metrics": get_results,
-            "quality_sum": 0.0,
-            "quality_count": 0,
-            "peak_amplitude": 0.0,
+            "quality": AudioQualityMetrics(),
             "last_activity": time.time(),
+            "delivery_latency": LatencyTracker(),
+            "audio": PCMRingBuffer.for_duration(self._RECENT_AUDIO_SECONDS),
+            "vad": self._make_vad(vad),
         }
         return session_id
 
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _make_vad(vad: Any) -> Any:
+        if vad is not None and not isinstance(vad, bool):
+            return vad  # caller-supplied detector
+        try:
+            cfg = global_container.resolve(IConfigurationService)
+            enabled = bool(cfg.get("streaming_vad_enabled", False)) if vad is None else vad
+            if not enabled:
+                return None
+            return EnergyVAD(
+                policy=str(cfg.get("streaming_vad_policy", "compress")),
+                energy_threshold=float(cfg.get("streaming_vad_energy_threshold", 0.01)),
+                hangover_ms=int(cfg.get("streaming_vad_hangover_ms", 300)),
+                preroll_ms=int(cfg.get("streaming_vad_preroll_ms", 200)),
+            )
+        except Exception:  # pragma: no cover – DI not ready
+            return EnergyVAD() if vad else None
+
     # ------------------------------------------------------------------
     def process_chunk(self, session_id: str, chunk: bytes) -> None:  # noqa: D401
         with self._lock:
             sess = self._sessions.get(session_id)
         if not sess:
             raise KeyError(f"Unknown session {session_id}")
-        sess["measure"]()
         sess["last_activity"] = time.time()
 
-        # Audio quality assessment – simple RMS amplitude metric
+        # Audio quality assessment on the int16 samples the ring realigned
+        # (chunks may split mid-sample); no float copy is made.
         try:
-            import numpy as _np  # local import avoids mandatory dependency
-
             if chunk:
-                audio_arr = _np.frombuffer(chunk, dtype=_np.int16).astype(_np.float32)
-                rms = float(_np.mean(_np.abs(audio_arr)) / 32768.0)
-                sess["quality_sum"] += rms
-                sess["quality_count"] += 1
-                if rms > sess["peak_amplitude"]:
-                    sess["peak_amplitude"] = rms
+                sess["quality"].update(sess["audio"].append(chunk))
         except Exception:
             # Ignore quality calculation errors to avoid disrupting streaming
             pass
 
-        sess["handler"](chunk)  # call the handler
+        started = time.perf_counter()
+        try:
+            self._recognise(sess, chunk)
+        finally:
+            # Counted work: CPU attribution at session end and the live RTF
+            # estimate used for admission control.
+            busy = time.perf_counter() - started
+            sess["measure"](len(chunk), busy)
+            self._capacity.observe(sess["profile"], len(chunk) / self._BYTES_PER_SECOND, busy)
 
     # ------------------------------------------------------------------
-    def get_updates(self, session_id: str) -> Iterable[dict]:  # noqa: D401
+    @staticmethod
+    def _recognise(sess: dict, chunk: bytes) -> None:
+        vad = sess["vad"]
+        if vad is None:
+            sess["handler"](chunk)  # call the handler
+            return
+        decision = vad.process(chunk)
+        if decision.audio:
+            sess["handler"](decision.audio)
+        if decision.endpoint:
+            on_endpoint = getattr(sess["handler"], "on_endpoint", None)
+            if callable(on_endpoint):
+                on_endpoint()
+            sess["queue"].put({"type": "endpoint"})
+
+    # ------------------------------------------------------------------
+    def _get_session(self, session_id: str) -> dict:
         sess = self._sessions.get(session_id)
         if not sess:
             raise KeyError(session_id)
-        q: queue.Queue = sess["queue"]
-        while not q.empty():
-            yield q.get()
+        return sess
+
+    # ------------------------------------------------------------------
+    def get_updates(self, session_id: str) -> Iterable[dict]:  # noqa: D401
+        for _produced_at, update in self.get_timed_updates(session_id):
+            yield update
+
+    # ------------------------------------------------------------------
+    def get_timed_updates(self, session_id: str) -> Iterable[Tuple[float, dict]]:  # noqa: D401
+        q: UpdateQueue = self._get_session(session_id)["queue"]
+        while True:
+            try:
+                yield q.get_timed_nowait()
+            except queue.Empty:
+                return
+
+    # ------------------------------------------------------------------
+    async def wait_for_updates(self, session_id: str, timeout: float | None = None) -> bool:  # noqa: D401
+        q: UpdateQueue = self._get_session(session_id)["queue"]
+        return await q.wait(timeout)
+
+    # ------------------------------------------------------------------
+    def record_delivery(self, session_id: str, produced_at: float) -> None:  # noqa: D401
+        sess = self._sessions.get(session_id)
+        if sess:
+            sess["delivery_latency"].record(time.perf_counter() - produced_at)
+
+    # ------------------------------------------------------------------
+    def get_session_stats(self, session_id: str) -> dict:  # noqa: D401
+        sess = self._get_session(session_id)
+        return {
+            "pending_updates": sess["queue"].qsize(),
+            "delivery_latency": sess["delivery_latency"].summary(),
+            "vad": sess["vad"].stats() if sess["vad"] is not None else None,
+            "audio_quality": sess["quality"].summary(),
+        }
+
+    # ------------------------------------------------------------------
+    def get_audio_quality(self, session_id: str) -> dict:  # noqa: D401
+        """Return RMS/peak/clipping/DC/SNR metrics and histograms for *session_id*."""
+        return self._get_session(session_id)["quality"].summary()
+
+    # ------------------------------------------------------------------
+    def get_recent_audio(self, session_id: str, seconds: float | None = None) -> bytes:  # noqa: D401
+        """Return up to the last *seconds* of PCM received for *session_id*."""
+        ring = self._get_session(session_id)["audio"]
+        return ring.to_bytes(None if seconds is None else ring.seconds(seconds))
+
+    # ------------------------------------------------------------------
+    def get_capacity(self) -> dict:  # noqa: D401
+        """Return the admission budget, current load and per-engine RTF estimates."""
+        return self._capacity.stats()
 
     # ------------------------------------------------------------------
     def end_session(self, session_id: str) -> None:  # noqa: D401
@@ -84,12 +207,44 @@ class StreamingService(IStreamingService):  # noqa: D401
             sess = self._sessions.pop(session_id, None)
         if not sess:
             return
+        self._close_handler(sess)
         # Capture metrics for future reporting if needed
+        self._finish_queue(sess, {"type": "metrics", **self._final_metrics(sess)})
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _finish_queue(sess: dict, event: dict) -> None:
+        """Post the closing *event*; queues that support it stop accepting more."""
+        sess["queue"].put(event)
+        close = getattr(sess["queue"], "close", None)
+        if callable(close):
+            close()
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _final_metrics(sess: dict) -> dict:
+        """Resource, audio-quality and delivery metrics for a finished session."""
         metrics = sess["metrics"]()
-        if sess["quality_count"]:
-            metrics["avg_amplitude"] = sess["quality_sum"] / sess["quality_count"]
-            metrics["peak_amplitude"] = sess["peak_amplitude"]
-        sess["queue"].put({"type": "metrics", **metrics})
+        quality = sess["quality"]
+        if quality.chunks:
+            metrics["avg_amplitude"] = quality.avg_chunk_rms
+            metrics["peak_amplitude"] = quality.max_chunk_rms
+            metrics["audio_quality"] = quality.summary()
+        metrics["delivery_latency"] = sess["delivery_latency"].summary()
+        if sess["vad"] is not None:
+            metrics["vad"] = sess["vad"].stats()
+        return metrics
+
+    # ------------------------------------------------------------------
+    def _close_handler(self, sess: dict) -> None:
+        """Let handlers release shared resources such as registry models."""
+        self._capacity.release(sess["profile"], time.time() - sess["started"])
+        close = getattr(sess["handler"], "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:  # pragma: no cover – best-effort cleanup
+                pass
 
     # ------------------------------------------------------------------
     def _cleanup_loop(self) -> None:  # noqa: D401
@@ -102,12 +257,11 @@ class StreamingService(IStreamingService):  # noqa: D401
                 for sid, sess in list(self._sessions.items()):
                     if now - sess["last_activity"] > self._inactivity_timeout:
                         expired.append(sid)
-                for sid in expired:
-                    _sess = self._sessions.pop(sid)
-                    # Post final metrics if consumer still reading
-                    metrics = _sess["metrics"]()
-                    if _sess["quality_count"]:
-                        metrics["avg_amplitude"] = _sess["quality_sum"] / _sess["quality_count"]
-                        metrics["peak_amplitude"] = _sess["peak_amplitude"]
-                    _sess["queue"].put({"type": "metrics", "expired": True, **metrics})
+                expired_sessions = [self._sessions.pop(sid) for sid in expired]
+            # Closing may decode the remaining audio; never hold the lock for it.
+            for _sess in expired_sessions:
+                self._close_handler(_sess)
+                # Post final metrics if consumer still reading
+                metrics = self._final_metrics(_sess)
+                self._finish_queue(_sess, {"type": "metrics", "expired": True, **metrics})
             # Loop continues 
\ No newline at end of file
@@ -16,7 +16,7 @@ def get_file_hash(file_path: str | Path) -> str:
     sha256 = hashlib.sha256()
     try:
         with path.open("rb") as handle:
-            for block in iter(lambda: handle.read(4096), b""):
+            for block in iter(lambda: handle.read(1 << 20), b""):
                 sha256.update(block)
         return sha256.hexdigest()
     except Exception as exc:  # pragma: no cover
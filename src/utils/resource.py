@@ -1,48 +1,162 @@
 from __future__ import annotations
 
+"""Process resource tracking for streaming sessions.
+
+A single :class:`ResourceSampler` thread records process CPU and RSS at a
+fixed rate into a bounded ring, so the cost does not grow with the number
+of sessions or chunks.  :func:`monitor_resources` hands each session a
+``measure`` callable that only counts work (bytes and processing seconds).
+At the end of the session the process CPU over its lifetime is split by the
+session's share of all counted work.
+"""
+
 import logging
 import os
-from typing import Callable, Tuple
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, Tuple
 
 logger = logging.getLogger("ambient_scribe")
 
+__all__ = ["ResourceSampler", "get_resource_sampler", "monitor_resources"]
+
+# (monotonic time, process cpu %, rss MB)
+Sample = Tuple[float, float, float]
+
+
+class ResourceSampler:
+    """Background sampler of process CPU % and RSS with bounded storage."""
+
+    def __init__(self, *, interval: float = 0.5, capacity: int = 7200) -> None:
+        self.interval = interval
+        self._samples: Deque[Sample] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._work_seconds = 0.0  # counted work of all sessions
+        self._process: Any = None
+        self._thread: threading.Thread | None = None
+        try:
+            import psutil  # local import – optional dependency
+
+            self._process = psutil.Process(os.getpid())
+            self._process.cpu_percent(interval=None)  # prime the CPU counter
+        except ImportError:
+            logger.debug("psutil not installed – resource monitoring disabled")
+
+    # ------------------------------------------------------------------
+    @property
+    def available(self) -> bool:
+        return self._process is not None
+
+    def start(self) -> None:  # noqa: D401
+        """Start the sampling thread (idempotent, no-op without psutil)."""
+        with self._lock:
+            if self._thread is not None or self._process is None:
+                return
+            self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            self.sample()
+
+    def sample(self) -> Sample | None:
+        """Take one sample now and store it."""
+        if self._process is None:
+            return None
+        try:
+            sample = (
+                time.monotonic(),
+                self._process.cpu_percent(interval=None),
+                self._process.memory_info().rss / 1024 / 1024,
+            )
+        except Exception:  # pragma: no cover
+            return None
+        with self._lock:
+            self._samples.append(sample)
+        return sample
+
+    # ------------------------------------------------------------------
+    def add_work(self, seconds: float) -> None:  # noqa: D401
+        with self._lock:
+            self._work_seconds += seconds
+
+    @property
+    def work_seconds(self) -> float:
+        return self._work_seconds
+
+    # ------------------------------------------------------------------
+    def window(self, since: float) -> List[Sample]:
+        """Samples taken at or after monotonic time *since* (oldest first)."""
+        with self._lock:
+            out: List[Sample] = []
+            for sample in reversed(self._samples):
+                if sample[0] < since:
+                    break
+                out.append(sample)
+        out.reverse()
+        return out
+
+    def latest(self) -> Sample | None:  # noqa: D401
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+
+_SAMPLER: ResourceSampler | None = None
+_SAMPLER_LOCK = threading.Lock()
+
+
+def get_resource_sampler() -> ResourceSampler:
+    """Return the process-wide sampler, starting it on first use."""
+    global _SAMPLER
+    with _SAMPLER_LOCK:
+        if _SAMPLER is None:
+            _SAMPLER = ResourceSampler()
+            _SAMPLER.start()
+        return _SAMPLER
+
+
+def monitor_resources() -> Tuple[Callable[..., None], Callable[[], dict]]:
+    """Return (measure, results) callables for lightweight resource tracking.
+
+    ``measure(nbytes, busy_seconds)`` only counts the session's work.
+    ``results()`` reports the session's share of process CPU together with
+    process memory over the session's lifetime.
+    """
+    sampler = get_resource_sampler()
+    if not sampler.available:
+
+        def _count(nbytes: int = 0, busy_seconds: float = 0.0) -> None:  # noqa: D401
+            pass
+
+        def _empty() -> dict:  # noqa: D401
+            return {"cpu_avg": 0.0, "memory_avg": 0.0, "peak_memory": 0.0}
+
+        return _count, _empty
+
+    started = time.monotonic()
+    work_at_start = sampler.work_seconds
+    latest = sampler.latest()
+    baseline_mem = latest[2] if latest else 0.0
+    counted = {"bytes": 0, "busy": 0.0}
+
+    def measure(nbytes: int = 0, busy_seconds: float = 0.0) -> None:
+        counted["bytes"] += nbytes
+        counted["busy"] += busy_seconds
+        sampler.add_work(busy_seconds)
+
+    def results() -> dict:
+        samples = sampler.window(started) or ([sampler.latest()] if sampler.latest() else [])
+        if not samples:
+            return {"cpu_avg": 0.0, "memory_avg": 0.0, "peak_memory": baseline_mem}
+        _times, cpus, mems = zip(*samples)
+        total_work = sampler.work_seconds - work_at_start
+        share = counted["busy"] / total_work if total_work > 0 else 0.0
+        return {
+            "cpu_avg": sum(cpus) / len(cpus) * share,
+            "memory_avg": sum(mems) / len(mems),
+            "peak_memory": max(mems),
+        }
 
-def monitor_resources() -> Tuple[Callable[[], None], Callable[[], dict]]:
-    """Return (measure, results) callables for lightweight resource tracking."""
-    try:
-        import psutil  # local import – optional dependency
-
-        process = psutil.Process(os.getpid())
-        baseline_mem = process.memory_info().rss / 1024 / 1024  # MB
-        measurements: list[tuple[float, float]] = []
-
-        def measure() -> None:
-            try:
-                cpu = process.cpu_percent(interval=None)
-                mem = process.memory_info().rss / 1024 / 1024
-                measurements.append((cpu, mem))
-            except Exception:  # pragma: no cover
-                pass
-
-        def results() -> dict:
-            if not measurements:
-                return {"cpu_avg": 0.0, "memory_avg": 0.0, "peak_memory": baseline_mem}
-            cpus, mems = zip(*measurements)
-            return {
-                "cpu_avg": sum(cpus) / len(cpus),
-                "memory_avg": sum(mems) / len(mems),
-                "peak_memory": max(mems),
-            }
-
-        return measure, results
-    except ImportError:
-        logger.debug("psutil not installed – resource monitoring disabled")
-
-    # Fallback no-op functions
-    def _noop() -> None:  # noqa: D401
-        pass
-
-    def _empty() -> dict:  # noqa: D401
-        return {"cpu_avg": 0.0, "memory_avg": 0.0, "peak_memory": 0.0}
-
-    return _noop, _empty 
\ No newline at end of file
+    return measure, results
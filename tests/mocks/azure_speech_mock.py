@@ -193,6 +193,33 @@ class MockAzureSpeechConfig:
         return cls(subscription_key, region)
 
 
+class MockAzureSpeechResponse:
+    """Mock ``requests.Response`` returned by the Speech REST endpoint."""
+
+    def __init__(self, status_code: int, payload: Dict[str, Any]):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = json.dumps(payload)
+
+    def json(self) -> Dict[str, Any]:
+        return self._payload
+
+
+def create_azure_speech_post(recognizer: Optional[MockAzureSpeechRecognizer] = None):
+    """Create a ``requests.post`` stand-in for the Speech REST endpoint."""
+    recognizer = recognizer or MockAzureSpeechRecognizer()
+
+    def post(url: str, *, data: bytes = b"", **_kwargs: Any) -> MockAzureSpeechResponse:
+        try:
+            result = asyncio.run(recognizer.recognize_once_async(data))
+        except Exception as exc:
+            return MockAzureSpeechResponse(500, {"error": str(exc)})
+        return MockAzureSpeechResponse(200, json.loads(result.json))
+
+    post.recognizer = recognizer
+    return post
+
+
 # Factory functions for easy mock creation
 def create_azure_speech_mock(
     fail_probability: float = 0.0,
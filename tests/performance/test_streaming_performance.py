@@ -1,400 +1,458 @@
-"""Performance tests for streaming transcription."""
+"""End-to-end streaming benchmarks.
+
+Synthetic speech-like PCM from ``tests/fixtures/audio_samples`` is streamed
+through the real :class:`AsyncStreamingService` (which wraps
+:class:`StreamingService`) and through ``/ws/stream`` on a local uvicorn
+server.  Audio is paced in real time, at a speed multiplier, or as fast as
+possible.  Recognition uses a CPU-burning mock engine; Vosk is benchmarked
+as well when a model is available (``VOSK_MODEL_PATH`` or
+``app_data/models/*``).
+
+Every scenario reports first-partial latency, final latency p50/p95/p99,
+real-time factor (process CPU seconds per second of audio), sessions per
+core and RSS growth per session.  Results are written as JSON, to
+``STREAMING_BENCH_OUTPUT`` or the pytest base temp dir.  They are compared
+against ``tests/performance/streaming_baseline.json``:
+
+* ``STREAMING_BENCH_UPDATE_BASELINE=1`` writes a new baseline.
+* ``STREAMING_BENCH_STRICT=1`` fails the run on regressions instead of
+  warning.
+"""
 
 import asyncio
+import bisect
+import json
+import os
+import platform
+import socket
+import threading
 import time
-import statistics
-from typing import List, Dict, Any
-from unittest.mock import patch
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pytest
-import psutil
 
-from src.core.services.streaming_service import StreamingService
-from tests.mocks.vosk_mock import create_vosk_mock
-from tests.mocks.azure_speech_mock import create_azure_speech_mock
+from src.core.factories.streaming_factory import StreamingHandlerFactory
+from src.core.services.async_streaming_service import AsyncStreamingService
+from src.core.services.capacity import CapacityModel
+from tests.fixtures.audio_samples.audio_generator import AudioSampleGenerator
 
+RATE = 16000
+BYTES_PER_SECOND = RATE * 2
+CHUNK_MS = 100
+BASELINE_PATH = Path(__file__).with_name("streaming_baseline.json")
+# Relative slack before a metric counts as regressed, and absolute floors
+# below which latency/memory differences are noise.
+TOLERANCE = 0.25
+_LOWER_IS_BETTER = {
+    "first_partial_p50_ms": 5.0,
+    "final_p50_ms": 5.0,
+    "final_p95_ms": 5.0,
+    "final_p99_ms": 5.0,
+    "rtf": 0.005,
+    "rss_per_session_mb": 1.0,
+}
+_HIGHER_IS_BETTER = ("sessions_per_core",)
 
-class TestStreamingPerformance:
-    """Performance benchmarks for streaming transcription."""
-    
-    @pytest.fixture
-    def large_audio_data(self):
-        """Generate large audio data for performance testing."""
-        # Simulate 30 seconds of audio data (16kHz, 16-bit, mono)
-        return b"mock_audio_chunk" * 10000  # ~140KB of data
-    
-    @pytest.fixture
-    def streaming_service(self):
-        """Create streaming service for performance testing."""
-        return StreamingService()
-    
-    @pytest.mark.asyncio
-    @pytest.mark.benchmark
-    async def test_single_session_throughput(self, streaming_service, large_audio_data, benchmark):
-        """Benchmark single session throughput."""
-        
-        with patch('src.asr.transcribers.vosk.VoskTranscriber') as mock_vosk_class:
-            mock_vosk = create_vosk_mock()
-            mock_vosk_class.return_value = mock_vosk
-            
-            mock_websocket = MockWebSocket()
-            
-            async def process_session():
-                # Create session
-                session_id = await streaming_service.create_session(
-                    websocket=mock_websocket,
-                    transcriber_type="vosk",
-                    config={"language": "en"}
-                )
-                
-                # Process audio in chunks
-                chunk_size = 4000
-                chunks_processed = 0
-                
-                for i in range(0, len(large_audio_data), chunk_size):
-                    chunk = large_audio_data[i:i + chunk_size]
-                    await streaming_service.process_audio_chunk(session_id, chunk)
-                    chunks_processed += 1
-                
-                # Clean up
-                await streaming_service.close_session(session_id)
-                
-                return chunks_processed
-            
-            # Benchmark the processing
-            result = await benchmark.pedantic(process_session, rounds=3, iterations=1)
-            
-            # Verify performance metrics
-            assert result > 0
-            assert benchmark.stats["mean"] < 5.0  # Should complete within 5 seconds
-    
-    @pytest.mark.asyncio
-    @pytest.mark.benchmark
-    async def test_concurrent_sessions_scalability(self, streaming_service, large_audio_data):
-        """Test scalability with multiple concurrent sessions."""
-        
-        with patch('src.asr.transcribers.vosk.VoskTranscriber') as mock_vosk_class:
-            mock_vosk = create_vosk_mock()
-            mock_vosk_class.return_value = mock_vosk
-            
-            session_counts = [1, 5, 10, 20]
-            results = {}
-            
-            for session_count in session_counts:
-                mock_websockets = [MockWebSocket() for _ in range(session_count)]
-                
-                # Measure time for concurrent sessions
-                start_time = time.time()
-                
-                # Create sessions
-                session_tasks = [
-                    streaming_service.create_session(
-                        websocket=ws,
-                        transcriber_type="vosk",
-                        config={"language": "en"}
-                    )
-                    for ws in mock_websockets
-                ]
-                session_ids = await asyncio.gather(*session_tasks)
-                
-                # Process audio concurrently
-                audio_tasks = []
-                chunk_size = 2000
-                
-                for session_id in session_ids:
-                    for i in range(0, min(len(large_audio_data), 8000), chunk_size):
-                        chunk = large_audio_data[i:i + chunk_size]
-                        task = streaming_service.process_audio_chunk(session_id, chunk)
-                        audio_tasks.append(task)
-                
-                await asyncio.gather(*audio_tasks)
-                
-                # Clean up sessions
-                cleanup_tasks = [
-                    streaming_service.close_session(sid) for sid in session_ids
-                ]
-                await asyncio.gather(*cleanup_tasks)
-                
-                end_time = time.time()
-                processing_time = end_time - start_time
-                
-                results[session_count] = {
-                    "processing_time": processing_time,
-                    "sessions": session_count,
-                    "throughput": session_count / processing_time
-                }
-            
-            # Verify scalability
-            assert results[1]["processing_time"] < 3.0  # Single session should be fast
-            assert results[5]["throughput"] > results[1]["throughput"] * 2  # Should scale reasonably
-            
-            # Log results for analysis
-            for count, result in results.items():
-                print(f"Sessions: {count}, Time: {result['processing_time']:.2f}s, "
-                      f"Throughput: {result['throughput']:.2f} sessions/sec")
-    
-    @pytest.mark.asyncio
-    @pytest.mark.benchmark
-    async def test_memory_usage_under_load(self, streaming_service, large_audio_data):
-        """Test memory usage patterns under load."""
-        
-        with patch('src.asr.transcribers.vosk.VoskTranscriber') as mock_vosk_class:
-            mock_vosk = create_vosk_mock()
-            mock_vosk_class.return_value = mock_vosk
-            
-            process = psutil.Process()
-            memory_measurements = []
-            
-            # Baseline memory
-            baseline_memory = process.memory_info().rss / 1024 / 1024  # MB
-            memory_measurements.append(baseline_memory)
-            
-            mock_websockets = [MockWebSocket() for _ in range(10)]
-            
-            # Create sessions and measure memory
-            session_tasks = [
-                streaming_service.create_session(
-                    websocket=ws,
-                    transcriber_type="vosk",
-                    config={"language": "en"}
-                )
-                for ws in mock_websockets
-            ]
-            session_ids = await asyncio.gather(*session_tasks)
-            
-            current_memory = process.memory_info().rss / 1024 / 1024
-            memory_measurements.append(current_memory)
-            
-            # Process audio and measure memory periodically
-            chunk_size = 4000
-            for i in range(0, len(large_audio_data), chunk_size):
-                chunk = large_audio_data[i:i + chunk_size]
-                
-                # Process on all sessions
-                tasks = [
-                    streaming_service.process_audio_chunk(sid, chunk)
-                    for sid in session_ids
-                ]
-                await asyncio.gather(*tasks)
-                
-                # Measure memory every few chunks
-                if i % (chunk_size * 5) == 0:
-                    current_memory = process.memory_info().rss / 1024 / 1024
-                    memory_measurements.append(current_memory)
-            
-            # Clean up and measure final memory
-            cleanup_tasks = [
-                streaming_service.close_session(sid) for sid in session_ids
-            ]
-            await asyncio.gather(*cleanup_tasks)
-            
-            # Force garbage collection
-            import gc
-            gc.collect()
-            await asyncio.sleep(0.1)
-            
-            final_memory = process.memory_info().rss / 1024 / 1024
-            memory_measurements.append(final_memory)
-            
-            # Analyze memory usage
-            max_memory = max(memory_measurements)
-            memory_growth = max_memory - baseline_memory
-            memory_leak = final_memory - baseline_memory
-            
-            print(f"Baseline memory: {baseline_memory:.2f} MB")
-            print(f"Max memory: {max_memory:.2f} MB")
-            print(f"Memory growth: {memory_growth:.2f} MB")
-            print(f"Memory leak: {memory_leak:.2f} MB")
-            
-            # Verify memory constraints
-            assert memory_growth < 200  # Should not use more than 200MB additional
-            assert memory_leak < 50    # Should not leak more than 50MB
-    
-    @pytest.mark.asyncio
-    @pytest.mark.benchmark
-    async def test_latency_distribution(self, streaming_service, large_audio_data):
-        """Test latency distribution for real-time requirements."""
-        
-        with patch('src.asr.transcribers.vosk.VoskTranscriber') as mock_vosk_class:
-            mock_vosk = create_vosk_mock()
-            mock_vosk_class.return_value = mock_vosk
-            
-            mock_websocket = MockWebSocket()
-            
-            # Create session
-            session_id = await streaming_service.create_session(
-                websocket=mock_websocket,
-                transcriber_type="vosk",
-                config={"language": "en"}
+
+# ---------------------------------------------------------------------------
+# Mock engine
+# ---------------------------------------------------------------------------
+
+class SyntheticHandler:
+    """Recogniser stand-in with a fixed CPU cost per second of audio.
+
+    Emits a partial for every chunk and a final every ``SEGMENT_S`` seconds
+    of audio; finals carry ``audio_end`` so latency can be measured.
+    """
+
+    RTF = 0.02
+    SEGMENT_S = 1.0
+
+    def __init__(self, update_queue: Any, **_options: Any) -> None:
+        self.update_queue = update_queue
+        self.audio = 0.0
+        self.segments = 0
+
+    def __call__(self, chunk: bytes) -> None:
+        seconds = len(chunk) / BYTES_PER_SECOND
+        deadline = time.perf_counter() + seconds * self.RTF
+        while time.perf_counter() < deadline:
+            pass
+        self.audio += seconds
+        if self.audio >= (self.segments + 1) * self.SEGMENT_S:
+            self.segments += 1
+            self.update_queue.put(
+                {"type": "final", "is_final": True, "text": f"segment {self.segments}", "audio_end": self.audio}
             )
-            
-            # Measure latency for many chunks
-            latencies = []
-            chunk_size = 2000
-            
-            for i in range(0, min(len(large_audio_data), 20000), chunk_size):
-                chunk = large_audio_data[i:i + chunk_size]
-                
-                start_time = time.time()
-                await streaming_service.process_audio_chunk(session_id, chunk)
-                end_time = time.time()
-                
-                latency_ms = (end_time - start_time) * 1000
-                latencies.append(latency_ms)
-            
-            # Analyze latency distribution
-            mean_latency = statistics.mean(latencies)
-            median_latency = statistics.median(latencies)
-            p95_latency = sorted(latencies)[int(len(latencies) * 0.95)]
-            p99_latency = sorted(latencies)[int(len(latencies) * 0.99)]
-            max_latency = max(latencies)
-            
-            print(f"Latency statistics:")
-            print(f"  Mean: {mean_latency:.2f} ms")
-            print(f"  Median: {median_latency:.2f} ms")
-            print(f"  P95: {p95_latency:.2f} ms")
-            print(f"  P99: {p99_latency:.2f} ms")
-            print(f"  Max: {max_latency:.2f} ms")
-            
-            # Real-time requirements (for streaming audio)
-            assert mean_latency < 500     # Mean latency < 500ms
-            assert p95_latency < 1000     # 95% of requests < 1s
-            assert p99_latency < 2000     # 99% of requests < 2s
-            
-            # Clean up
-            await streaming_service.close_session(session_id)
-    
-    @pytest.mark.asyncio
-    @pytest.mark.benchmark
-    async def test_transcriber_comparison(self, streaming_service, large_audio_data):
-        """Compare performance of different transcribers."""
-        
-        transcribers = [
-            ("vosk", create_vosk_mock()),
-            ("azure_speech", create_azure_speech_mock())
-        ]
-        
-        results = {}
-        
-        for transcriber_name, mock_transcriber in transcribers:
-            patch_path = f'src.asr.transcribers.{transcriber_name}.{transcriber_name.title().replace("_", "")}Transcriber'
-            
-            with patch(patch_path) as mock_class:
-                mock_class.return_value = mock_transcriber
-                
-                mock_websocket = MockWebSocket()
-                
-                # Measure processing time
-                start_time = time.time()
-                
-                session_id = await streaming_service.create_session(
-                    websocket=mock_websocket,
-                    transcriber_type=transcriber_name,
-                    config={"language": "en"}
-                )
-                
-                # Process audio chunks
-                chunk_size = 4000
-                chunks_processed = 0
-                
-                for i in range(0, min(len(large_audio_data), 12000), chunk_size):
-                    chunk = large_audio_data[i:i + chunk_size]
-                    await streaming_service.process_audio_chunk(session_id, chunk)
-                    chunks_processed += 1
-                
-                await streaming_service.close_session(session_id)
-                
-                end_time = time.time()
-                processing_time = end_time - start_time
-                
-                results[transcriber_name] = {
-                    "processing_time": processing_time,
-                    "chunks_processed": chunks_processed,
-                    "throughput": chunks_processed / processing_time
-                }
-        
-        # Compare results
-        for name, result in results.items():
-            print(f"{name}: {result['processing_time']:.2f}s, "
-                  f"Throughput: {result['throughput']:.2f} chunks/sec")
-        
-        # All transcribers should complete in reasonable time
-        for result in results.values():
-            assert result["processing_time"] < 10.0
-            assert result["throughput"] > 0.5
-    
-    @pytest.mark.asyncio
-    @pytest.mark.benchmark
-    async def test_session_lifecycle_performance(self, streaming_service):
-        """Test performance of session creation and cleanup."""
-        
-        with patch('src.asr.transcribers.vosk.VoskTranscriber') as mock_vosk_class:
-            mock_vosk = create_vosk_mock()
-            mock_vosk_class.return_value = mock_vosk
-            
-            # Test rapid session creation/destruction
-            session_count = 100
-            creation_times = []
-            cleanup_times = []
-            
-            for _ in range(session_count):
-                mock_websocket = MockWebSocket()
-                
-                # Measure session creation time
-                start_time = time.time()
-                session_id = await streaming_service.create_session(
-                    websocket=mock_websocket,
-                    transcriber_type="vosk",
-                    config={"language": "en"}
-                )
-                creation_time = time.time() - start_time
-                creation_times.append(creation_time * 1000)  # Convert to ms
-                
-                # Measure session cleanup time
-                start_time = time.time()
-                await streaming_service.close_session(session_id)
-                cleanup_time = time.time() - start_time
-                cleanup_times.append(cleanup_time * 1000)  # Convert to ms
-            
-            # Analyze timing
-            avg_creation_time = statistics.mean(creation_times)
-            avg_cleanup_time = statistics.mean(cleanup_times)
-            max_creation_time = max(creation_times)
-            max_cleanup_time = max(cleanup_times)
-            
-            print(f"Session lifecycle performance:")
-            print(f"  Avg creation time: {avg_creation_time:.2f} ms")
-            print(f"  Max creation time: {max_creation_time:.2f} ms")
-            print(f"  Avg cleanup time: {avg_cleanup_time:.2f} ms")
-            print(f"  Max cleanup time: {max_cleanup_time:.2f} ms")
-            
-            # Performance requirements
-            assert avg_creation_time < 100   # Average creation < 100ms
-            assert max_creation_time < 500   # Max creation < 500ms
-            assert avg_cleanup_time < 50     # Average cleanup < 50ms
-            assert max_cleanup_time < 200    # Max cleanup < 200ms
-
-
-class MockWebSocket:
-    """Mock WebSocket for performance testing."""
-    
-    def __init__(self):
-        self.messages_sent = []
-        self.closed = False
-    
-    async def send_text(self, data: str):
-        """Mock send text."""
-        self.messages_sent.append(data)
-    
-    async def send_bytes(self, data: bytes):
-        """Mock send bytes."""
-        self.messages_sent.append(data)
-    
-    async def close(self):
-        """Mock close."""
-        self.closed = True
-
-
-if __name__ == "__main__":
-    # Run specific performance tests
-    pytest.main([__file__, "-v", "-m", "benchmark", "--benchmark-only"])
\ No newline at end of file
+        else:
+            self.update_queue.put({"type": "partial", "is_final": False, "partial": f"{self.audio:.1f}s", "text": ""})
+
+
+if "bench_synthetic" not in StreamingHandlerFactory._providers:
+    StreamingHandlerFactory.register_provider("bench_synthetic", SyntheticHandler)
+
+
+def _vosk_model_path() -> Optional[str]:
+    try:
+        import vosk  # noqa: F401  # type: ignore
+    except ImportError:
+        return None
+    env = os.environ.get("VOSK_MODEL_PATH")
+    if env and Path(env).is_dir():
+        return env
+    base = Path("app_data/models")
+    models = sorted(p for p in base.iterdir() if p.is_dir()) if base.is_dir() else []
+    return str(models[0]) if models else None
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _speech_pcm(seconds: float, seed: int) -> bytes:
+    np.random.seed(seed)
+    generator = AudioSampleGenerator(RATE)
+    # Repeat short utterances so the envelope does not decay to silence.
+    utterance = generator.generate_speech_like_signal(1.5)
+    pause = generator.generate_silence(0.3)
+    pieces, total = [], 0.0
+    while total < seconds:
+        pieces += [utterance, pause]
+        total += 1.8
+    audio = np.concatenate(pieces)[: int(seconds * RATE)]
+    return (audio * 32767).astype(np.int16).tobytes()
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))]
+
+
+def _rss_mb() -> float:
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:  # pragma: no cover
+        return 0.0
+
+
+def _audio_end(update: dict) -> Optional[float]:
+    """Audio position (s) a final covers: mock ``audio_end`` or Vosk word ends."""
+    if "audio_end" in update:
+        return float(update["audio_end"])
+    words = update.get("words_info") or []
+    ends = [w["end"] for w in words if isinstance(w, dict) and "end" in w]
+    return max(ends) if ends else None
+
+
+@dataclass
+class SessionTrace:
+    """Send times per chunk and receive times per update of one session."""
+
+    sent_audio: List[float] = field(default_factory=list)  # audio end of each chunk (s)
+    sent_at: List[float] = field(default_factory=list)
+    first_partial_ms: Optional[float] = None
+    final_ms: List[float] = field(default_factory=list)
+    finals: int = 0
+
+    def on_send(self, audio_end: float) -> None:
+        self.sent_audio.append(audio_end)
+        self.sent_at.append(time.perf_counter())
+
+    def on_update(self, update: dict) -> None:
+        now = time.perf_counter()
+        if update.get("is_final") or update.get("type") == "final":
+            self.finals += 1
+            end = _audio_end(update)
+            if end is not None and self.sent_audio:
+                # The chunk completing the segment is the first reaching its end.
+                idx = min(bisect.bisect_left(self.sent_audio, end - 1e-6), len(self.sent_at) - 1)
+                self.final_ms.append((now - self.sent_at[idx]) * 1000.0)
+        elif (update.get("type") == "partial" or update.get("is_final") is False) and self.first_partial_ms is None:
+            if self.sent_at:
+                self.first_partial_ms = (now - self.sent_at[0]) * 1000.0
+
+
+async def _pace(started: float, audio_end: float, speed: Optional[float]) -> None:
+    """Wait until a chunk ending at *audio_end* is "captured" at *speed*×."""
+    if speed:
+        delay = started + audio_end / speed - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+            return
+    await asyncio.sleep(0)
+
+
+def _chunks(pcm: bytes):
+    size = BYTES_PER_SECOND * CHUNK_MS // 1000
+    for offset in range(0, len(pcm), size):
+        chunk = pcm[offset : offset + size]
+        yield chunk, (offset + len(chunk)) / BYTES_PER_SECOND
+
+
+async def _service_session(service: AsyncStreamingService, engine: str, options: dict, pcm: bytes, speed) -> SessionTrace:
+    trace = SessionTrace()
+    session_id = await service.start_session(engine, **options)
+
+    async def _read() -> None:
+        async for update in service.updates(session_id):
+            trace.on_update(update)
+
+    reader = asyncio.create_task(_read())
+    started = time.perf_counter()
+    for chunk, audio_end in _chunks(pcm):
+        await _pace(started, audio_end, speed)
+        trace.on_send(audio_end)
+        await service.process_chunk(session_id, chunk)
+    await service.end_session(session_id)
+    await asyncio.wait_for(reader, 30)
+    return trace
+
+
+async def _websocket_session(url: str, pcm: bytes, speed, expected_finals: int) -> SessionTrace:
+    from websockets.asyncio.client import connect
+
+    trace = SessionTrace()
+    async with connect(url, max_size=None) as ws:
+
+        async def _read() -> None:
+            async for message in ws:
+                trace.on_update(json.loads(message))
+                if expected_finals and trace.finals >= expected_finals:
+                    return
+
+        reader = asyncio.create_task(_read())
+        started = time.perf_counter()
+        for chunk, audio_end in _chunks(pcm):
+            await _pace(started, audio_end, speed)
+            trace.on_send(audio_end)
+            await ws.send(chunk)
+        try:
+            await asyncio.wait_for(reader, 10)
+        except asyncio.TimeoutError:
+            reader.cancel()
+    return trace
+
+
+def _summarise(name: str, traces: List[SessionTrace], audio_seconds: float, cpu: float, wall: float, rss_growth: float, **extra: Any) -> dict:
+    finals = [ms for t in traces for ms in t.final_ms]
+    first = [t.first_partial_ms for t in traces if t.first_partial_ms is not None]
+    total_audio = audio_seconds * len(traces)
+    rtf = cpu / total_audio if total_audio else 0.0
+    return {
+        "scenario": name,
+        "sessions": len(traces),
+        "audio_seconds_per_session": audio_seconds,
+        "wall_seconds": wall,
+        "first_partial_p50_ms": _percentile(first, 50),
+        "first_partial_max_ms": max(first) if first else 0.0,
+        "final_count": len(finals),
+        "final_p50_ms": _percentile(finals, 50),
+        "final_p95_ms": _percentile(finals, 95),
+        "final_p99_ms": _percentile(finals, 99),
+        "rtf": rtf,
+        "sessions_per_core": 1.0 / rtf if rtf > 0 else float("inf"),
+        "rss_per_session_mb": rss_growth / len(traces) if traces else 0.0,
+        **extra,
+    }
+
+
+def find_regressions(current: Dict[str, dict], baseline: Dict[str, dict], tolerance: float = TOLERANCE) -> List[str]:
+    """Describe every metric that is worse than *baseline* beyond *tolerance*."""
+    problems = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric, floor in _LOWER_IS_BETTER.items():
+            now, before = result.get(metric), base.get(metric)
+            if now is None or before is None:
+                continue
+            if now > before * (1 + tolerance) and now - before > floor:
+                problems.append(f"{name}: {metric} {before:.3f} → {now:.3f}")
+        for metric in _HIGHER_IS_BETTER:
+            now, before = result.get(metric), base.get(metric)
+            if now is None or before is None or before == float("inf"):
+                continue
+            if now < before * (1 - tolerance):
+                problems.append(f"{name}: {metric} {before:.2f} → {now:.2f}")
+    return problems
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def bench_report(tmp_path_factory):
+    """Collect scenario summaries; write JSON and check the baseline at the end."""
+    results: Dict[str, dict] = {}
+    yield results
+    if not results:
+        return
+    payload = {
+        "host": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "results": results,
+    }
+    out = Path(os.environ.get("STREAMING_BENCH_OUTPUT") or tmp_path_factory.getbasetemp() / "streaming_bench.json")
+    out.write_text(json.dumps(payload, indent=2))
+    print(f"\nStreaming benchmark results written to {out}")
+    for summary in results.values():
+        print(
+            f"  {summary['scenario']}: first partial {summary['first_partial_p50_ms']:.1f} ms, "
+            f"final p50/p95/p99 {summary['final_p50_ms']:.1f}/{summary['final_p95_ms']:.1f}/"
+            f"{summary['final_p99_ms']:.1f} ms, RTF {summary['rtf']:.3f}, "
+            f"{summary['sessions_per_core']:.1f} sessions/core, {summary['rss_per_session_mb']:.2f} MB/session"
+        )
+
+    if os.environ.get("STREAMING_BENCH_UPDATE_BASELINE") == "1":
+        BASELINE_PATH.write_text(json.dumps(payload, indent=2))
+        print(f"Baseline updated: {BASELINE_PATH}")
+        return
+    if not BASELINE_PATH.exists():
+        warnings.warn(
+            f"No streaming baseline at {BASELINE_PATH}; record one with STREAMING_BENCH_UPDATE_BASELINE=1",
+            stacklevel=2,
+        )
+        return
+    regressions = find_regressions(results, json.loads(BASELINE_PATH.read_text()).get("results", {}))
+    if regressions:
+        message = "Streaming performance regressions:\n  " + "\n  ".join(regressions)
+        if os.environ.get("STREAMING_BENCH_STRICT") == "1":
+            pytest.fail(message)
+        warnings.warn(message, stacklevel=2)
+
+
+@pytest.fixture
+def streaming_service():
+    # Admission control would cap concurrency by host size; benchmarks measure
+    # the cost of running every requested session.
+    return AsyncStreamingService(capacity=CapacityModel(policy="off"))
+
+
+def _run_service_scenario(service, engine: str, options: dict, sessions: int, seconds: float, speed) -> tuple:
+    pcms = [_speech_pcm(seconds, seed) for seed in range(sessions)]
+    rss_before = _rss_mb()
+    cpu_before, wall_before = time.process_time(), time.perf_counter()
+
+    async def _all():
+        return await asyncio.gather(*(_service_session(service, engine, options, pcm, speed) for pcm in pcms))
+
+    traces = asyncio.run(_all())
+    cpu, wall = time.process_time() - cpu_before, time.perf_counter() - wall_before
+    return traces, cpu, wall, max(0.0, _rss_mb() - rss_before)
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+class TestStreamingServiceBenchmarks:
+    """Drive the service API directly with mock and Vosk engines."""
+
+    @pytest.mark.parametrize("sessions,speed", [(1, 10.0), (6, 10.0), (6, None)], ids=["1x10", "6x10", "6xmax"])
+    def test_mock_engine_accelerated(self, streaming_service, bench_report, sessions, speed):
+        seconds = 4.0
+        traces, cpu, wall, rss = _run_service_scenario(
+            streaming_service, "bench_synthetic", {}, sessions, seconds, speed
+        )
+        name = f"service_mock_{sessions}x{'max' if speed is None else f'{speed:g}'}"
+        summary = bench_report[name] = _summarise(name, traces, seconds, cpu, wall, rss, speed=speed)
+
+        assert all(t.first_partial_ms is not None for t in traces)
+        assert summary["final_count"] == sessions * int(seconds / SyntheticHandler.SEGMENT_S)
+        # The mock burns RTF × audio on the session thread; overhead must stay modest.
+        assert summary["rtf"] >= SyntheticHandler.RTF * 0.5
+
+    def test_mock_engine_realtime(self, streaming_service, bench_report):
+        seconds = 2.0
+        traces, cpu, wall, rss = _run_service_scenario(streaming_service, "bench_synthetic", {}, 3, seconds, 1.0)
+        summary = bench_report["service_mock_3x1"] = _summarise("service_mock_3x1", traces, seconds, cpu, wall, rss, speed=1.0)
+
+        assert wall >= seconds * 0.9  # paced, not bursted
+        # Real-time pacing: a final is out within a few chunks of its audio.
+        assert summary["final_p95_ms"] < 5 * CHUNK_MS
+
+    def test_vosk_accelerated(self, streaming_service, bench_report):
+        model_path = _vosk_model_path()
+        if model_path is None:
+            pytest.skip("Vosk or a Vosk model is not available")
+        seconds = 6.0
+        traces, cpu, wall, rss = _run_service_scenario(
+            streaming_service, "vosk", {"model_path": model_path}, 2, seconds, 4.0
+        )
+        bench_report["service_vosk_2x4"] = _summarise("service_vosk_2x4", traces, seconds, cpu, wall, rss, speed=4.0)
+        assert all(t.first_partial_ms is not None or t.finals for t in traces)
+
+
+class TestWebsocketBenchmarks:
+    """Drive ``/ws/stream`` on a local uvicorn server."""
+
+    @pytest.fixture
+    def server_url(self, streaming_service, monkeypatch):
+        pytest.importorskip("websockets")
+        uvicorn = pytest.importorskip("uvicorn")
+        from fastapi import FastAPI
+
+        from backend.routers import streaming_ws
+        from src.core.interfaces.streaming_service import IAsyncStreamingService
+
+        monkeypatch.setitem(streaming_ws.container._singletons, IAsyncStreamingService, streaming_service)
+        app = FastAPI()
+        app.include_router(streaming_ws.router)
+
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 10
+        while not server.started:
+            if time.monotonic() > deadline:
+                pytest.fail("uvicorn did not start")
+            time.sleep(0.05)
+        yield f"ws://127.0.0.1:{port}/ws/stream"
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    def test_mock_engine_over_websocket(self, server_url, bench_report):
+        sessions, seconds, speed = 4, 3.0, 10.0
+        pcms = [_speech_pcm(seconds, seed) for seed in range(sessions)]
+        expected = int(seconds / SyntheticHandler.SEGMENT_S)
+        url = f"{server_url}?engine=bench_synthetic&vad=0"
+        rss_before = _rss_mb()
+        cpu_before, wall_before = time.process_time(), time.perf_counter()
+
+        async def _all():
+            return await asyncio.gather(*(_websocket_session(url, pcm, speed, expected) for pcm in pcms))
+
+        traces = asyncio.run(_all())
+        cpu, wall = time.process_time() - cpu_before, time.perf_counter() - wall_before
+        name = f"websocket_mock_{sessions}x{speed:g}"
+        summary = bench_report[name] = _summarise(
+            name, traces, seconds, cpu, wall, max(0.0, _rss_mb() - rss_before), speed=speed
+        )
+
+        assert all(t.finals == expected for t in traces)
+        assert summary["first_partial_p50_ms"] > 0
+
+
+class TestRegressionCheck:
+    """The baseline comparison itself."""
+
+    def test_flags_worse_metrics_only(self):
+        base = {"s": {"final_p95_ms": 100.0, "rtf": 0.10, "sessions_per_core": 10.0, "first_partial_p50_ms": 2.0}}
+        now = {"s": {"final_p95_ms": 140.0, "rtf": 0.11, "sessions_per_core": 7.0, "first_partial_p50_ms": 4.0}}
+        problems = find_regressions(now, base)
+        assert len(problems) == 2
+        assert any("final_p95_ms" in p for p in problems)
+        assert any("sessions_per_core" in p for p in problems)
@@ -0,0 +1,54 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.audio.metrics import AudioQualityMetrics
+
+
+def test_rms_peak_and_dc_match_float_reference():
+    rng = np.random.default_rng(1)
+    chunks = [(rng.standard_normal(1600) * 3000 + 500).astype(np.int16) for _ in range(5)]
+    metrics = AudioQualityMetrics()
+    for chunk in chunks:
+        metrics.update(chunk)
+
+    audio = np.concatenate(chunks).astype(np.float64) / 32768.0
+    summary = metrics.summary()
+    assert summary["rms"] == pytest.approx(math.sqrt(np.mean(audio**2)))
+    assert summary["peak"] == pytest.approx(np.max(np.abs(audio)))
+    assert summary["dc_offset"] == pytest.approx(np.mean(audio))
+    assert summary["samples"] == 8000
+
+
+def test_full_scale_input_does_not_overflow_and_counts_clipping():
+    metrics = AudioQualityMetrics()
+    chunk = np.array([32767, -32768] * 800, dtype=np.int16)
+    rms = metrics.update(chunk)
+
+    assert rms == pytest.approx(1.0, abs=1e-4)
+    assert metrics.summary()["clipping_ratio"] == 1.0
+
+
+def test_histograms_and_rolling_snr():
+    metrics = AudioQualityMetrics(snr_window=20)
+    quiet = np.full(1600, 33, dtype=np.int16)  # ≈ -60 dBFS
+    loud = np.full(1600, 3277, dtype=np.int16)  # ≈ -20 dBFS
+    for _ in range(10):
+        metrics.update(quiet)
+        metrics.update(loud)
+
+    summary = metrics.summary()
+    assert summary["snr_db"] == pytest.approx(40.0, abs=0.2)
+    counts = summary["histograms"]["chunk_rms_dbfs"]["counts"]
+    assert sum(counts) == 20
+    assert sorted(c for c in counts if c) == [10, 10]
+
+
+def test_silent_session_reports_no_dbfs():
+    metrics = AudioQualityMetrics()
+    metrics.update(np.zeros(160, dtype=np.int16))
+
+    summary = metrics.summary()
+    assert summary["rms_dbfs"] is None
+    assert summary["histograms"]["chunk_rms_dbfs"]["counts"][0] == 1
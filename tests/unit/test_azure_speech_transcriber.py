@@ -0,0 +1,152 @@
+import asyncio
+import io
+import threading
+import time
+import wave
+
+import numpy as np
+import pytest
+import requests
+
+from src.asr import transcription
+from src.asr.exceptions import TranscriptionError
+from src.asr.transcript_cache import TranscriptCache
+from src.asr.transcribers.azure_speech import AzureSpeechTranscriber
+from tests.mocks.azure_speech_mock import MockAzureSpeechRecognizer, MockAzureSpeechResponse, create_azure_speech_post
+
+RATE = 16000
+
+
+def _recording(path, parts):
+    """Tones whose amplitude encodes the part number, separated by short pauses."""
+    audio = []
+    for number, seconds in enumerate(parts, start=1):
+        t = np.arange(int(seconds * RATE)) / RATE
+        audio.append((number * 1000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16))
+        audio.append(np.zeros(int(0.1 * RATE), dtype=np.int16))
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(np.concatenate(audio).tobytes())
+    return path
+
+
+def _part_of(wav):
+    with wave.open(io.BytesIO(wav), "rb") as wf:
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2")
+    return int(round(np.abs(samples).max() / 1000))
+
+
+def _ok(text):
+    return MockAzureSpeechResponse(200, {"RecognitionStatus": "Success", "DisplayText": text})
+
+
+class _Endpoint:
+    """Names each chunk by its part number; earlier parts answer more slowly."""
+
+    def __init__(self, statuses=None):
+        self.statuses = dict(statuses or {})  # part → status codes to return first
+        self.calls = []
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, *, data, **_kwargs):
+        part = _part_of(data)
+        with self._lock:
+            self.calls.append(part)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            pending = self.statuses.get(part) or []
+            status = pending.pop(0) if pending else 200
+        try:
+            time.sleep(0.2 / part)
+            if status != 200:
+                return MockAzureSpeechResponse(status, {"error": "busy"})
+            return _ok(f"part{part}")
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _transcriber(post, **kwargs):
+    kwargs.setdefault("max_concurrent", 2)
+    kwargs.setdefault("max_retries", 3)
+    return AzureSpeechTranscriber(
+        "key", "https://speech.example", return_raw=True, chunk_seconds=1.0, backoff_s=0.001, post=post, **kwargs
+    )
+
+
+class TestAzureSpeechChunks:
+    def test_chunks_run_concurrently_and_reassemble_in_order(self, tmp_path):
+        audio = _recording(tmp_path / "visit.wav", [0.8, 0.8, 0.8, 0.8])
+        endpoint = _Endpoint()
+        transcriber = _transcriber(endpoint)
+
+        transcript = asyncio.run(transcriber.transcribe(audio))
+
+        # Later parts answer first, yet the transcript keeps recording order.
+        assert transcript == "part1 part2 part3 part4"
+        assert endpoint.peak == 2
+        results = transcriber.chunk_results
+        assert [r.index for r in results] == [0, 1, 2, 3]
+        assert all(r.attempts == 1 and r.realtime_factor > 0 and r.bytes_sent > 0 for r in results)
+
+    def test_chunks_end_in_pauses(self, tmp_path):
+        audio = _recording(tmp_path / "visit.wav", [0.8, 0.8, 0.8])
+        transcriber = _transcriber(_Endpoint())
+        asyncio.run(transcriber.transcribe(audio))
+        # Each chunk ends in the 0.1 s pause after its tone, not at the 1.0 s limit.
+        assert [round(r.duration_s, 1) for r in transcriber.chunk_results] == [0.9, 0.9, 0.9]
+
+    def test_throttled_chunk_is_retried(self, tmp_path):
+        audio = _recording(tmp_path / "visit.wav", [0.8, 0.8])
+        endpoint = _Endpoint({2: [429, 503]})
+        transcriber = _transcriber(endpoint)
+        assert asyncio.run(transcriber.transcribe(audio)) == "part1 part2"
+        assert [r.attempts for r in transcriber.chunk_results] == [1, 3]
+        assert endpoint.calls.count(2) == 3
+
+    def test_gives_up_after_max_retries(self, tmp_path):
+        audio = _recording(tmp_path / "visit.wav", [0.8, 0.8])
+        endpoint = _Endpoint({1: [500] * 10})
+        transcriber = _transcriber(endpoint, max_retries=2)
+        result = asyncio.run(transcriber.transcribe(audio))
+        assert result.startswith("ERROR: Azure Speech API error (Chunk 1): 500")
+        assert endpoint.calls.count(1) == 3
+
+    def test_client_errors_are_not_retried(self, tmp_path):
+        audio = _recording(tmp_path / "visit.wav", [0.8])
+        endpoint = _Endpoint({1: [400]})
+        assert asyncio.run(_transcriber(endpoint).transcribe(audio)).startswith("ERROR: Azure Speech API error (Chunk 1): 400")
+        assert endpoint.calls == [1]
+
+    def test_with_mock_speech_service(self, tmp_path):
+        audio = _recording(tmp_path / "visit.wav", [0.8, 0.8, 0.8])
+        post = create_azure_speech_post(MockAzureSpeechRecognizer(delay=0.01))
+        transcriber = _transcriber(post, max_concurrent=3)
+        transcript = asyncio.run(transcriber.transcribe(audio))
+        assert transcript and not transcript.startswith("ERROR")
+        assert post.recognizer.recognition_count == 3
+
+    def test_connection_errors_are_reported_and_not_cached(self, tmp_path, monkeypatch):
+        audio = _recording(tmp_path / "visit.wav", [0.8])
+
+        def unreachable(url, **_kwargs):
+            raise requests.ConnectionError("connection refused")
+
+        transcriber = _transcriber(unreachable, max_retries=1)
+        result = asyncio.run(transcriber.transcribe(audio))
+        assert result.startswith("ERROR: Azure Speech request failed (Chunk 1)")
+        assert transcriber.chunk_results[0].attempts == 2
+
+        class _Executor:
+            async def run(self, provider_type, options, audio_path):
+                return await _transcriber(unreachable, max_retries=0).transcribe(audio_path)
+
+        cache = TranscriptCache(tmp_path / "cache", max_bytes=1 << 20)
+        monkeypatch.setattr(transcription, "get_transcription_executor", lambda: _Executor())
+        monkeypatch.setattr(transcription, "get_transcript_cache", lambda: cache)
+        with pytest.raises(TranscriptionError, match="connection refused"):
+            asyncio.run(transcription.transcribe_audio(audio, "azure_speech"))
+        assert cache.stats()["entries"] == 0
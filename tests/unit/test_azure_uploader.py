@@ -0,0 +1,175 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from src.asr.streaming.azure_uploader import AzureUploadWorker
+from src.asr.streaming.handlers.azure_speech import AzureSpeechStreamingHandler
+from tests.mocks.azure_speech_mock import MockAzureSpeechRecognizer, create_azure_speech_post
+
+CHUNK = b"\x01\x00" * 1600  # 0.1 s at 16 kHz
+
+
+def _tracking_post(delay):
+    post = create_azure_speech_post(MockAzureSpeechRecognizer(delay=delay))
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def tracked(url, **kwargs):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        try:
+            return post(url, **kwargs)
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    return tracked, state
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    assert predicate()
+
+
+class TestAzureStreamingUploads:
+    """Windows are posted off the chunk callback with bounded concurrency."""
+
+    def test_chunk_callback_does_not_wait_for_upload(self):
+        post, state = _tracking_post(delay=0.3)
+        uploader = AzureUploadWorker(2, post=post)
+        updates = queue.Queue()
+        handler = AzureSpeechStreamingHandler("key", "https://example", updates, uploader=uploader)
+        handler.last_time = 0  # window due immediately
+
+        started = time.perf_counter()
+        for _ in range(10):
+            handler(CHUNK)
+        assert time.perf_counter() - started < 0.2
+
+        # One request per session while the first is still in flight.
+        assert uploader.stats()["queued"] + uploader.stats()["in_flight"] == 1
+        _wait_for(lambda: uploader.stats()["completed"] == 1)
+        finals = [u for u in list(updates.queue) if u.get("is_final")]
+        assert len(finals) == 1 and finals[0]["text"]
+        uploader.shutdown()
+
+    @pytest.mark.parametrize("limit", [1, 2])
+    def test_global_limit_caps_concurrent_requests(self, limit):
+        post, state = _tracking_post(delay=0.1)
+        uploader = AzureUploadWorker(limit, post=post)
+        handlers = [
+            AzureSpeechStreamingHandler("key", "https://example", queue.Queue(), uploader=uploader)
+            for _ in range(4)
+        ]
+        for handler in handlers:
+            handler.last_time = 0
+            handler(CHUNK)
+
+        _wait_for(lambda: uploader.stats()["completed"] == 4)
+        assert state["peak"] == limit
+        uploader.shutdown()
+
+    def test_http_error_is_reported_to_session(self):
+        post = create_azure_speech_post(MockAzureSpeechRecognizer(fail_probability=1.0, delay=0))
+        uploader = AzureUploadWorker(1, post=post)
+        updates = queue.Queue()
+        handler = AzureSpeechStreamingHandler("key", "https://example", updates, uploader=uploader)
+        handler.last_time = 0
+        handler(CHUNK)
+
+        _wait_for(lambda: uploader.stats()["failed"] == 1)
+        _wait_for(lambda: not handler._inflight)
+        assert any("Azure Error" in u["partial"] for u in list(updates.queue))
+        uploader.shutdown()
+
+
+class TestAzureSegmentMode:
+    """Segments close at pauses, upload once and merge in sequence order."""
+
+    VOICE = (b"\x00\x10" * 1600)  # 0.1 s, well above the silence threshold
+    QUIET = (b"\x00\x00" * 1600)
+
+    def _handler(self, post, **kwargs):
+        uploader = AzureUploadWorker(2, post=post)
+        updates = queue.Queue()
+        handler = AzureSpeechStreamingHandler(
+            "key", "https://example", updates, uploader=uploader, mode="segment", **kwargs
+        )
+        return handler, updates, uploader
+
+    def test_each_span_is_uploaded_once(self):
+        sent = []
+        post = create_azure_speech_post(MockAzureSpeechRecognizer(delay=0))
+
+        def recording_post(url, *, data, **kwargs):
+            sent.append(len(data))
+            return post(url, data=data, **kwargs)
+
+        handler, updates, uploader = self._handler(recording_post)
+        for _ in range(3):  # speech, pause, then 2 s of pure silence
+            for _ in range(12):
+                handler(self.VOICE)
+            for _ in range(5):
+                handler(self.QUIET)
+        for _ in range(20):
+            handler(self.QUIET)
+        handler.close()
+
+        _wait_for(lambda: uploader.stats()["completed"] == 3)
+        # 1.2 s speech + 0.5 s pause per segment, 44-byte WAV header.
+        assert sent == [17 * 3200 + 44] * 3
+        finals = [u for u in list(updates.queue) if u.get("is_final")]
+        assert [u["segment_id"] for u in finals] == [0, 1, 2]
+        uploader.shutdown()
+
+    def test_close_waits_for_trailing_segment(self):
+        post = create_azure_speech_post(MockAzureSpeechRecognizer(delay=0.2))
+        handler, updates, uploader = self._handler(post)
+        for _ in range(5):  # speech still open when the session ends
+            handler(self.VOICE)
+
+        handler.close()
+
+        finals = [u for u in list(updates.queue) if u.get("is_final")]
+        assert [u["segment_id"] for u in finals] == [0]
+        assert uploader.stats()["completed"] == 1
+        uploader.shutdown()
+
+    def test_close_gives_up_after_timeout(self):
+        post = create_azure_speech_post(MockAzureSpeechRecognizer(delay=1.0))
+        handler, updates, uploader = self._handler(post, close_timeout=0.1)
+        handler(self.VOICE)
+
+        started = time.perf_counter()
+        handler.close()
+        assert time.perf_counter() - started < 0.5
+        assert not [u for u in list(updates.queue) if u.get("is_final")]
+        uploader.shutdown()
+
+    def test_max_segment_forces_a_cut(self):
+        post = create_azure_speech_post(MockAzureSpeechRecognizer(delay=0))
+        handler, _updates, uploader = self._handler(post, max_segment=1.0)
+        for _ in range(25):
+            handler(self.VOICE)
+
+        _wait_for(lambda: uploader.stats()["completed"] == 2)
+        assert len(handler.buf) == 5 * 1600
+        uploader.shutdown()
+
+    def test_results_merge_in_sequence_order(self):
+        handler, updates, uploader = self._handler(create_azure_speech_post())
+        success = lambda text: {"RecognitionStatus": "Success", "DisplayText": text}
+
+        handler._on_segment(1, success("second"), None)
+        assert updates.empty()
+        handler._on_segment(0, success("first"), None)
+
+        texts = [updates.get()["delta"] for _ in range(2)]
+        assert texts == ["first", "second"]
+        assert handler.full_transcription == "first second"
+        uploader.shutdown()
@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from src.core.exceptions import CapacityExceededError, ConfigurationError
+from src.core.factories.streaming_factory import StreamingHandlerFactory
+from src.core.services.capacity import CapacityModel, parse_downgrades
+from src.core.services.streaming_service import StreamingService
+
+
+def _model(**kwargs):
+    kwargs.setdefault("cores", 1.0)
+    kwargs.setdefault("target_utilisation", 1.0)
+    kwargs.setdefault("priors", {"vosk": 0.3, "whisper": 0.6})
+    return CapacityModel(**kwargs)
+
+
+class TestCapacityModel:
+    """Budgeting, policies and live RTF estimates."""
+
+    def test_reject_with_retry_after(self):
+        model = _model()
+        for _ in range(3):
+            model.admit("vosk", {})
+        with pytest.raises(CapacityExceededError) as info:
+            model.admit("vosk", {})
+        assert info.value.retry_after > 0
+        assert model.stats()["rejected"] == 1
+
+    def test_lone_session_always_admitted(self):
+        model = _model(cores=0.1)
+        assert model.admit("whisper", {}).profile == "whisper"
+
+    def test_release_frees_capacity(self):
+        model = _model()
+        admissions = [model.admit("vosk", {}) for _ in range(3)]
+        model.release(admissions[0].profile, duration=30.0)
+        assert model.admit("vosk", {}).downgraded_from is None
+        with pytest.raises(CapacityExceededError) as info:
+            model.admit("vosk", {})
+        assert info.value.retry_after == 10.0  # 30 s mean over 3 live sessions
+
+    def test_downgrade_follows_rules(self):
+        rules = parse_downgrades("whisper:base=whisper:tiny, whisper=vosk:/models/small")
+        model = _model(policy="downgrade", downgrades=rules, priors={"whisper:base": 0.6, "whisper:tiny": 0.5})
+        model.admit("whisper", {"model_size": "base"})
+
+        first = model.admit("whisper", {"model_size": "base", "mode": "window"})
+        assert first.engine == "vosk"
+        assert first.options == {"model_path": "/models/small"}
+        assert first.downgraded_from == "whisper:base"
+        assert model.stats()["downgraded"] == 1
+
+    def test_queue_waits_for_release(self):
+        model = _model(policy="queue", queue_timeout=5.0)
+        live = model.admit("whisper", {})
+        threading.Timer(0.1, model.release, args=(live.profile,)).start()
+        started = time.monotonic()
+        assert model.admit("whisper", {}).profile == "whisper"
+        assert 0.05 < time.monotonic() - started < 5.0
+
+    def test_queue_times_out(self):
+        model = _model(policy="queue", queue_timeout=0.05)
+        model.admit("whisper", {})
+        with pytest.raises(CapacityExceededError):
+            model.admit("whisper", {})
+
+    def test_measurements_replace_prior(self):
+        model = _model(alpha=1.0)
+        model.observe("vosk", 5.0, 0.5)
+        assert model.estimate("vosk") == pytest.approx(0.1)
+        # Off-thread work is attributed to the engine's profiles by audio.
+        spent = [0.0]
+        model = _model(alpha=1.0, external_work={"whisper": lambda: spent[0]})
+        spent[0] = 4.0
+        model.observe("whisper:tiny", 5.0, 1.0)
+        assert model.estimate("whisper:tiny") == pytest.approx(1.0)
+
+    def test_invalid_configuration(self):
+        with pytest.raises(ConfigurationError):
+            CapacityModel(policy="maybe")
+        with pytest.raises(ConfigurationError):
+            parse_downgrades("whisper")
+
+
+class _RecordingHandler:
+    def __init__(self, update_queue, **options):
+        self.options = options
+
+    def __call__(self, chunk):
+        pass
+
+
+class TestDowngradedSessions:
+    def test_engine_downgrade_uses_the_default_vosk_model(self, monkeypatch):
+        from src.asr.streaming.websocket import MODEL_DIR
+
+        for engine in ("whisper", "vosk"):
+            monkeypatch.setitem(StreamingHandlerFactory._providers, engine, _RecordingHandler)
+        model = _model(policy="downgrade", downgrades=parse_downgrades("whisper=vosk"))
+        service = StreamingService(capacity=model)
+        service.start_session("whisper", vad=False)
+
+        downgraded = service.start_session("whisper", vad=False)
+
+        handler = service._get_session(downgraded)["handler"]
+        assert handler.options == {"model_path": str(MODEL_DIR)}
+        service.end_session(downgraded)
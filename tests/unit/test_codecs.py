@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from src.audio.codecs import AudioDecoder, PolyphaseResampler, alaw_decode, ulaw_decode
+from src.core.exceptions import ConfigurationError
+
+
+def _tone(rate, seconds=0.5, freq=440.0, amplitude=0.3):
+    t = np.arange(int(seconds * rate)) / rate
+    return (amplitude * 32767 * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+class TestG711:
+    """Table decoding against ITU-T G.711 reference values."""
+
+    def test_ulaw_reference_values(self):
+        out = ulaw_decode(bytes([0xFF, 0x7F, 0x00, 0x80]))
+        assert out.tolist() == [0, 0, -32124, 32124]
+
+    def test_alaw_reference_values(self):
+        out = alaw_decode(bytes([0xD5, 0x55, 0xAA, 0x2A]))
+        assert out.tolist() == [8, -8, 32256, -32256]
+
+
+class TestPolyphaseResampler:
+    """Rate conversion is chunk-invariant and preserves the signal."""
+
+    @pytest.mark.parametrize("in_rate", [8000, 44100, 48000])
+    def test_chunked_matches_one_shot(self, in_rate):
+        tone = _tone(in_rate)
+        whole = PolyphaseResampler(in_rate, 16000).process(tone)
+
+        streamed = PolyphaseResampler(in_rate, 16000)
+        parts = [streamed.process(tone[i : i + 333]) for i in range(0, len(tone), 333)]
+        assert np.array_equal(np.concatenate(parts), whole)
+        assert abs(len(whole) - len(tone) * 16000 // in_rate) <= 1
+
+    def test_tone_frequency_preserved(self):
+        out = PolyphaseResampler(48000, 16000).process(_tone(48000, seconds=1.0))
+        spectrum = np.abs(np.fft.rfft(out[1000:].astype(np.float64)))
+        peak_hz = np.argmax(spectrum) * 16000 / len(out[1000:])
+        assert abs(peak_hz - 440.0) < 2.0
+
+
+class TestAudioDecoder:
+    """Per-connection decoding to 16-kHz s16le."""
+
+    def test_pcm_passthrough_is_identity(self):
+        dec = AudioDecoder()
+        assert dec.passthrough
+        assert dec.decode(b"\x01\x02\x03") == b"\x01\x02\x03"
+
+    def test_pcm_resampled_keeps_odd_byte(self):
+        dec = AudioDecoder("pcm", 8000)
+        raw = _tone(8000, seconds=0.1).tobytes()
+        out = dec.decode(raw[:101]) + dec.decode(raw[101:])
+        assert abs(len(out) // 2 - 1600) <= 1
+
+    def test_mulaw_at_8k_is_upsampled(self):
+        dec = AudioDecoder.from_params({"codec": "ulaw", "rate": "8000"})
+        out = dec.decode(bytes([0xFF]) * 800)
+        assert len(out) == 1600 * 2
+        assert dec.stats()["compression_ratio"] == pytest.approx(4.0)
+
+    def test_rejects_unknown_codec_and_bad_rate(self):
+        with pytest.raises(ConfigurationError):
+            AudioDecoder("mp3")
+        with pytest.raises(ConfigurationError):
+            AudioDecoder.from_params({"codec": "alaw", "rate": "fast"})
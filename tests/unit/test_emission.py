@@ -0,0 +1,45 @@
+from src.asr.streaming.emission import EmissionPolicy
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEmissionPolicy:
+    """Change-only, rate-limited partials and numbered finals."""
+
+    def test_unchanged_partials_are_suppressed(self):
+        policy = EmissionPolicy(min_interval=0, clock=_Clock())
+
+        assert [policy.accept_partial(t) for t in ("he", "he", "hello", "hello")] == [
+            True,
+            False,
+            True,
+            False,
+        ]
+        assert policy.stats() == {"partials_seen": 4, "partials_emitted": 2, "finals": 0}
+
+    def test_partials_respect_min_interval(self):
+        clock = _Clock()
+        policy = EmissionPolicy(min_interval=0.2, clock=clock)
+
+        assert policy.accept_partial("a")
+        clock.now = 0.1
+        assert not policy.accept_partial("ab")
+        clock.now = 0.25
+        assert policy.accept_partial("abc")
+
+    def test_final_assigns_segment_ids_and_resets_partial_state(self):
+        clock = _Clock()
+        policy = EmissionPolicy(min_interval=1.0, clock=clock)
+        policy.accept_partial("same")
+
+        assert policy.accept_final() == 0
+        assert policy.next_segment_id == 1
+        # A new segment's first partial is sent even inside the interval.
+        assert policy.accept_partial("same")
+        assert policy.accept_final() == 1
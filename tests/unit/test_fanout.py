@@ -0,0 +1,108 @@
+import threading
+
+from src.audio.fanout import FanoutRing
+
+
+def _block(i, size=100):
+    return bytes([i % 256]) * size
+
+
+class TestFanoutRing:
+    def test_each_cursor_reads_everything_independently(self):
+        ring = FanoutRing(1000)
+        fast, slow = ring.cursor("fast"), ring.cursor("slow")
+        for i in range(5):
+            ring.write(_block(i))
+            assert fast.read(timeout=0) == _block(i)
+        assert slow.lag_bytes == 500
+        assert slow.read(timeout=0) == b"".join(_block(i) for i in range(5))
+        assert slow.stats()["max_lag_bytes"] == 500
+        assert fast.stats()["max_lag_bytes"] == 100
+
+    def test_cursor_only_sees_data_after_registration(self):
+        ring = FanoutRing(1000)
+        ring.write(b"old")
+        cursor = ring.cursor("late")
+        ring.write(b"new")
+        assert cursor.read(timeout=0) == b"new"
+
+    def test_lapped_consumer_skips_and_counts_drops(self):
+        ring = FanoutRing(300, bytes_per_second=100)
+        cursor = ring.cursor("asr")
+        for i in range(5):
+            ring.write(_block(i))
+        assert cursor.read(timeout=0) == _block(2) + _block(3) + _block(4)
+        stats = cursor.stats()
+        assert stats["dropped_bytes"] == 200
+        assert stats["max_lag_seconds"] == 5.0
+        assert stats["lag_bytes"] == 0
+
+    def test_wrap_around_and_max_bytes(self):
+        ring = FanoutRing(250)
+        cursor = ring.cursor("c")
+        ring.write(_block(1))
+        ring.write(_block(2))
+        assert cursor.read(timeout=0) == _block(1) + _block(2)
+        ring.write(_block(3))  # wraps the end of the storage
+        assert cursor.read(max_bytes=60, timeout=0) == _block(3, 60)
+        assert cursor.read(timeout=0) == _block(3, 40)
+
+    def test_oversized_write_keeps_newest_bytes(self):
+        ring = FanoutRing(100)
+        cursor = ring.cursor("c")
+        ring.write(bytes(range(150)))
+        assert cursor.read(timeout=0) == bytes(range(50, 150))
+        assert cursor.dropped_bytes == 50
+
+    def test_close_wakes_blocked_reader_after_drain(self):
+        ring = FanoutRing(1000)
+        cursor = ring.cursor("c")
+        got = []
+
+        def consume():
+            while True:
+                data = cursor.read(timeout=5)
+                if not data:
+                    return
+                got.append(data)
+
+        thread = threading.Thread(target=consume)
+        thread.start()
+        ring.write(b"abc")
+        ring.close()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert b"".join(got) == b"abc"
+
+    def test_detached_cursor_leaves_stats(self):
+        ring = FanoutRing(100)
+        cursor = ring.cursor("meter")
+        assert set(ring.stats()) == {"meter"}
+        cursor.close()
+        assert ring.stats() == {}
+
+    def test_bytes_overwritten_by_unpublished_write_are_dropped(self):
+        ring = FanoutRing(8)
+        cursor = ring.cursor("slow")
+        ring.write(b"abcdefgh")
+        copied, resume = threading.Event(), threading.Event()
+
+        class _PausingBuffer(bytearray):
+            """Holds the producer between its copy and publishing ``written``."""
+
+            def __setitem__(self, index, value):
+                super().__setitem__(index, value)
+                copied.set()
+                resume.wait(5)
+
+        ring._buf = _PausingBuffer(ring._buf)
+        producer = threading.Thread(target=ring.write, args=(b"XY",))
+        producer.start()
+        copied.wait(5)
+        assert ring.written == 8
+        data = cursor.read(timeout=0)
+        resume.set()
+        producer.join(5)
+        assert data == b"cdefgh"
+        assert cursor.dropped_bytes == 2
+        assert cursor.read(timeout=0) == b"XY"
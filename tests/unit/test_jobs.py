@@ -0,0 +1,181 @@
+import asyncio
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from src.asr.jobs import JobRunner, JobStore, next_cut
+
+RATE = 16000
+
+
+def _write_wav(path, seconds, *, pause_at=()):
+    t = np.arange(int(seconds * RATE)) / RATE
+    audio = 0.3 * np.sin(2 * np.pi * 220 * t)
+    for at in pause_at:
+        audio[int(at * RATE) : int((at + 0.1) * RATE)] = 0.0
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes((audio * 32767).astype("<i2").tobytes())
+    return path
+
+
+class _SegmentExecutor:
+    """Stands in for the transcription executor: reports each segment's span."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def run(self, provider_type, options, audio_path):
+        with wave.open(str(audio_path), "rb") as wav:
+            seconds = wav.getnframes() / wav.getframerate()
+        self.calls.append(round(seconds, 2))
+        await asyncio.sleep(self.delay)
+        return f"[{seconds:.2f}s]"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    yield store
+    store.close()
+
+
+class TestJobStore:
+    def test_claims_by_priority_then_age(self, store, tmp_path):
+        low = store.create(tmp_path / "a.wav", "vosk")
+        high = store.create(tmp_path / "b.wav", "vosk", priority=5)
+        later = store.create(tmp_path / "c.wav", "vosk")
+        assert [store.claim().id for _ in range(3)] == [high.id, low.id, later.id]
+        assert store.claim() is None
+        assert store.get(high.id).attempts == 1
+
+    def test_jobs_survive_reopen_and_resume(self, store, tmp_path):
+        job = store.create(tmp_path / "a.wav", "vosk")
+        store.claim()
+        store.update_progress(job.id, 30.0, "first part", 90.0)
+        store.close()
+
+        reopened = JobStore(tmp_path / "jobs.sqlite3")
+        assert reopened.requeue_interrupted() == 1
+        resumed = reopened.claim()
+        assert (resumed.id, resumed.progress_s, resumed.transcript, resumed.attempts) == (job.id, 30.0, "first part", 2)
+        assert resumed.to_dict()["progress"] == pytest.approx(1 / 3)
+        reopened.close()
+
+    def test_cancel_only_unfinished(self, store, tmp_path):
+        job = store.create(tmp_path / "a.wav", "vosk")
+        assert store.cancel(job.id)
+        assert not store.cancel(job.id)
+        assert store.claim() is None
+        assert store.counts() == {"cancelled": 1}
+
+
+class TestNextCut:
+    def test_cuts_in_the_pause_near_the_boundary(self):
+        t = np.arange(3 * RATE) / RATE
+        samples = (10000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+        samples[int(2.2 * RATE) : int(2.3 * RATE)] = 0
+        cut = next_cut(samples, RATE, final=False)
+        assert 2.2 * RATE <= cut <= 2.3 * RATE
+
+    def test_final_segment_is_kept_whole(self):
+        samples = np.ones(RATE, dtype=np.int16)
+        assert next_cut(samples, RATE, final=True) == RATE
+
+
+class TestJobRunner:
+    def test_process_reports_progress_per_segment(self, store, tmp_path):
+        (tmp_path / "job").mkdir()
+        audio = _write_wav(tmp_path / "job" / "input.wav", 2.5, pause_at=(0.9,))
+        executor = _SegmentExecutor()
+        runner = JobRunner(store, segment_seconds=1.0, executor=executor)
+        job = store.create(audio, "vosk")
+        seen = []
+        original = store.update_progress
+
+        def record(job_id, progress_s, transcript, duration_s=None):
+            seen.append((round(progress_s, 2), transcript))
+            original(job_id, progress_s, transcript, duration_s)
+
+        store.update_progress = record
+        asyncio.run(runner.process(store.claim()))
+
+        done = store.get(job.id)
+        assert done.status == "completed"
+        assert done.duration_s == pytest.approx(2.5)
+        assert done.progress_s == pytest.approx(2.5)
+        assert sum(executor.calls) == pytest.approx(2.5, abs=0.01)
+        # The first cut lands in the pause rather than at exactly 1.0 s.
+        assert 0.9 <= executor.calls[0] <= 1.0
+        assert done.transcript == " ".join(f"[{c:.2f}s]" for c in executor.calls)
+        assert [p for p, _ in seen][1:] == sorted(p for p, _ in seen[1:])
+        assert not audio.parent.exists()  # uploaded audio removed once done
+
+    def test_resume_skips_processed_audio(self, store, tmp_path):
+        (tmp_path / "job").mkdir()
+        audio = _write_wav(tmp_path / "job" / "input.wav", 3.0)
+        executor = _SegmentExecutor()
+        runner = JobRunner(store, segment_seconds=1.0, executor=executor)
+        job = store.create(audio, "vosk")
+        store.claim()
+        store.update_progress(job.id, 2.0, "earlier", 3.0)
+        asyncio.run(runner.process(store.get(job.id)))
+        assert executor.calls == [pytest.approx(1.0)]
+        assert store.get(job.id).transcript == "earlier [1.00s]"
+
+    def test_workers_run_jobs_and_record_failures(self, store, tmp_path):
+        (tmp_path / "job").mkdir()
+        (tmp_path / "bad").mkdir()
+        good = store.create(_write_wav(tmp_path / "job" / "input.wav", 0.5), "vosk")
+        bad = store.create(tmp_path / "bad" / "missing.wav", "vosk", priority=1)
+        runner = JobRunner(store, workers=1, segment_seconds=1.0, executor=_SegmentExecutor(), poll_interval=0.05)
+
+        async def _run():
+            runner.start()
+            deadline = time.monotonic() + 5
+            while not (store.get(good.id).done and store.get(bad.id).done) and time.monotonic() < deadline:
+                await asyncio.sleep(0.02)
+            await runner.stop()
+
+        asyncio.run(_run())
+        assert store.get(good.id).status == "completed"
+        assert store.get(bad.id).status == "failed"
+        assert store.get(bad.id).error
+        assert not (tmp_path / "bad").exists()
+
+    def test_job_interrupted_too_often_fails(self, store, tmp_path):
+        (tmp_path / "job").mkdir()
+        job = store.create(_write_wav(tmp_path / "job" / "input.wav", 0.5), "vosk")
+        runner = JobRunner(store, max_attempts=2)
+        for _ in range(2):  # claimed, then the process died
+            store.claim()
+            store.requeue_interrupted()
+        store.claim()
+
+        async def _start():
+            runner.start()
+            await runner.stop()
+
+        asyncio.run(_start())
+        failed = store.get(job.id)
+        assert (failed.status, failed.error) == ("failed", "Interrupted 3 times; giving up")
+        assert not (tmp_path / "job").exists()
+
+    def test_cancel_during_last_segment_removes_upload(self, store, tmp_path):
+        (tmp_path / "job").mkdir()
+        audio = _write_wav(tmp_path / "job" / "input.wav", 0.5)
+        job = store.create(audio, "vosk")
+
+        class _CancellingExecutor(_SegmentExecutor):
+            async def run(self, provider_type, options, audio_path):
+                store.cancel(job.id)
+                return await super().run(provider_type, options, audio_path)
+
+        asyncio.run(JobRunner(store, segment_seconds=1.0, executor=_CancellingExecutor()).process(store.claim()))
+        assert store.get(job.id).status == "cancelled"
+        assert not audio.parent.exists()
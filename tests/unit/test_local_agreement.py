@@ -0,0 +1,140 @@
+import asyncio
+import queue
+import time
+
+from src.asr.streaming.handlers import whisper as whisper_handler
+from src.asr.streaming.local_agreement import LocalAgreement, Word
+from src.core.factories.streaming_factory import StreamingHandlerFactory
+from src.core.services.async_streaming_service import AsyncStreamingService
+from src.core.services.capacity import CapacityModel
+
+
+def _words(*items):
+    return [Word(start, start + 0.4, text) for start, text in items]
+
+
+class TestLocalAgreement:
+    """Commit policy used by the incremental Whisper streaming mode."""
+
+    def test_first_hypothesis_commits_nothing(self):
+        agreement = LocalAgreement()
+        assert agreement.update(_words((0.0, " the"), (0.5, " patient"))) == []
+        assert LocalAgreement.join(agreement.pending) == "the patient"
+
+    def test_agreed_prefix_is_committed_once(self):
+        agreement = LocalAgreement()
+        agreement.update(_words((0.0, " the"), (0.5, " patient"), (1.0, " has")))
+        committed = agreement.update(
+            _words((0.0, " The"), (0.5, " patient"), (1.0, " had"), (1.5, " a"))
+        )
+
+        assert LocalAgreement.join(committed) == "The patient"
+        assert agreement.committed_text() == "The patient"
+        assert LocalAgreement.join(agreement.pending) == "had a"
+
+    def test_words_behind_committed_frontier_are_ignored(self):
+        agreement = LocalAgreement()
+        agreement.update(_words((0.0, " chest"), (0.5, " pain")))
+        agreement.update(_words((0.0, " chest"), (0.5, " pain")))
+
+        # Re-decoded audio repeats the committed words before new ones.
+        agreement.update(_words((0.5, " pain"), (1.0, " since"), (1.5, " monday")))
+        committed = agreement.update(_words((1.0, " since"), (1.5, " monday")))
+
+        assert agreement.committed_text() == "chest pain since monday"
+        assert LocalAgreement.join(committed) == "since monday"
+
+    def test_flush_commits_remaining_hypothesis(self):
+        agreement = LocalAgreement()
+        agreement.update(_words((0.0, " no"), (0.5, " allergies")))
+        assert LocalAgreement.join(agreement.flush()) == "no allergies"
+        assert agreement.pending == []
+
+
+class _Model:
+    """Hears "no known" in the buffered audio, then "allergies" once more arrives."""
+
+    def transcribe(self, audio, **_kwargs):
+        spoken = [(0.0, " no"), (0.5, " known"), (1.0, " allergies")][: 2 if len(audio) < 24000 else 3]
+        return {"segments": [{"words": [{"start": s, "end": s + 0.4, "word": w} for s, w in spoken]}]}
+
+
+class _Lease:
+    def __init__(self):
+        self.model = _Model()
+        self.released = False
+
+    def release(self):
+        self.released = True
+
+
+class _Registry:
+    def __init__(self, lease):
+        self.lease = lease
+
+    def acquire(self, engine, model, device="cpu"):
+        return self.lease
+
+
+class TestWhisperLocalAgreementClose:
+    def test_close_commits_pending_words(self, monkeypatch):
+        lease = _Lease()
+        monkeypatch.setattr(whisper_handler, "get_model_registry", lambda: _Registry(lease))
+        updates = queue.Queue()
+        handler = whisper_handler.WhisperStreamingHandler("tiny", updates, mode="local_agreement")
+        handler.buf.append(b"\x00" * 32000)
+        handler._decode_now()  # first hypothesis: nothing agreed yet
+        handler.buf.append(b"\x00" * 16000)
+
+        handler.close()
+
+        finals = [u for u in list(updates.queue) if u["type"] == "final"]
+        assert finals[-1]["text"] == "no known allergies"
+        assert lease.released
+
+
+class _SlowClosingHandler:
+    """Decodes its tail on close, like the local-agreement Whisper handler."""
+
+    def __init__(self, update_queue, **_):
+        self.update_queue = update_queue
+
+    def __call__(self, chunk):
+        pass
+
+    def close(self):
+        time.sleep(0.3)
+        self.update_queue.put({"type": "final", "text": "tail"})
+
+
+if "slow_close" not in StreamingHandlerFactory._providers:
+    StreamingHandlerFactory.register_provider("slow_close", _SlowClosingHandler)
+
+
+class TestCloseTimeDecode:
+    def test_end_session_keeps_loop_free_and_delivers_tail(self):
+        service = AsyncStreamingService(capacity=CapacityModel(policy="off"))
+
+        async def scenario():
+            sid = await service.start_session("slow_close", vad=False)
+            reader = asyncio.create_task(_drain(service, sid))
+            await asyncio.sleep(0)  # the reader subscribes
+            ticks = []
+
+            async def ticker():
+                while True:
+                    ticks.append(time.monotonic())
+                    await asyncio.sleep(0.02)
+
+            clock = asyncio.create_task(ticker())
+            await service.end_session(sid)
+            clock.cancel()
+            return len(ticks), await asyncio.wait_for(reader, 5)
+
+        ticks, updates = asyncio.run(scenario())
+        assert ticks > 5  # the loop kept running during the close
+        assert [u["type"] for u in updates] == ["final", "metrics"]
+
+
+async def _drain(service, session_id):
+    return [u async for u in service.updates(session_id)]
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from src.asr.model_registry import ModelRegistry
+from src.core.exceptions import ModelLoadError
+
+
+@pytest.fixture
+def registry():
+    reg = ModelRegistry(budget_bytes=250)
+    loads: list[str] = []
+
+    def _loader(model: str, device: str):
+        loads.append(model)
+        time.sleep(0.01)
+        return {"name": model, "device": device}
+
+    reg.register_loader("fake", _loader, lambda _m, _name: 100)
+    reg.loads = loads  # type: ignore[attr-defined]
+    return reg
+
+
+class TestModelRegistry:
+    """Sharing, reference counting and eviction of ASR models."""
+
+    def test_second_acquire_reuses_loaded_model(self, registry):
+        with registry.acquire("fake", "a") as first:
+            with registry.acquire("fake", "a") as second:
+                assert first is second
+
+        stats = registry.stats()
+        assert registry.loads == ["a"]
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.5)
+
+    def test_concurrent_acquires_share_one_load(self, registry):
+        leases = []
+        threads = [
+            threading.Thread(target=lambda: leases.append(registry.acquire("fake", "a")))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert registry.loads == ["a"]
+        assert len({id(lease.model) for lease in leases}) == 1
+
+    def test_idle_models_evicted_lru_over_budget(self, registry):
+        for name in ("a", "b"):
+            registry.acquire("fake", name).release()
+        in_use = registry.acquire("fake", "c")
+
+        # 300 bytes resident > 250 budget → least recently used idle model goes
+        resident = {m["model"] for m in registry.stats()["models"]}
+        assert resident == {"b", "c"}
+        assert registry.stats()["evictions"] == 1
+        in_use.release()
+
+    def test_referenced_models_are_never_evicted(self, registry):
+        leases = [registry.acquire("fake", name) for name in ("a", "b", "c")]
+
+        assert len(registry.stats()["models"]) == 3
+        for lease in leases:
+            lease.release()
+        assert registry.stats()["resident_bytes"] <= 250
+
+    def test_failed_load_raises_and_can_retry(self):
+        reg = ModelRegistry()
+        attempts = []
+
+        def _flaky(model, _device):
+            attempts.append(model)
+            if len(attempts) == 1:
+                raise RuntimeError("disk hiccup")
+            return object()
+
+        reg.register_loader("flaky", _flaky)
+        with pytest.raises(ModelLoadError):
+            reg.acquire("flaky", "m")
+        assert reg.acquire("flaky", "m").model is not None
+
+    def test_preload_pins_model(self, registry):
+        registry.preload("fake", "pinned", pin=True).result(timeout=2)
+        for name in ("x", "y", "z"):
+            registry.acquire("fake", name).release()
+
+        assert "pinned" in {m["model"] for m in registry.stats()["models"]}
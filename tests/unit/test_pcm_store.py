@@ -0,0 +1,129 @@
+import io
+import os
+import struct
+import threading
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from src.audio import audio_processing
+from src.audio.pcm_store import DecodedAudio, PCMStore
+
+
+def _write_wav(path, samples, *, rate=16000, channels=1):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(np.asarray(samples, dtype="<i2").tobytes())
+    return path
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Replace ffmpeg: take the left channel of 8 kHz stereo and upsample by 2."""
+    calls = []
+
+    def fake_convert(in_path, out_path=None):
+        calls.append(in_path)
+        with wave.open(str(in_path), "rb") as wf:
+            stereo = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2").reshape(-1, 2)
+        _write_wav(out_path, np.repeat(stereo[:, 0], 2))
+        return str(out_path)
+
+    monkeypatch.setattr(audio_processing, "convert_to_wav", fake_convert)
+    return calls
+
+
+def _stereo_8k(path, seconds=0.5, seed=0):
+    left = np.random.default_rng(seed).integers(-3000, 3000, int(8000 * seconds))
+    return _write_wav(path, np.stack([left, -left], axis=1).ravel(), rate=8000, channels=2), left
+
+
+class TestDecodedAudio:
+    def test_canonical_wav_is_mapped_in_place(self, tmp_path, decodes):
+        samples = np.arange(-500, 500, dtype="<i2")
+        src = _write_wav(tmp_path / "in.wav", samples)
+        store = PCMStore(tmp_path / "pcm")
+        audio = store.open(src)
+        assert isinstance(audio.samples, np.memmap)
+        assert audio.path == src
+        np.testing.assert_array_equal(audio.samples, samples)
+        assert audio.duration == pytest.approx(len(samples) / 16000)
+        assert not decodes and not (tmp_path / "pcm").exists()
+        assert store.stats()["direct"] == 1
+
+    def test_data_chunk_after_extra_chunks(self, tmp_path):
+        samples = np.arange(100, dtype="<i2")
+        body = (
+            b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, 16000, 32000, 2, 16)
+            + b"LIST" + struct.pack("<I", 5) + b"abcde\0"  # odd size → pad byte
+            + b"data" + struct.pack("<I", samples.nbytes) + samples.tobytes()
+        )
+        path = tmp_path / "odd.wav"
+        path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+        np.testing.assert_array_equal(DecodedAudio.map(path).samples, samples)
+
+    def test_slices_round_trip_as_wav(self, tmp_path):
+        samples = np.arange(1000, dtype="<i2")
+        audio = DecodedAudio.map(_write_wav(tmp_path / "in.wav", samples))
+        with wave.open(io.BytesIO(audio.wav_bytes(100, 300)), "rb") as wf:
+            assert (wf.getnchannels(), wf.getsampwidth(), wf.getframerate()) == (1, 2, 16000)
+            np.testing.assert_array_equal(np.frombuffer(wf.readframes(1000), dtype="<i2"), samples[100:300])
+        part = DecodedAudio.map(audio.write_wav(tmp_path / "part.wav", 900))
+        np.testing.assert_array_equal(part.samples, samples[900:])
+
+
+class TestPCMStore:
+    def test_other_formats_are_decoded_once(self, tmp_path, decodes):
+        src, left = _stereo_8k(tmp_path / "in.wav")
+        copy = tmp_path / "reupload.wav"
+        copy.write_bytes(src.read_bytes())
+        store = PCMStore(tmp_path / "pcm")
+        first = store.open(src)
+        # Another process (another engine's worker) sees the same entry.
+        second = PCMStore(tmp_path / "pcm").open(copy)
+        assert len(decodes) == 1
+        assert first.path == second.path and first.path.parent == tmp_path / "pcm"
+        np.testing.assert_array_equal(second.samples, np.repeat(left, 2))
+        assert sorted(p.suffix for p in (tmp_path / "pcm").iterdir()) == [".wav"]
+
+    def test_concurrent_opens_share_one_decode(self, tmp_path, decodes):
+        src, _left = _stereo_8k(tmp_path / "in.wav")
+        store = PCMStore(tmp_path / "pcm")
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(store.open(src).path)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(decodes) == 1 and len(set(results)) == 1
+        assert store.stats()["hits"] == 3
+        assert not store._key_locks
+
+    def test_evicts_least_recently_used(self, tmp_path, decodes):
+        inputs = [_stereo_8k(tmp_path / f"in{i}.wav", seed=i)[0] for i in range(3)]
+        store = PCMStore(tmp_path / "pcm")
+        entries = [store.open(path).path for path in inputs[:2]]
+        store.max_bytes = 2 * entries[0].stat().st_size + 1
+        store.open(inputs[0])  # refresh: in1 is now the oldest
+        store.open(inputs[2])
+        assert [p.exists() for p in entries] == [True, False]
+        assert store.stats()["evictions"] == 1
+
+    def test_expires_entries_unused_past_ttl(self, tmp_path, decodes):
+        inputs = [_stereo_8k(tmp_path / f"in{i}.wav", seed=i)[0] for i in range(2)]
+        store = PCMStore(tmp_path / "pcm", ttl_seconds=3600)
+        stale = store.open(inputs[0]).path
+        old = time.time() - 7200
+        os.utime(stale, (old, old))
+        fresh = store.open(inputs[1]).path
+        assert not stale.exists() and fresh.exists()
+        assert store.stats()["expired"] == 1
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            PCMStore(tmp_path / "pcm").open(tmp_path / "nope.wav")
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.asr.streaming.recognition_pool import ChunkQueue, OverloadPolicy, _Worker
+
+
+class TestChunkQueue:
+    """Overload policies of the bounded websocket → worker chunk queue."""
+
+    @pytest.mark.asyncio
+    async def test_drop_policy_counts_discarded_chunks(self):
+        q = ChunkQueue(maxsize=2, policy=OverloadPolicy.DROP)
+        for chunk in (b"a", b"b", b"cc"):
+            await q.put(chunk)
+
+        assert len(q) == 2
+        assert q.dropped_chunks == 1
+        assert q.dropped_bytes == 2
+        assert await q.get() == b"a"
+
+    @pytest.mark.asyncio
+    async def test_coalesce_policy_merges_pending_audio(self):
+        q = ChunkQueue(maxsize=2, policy=OverloadPolicy.COALESCE)
+        for chunk in (b"a", b"b", b"c"):
+            await q.put(chunk)
+
+        assert len(q) == 1
+        assert await q.get() == b"abc"
+        assert q.coalesced_chunks == 2
+
+    @pytest.mark.asyncio
+    async def test_block_policy_waits_for_consumer(self):
+        q = ChunkQueue(maxsize=1, policy=OverloadPolicy.BLOCK)
+        await q.put(b"a")
+        blocked = asyncio.create_task(q.put(b"b"))
+        await asyncio.sleep(0)
+        assert not blocked.done()
+
+        assert await q.get() == b"a"
+        await asyncio.wait_for(blocked, timeout=1)
+        assert await q.get() == b"b"
+
+    @pytest.mark.asyncio
+    async def test_close_drains_then_returns_none(self):
+        q = ChunkQueue(maxsize=4)
+        await q.put(b"a")
+        q.close()
+
+        assert await q.get() == b"a"
+        assert await q.get() is None
+
+    def test_parse_unknown_policy_falls_back_to_block(self):
+        assert OverloadPolicy.parse("bogus") is OverloadPolicy.BLOCK
+        assert OverloadPolicy.parse("DROP") is OverloadPolicy.DROP
+
+
+class TestWorker:
+    def test_failing_callback_does_not_kill_the_thread(self):
+        worker = _Worker(0)
+        delivered = threading.Event()
+
+        def closed_loop(result, error):
+            raise RuntimeError("Event loop is closed")
+
+        try:
+            worker.submit(("close", "gone", None, closed_loop))
+            worker.submit(("close", "alive", None, lambda result, error: delivered.set()))
+            assert delivered.wait(5)
+        finally:
+            worker.stop()
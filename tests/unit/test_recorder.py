@@ -0,0 +1,114 @@
+import threading
+import time
+import wave
+
+import pytest
+
+recorder_mod = pytest.importorskip("src.audio.recorder")
+
+
+class _FakeStream:
+    """Calls the stream callback from its own thread, like PortAudio."""
+
+    def __init__(self, callback, frames):
+        self.callback = callback
+        self.frames = frames
+        self.blocks = 0
+        self._active = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.start_stream()
+        self._thread.start()
+
+    def _run(self):
+        while not self._closed:
+            if not self._active.wait(0.01):
+                continue
+            self.blocks += 1
+            self.callback(bytes([self.blocks % 256]) * (self.frames * 2), self.frames, {}, 0)
+            time.sleep(0.002)
+
+    def start_stream(self):
+        self._active.set()
+
+    def stop_stream(self):
+        self._active.clear()
+        time.sleep(0.01)  # let an in-flight callback finish
+
+    def close(self):
+        self._closed = True
+        self._thread.join()
+
+
+class _FakePyAudio:
+    def open(self, **kwargs):
+        self.stream = _FakeStream(kwargs["stream_callback"], kwargs["frames_per_buffer"])
+        return self.stream
+
+    def get_sample_size(self, _fmt):
+        return 2
+
+    def terminate(self):
+        pass
+
+
+@pytest.fixture
+def recorder_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(recorder_mod.pyaudio, "PyAudio", _FakePyAudio, raising=False)
+    monkeypatch.setattr(recorder_mod.pyaudio, "paInt16", 8, raising=False)
+    monkeypatch.setattr(recorder_mod.pyaudio, "paContinue", 0, raising=False)
+    monkeypatch.setattr(
+        recorder_mod,
+        "_get_audio_config",
+        lambda: {"format_str": "paInt16", "channels": 1, "rate": 16000, "chunk": 160, "cache_dir": tmp_path},
+    )
+    return tmp_path
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestStreamRecorder:
+    def test_all_consumers_see_every_chunk(self, recorder_env):
+        asr, meter = [], []
+        recorder = recorder_mod.StreamRecorder(on_chunk=asr.append, tail_seconds=0.05)
+        recorder.add_consumer("meter", meter.append)
+        recorder.start()
+        _wait_for(lambda: len(b"".join(asr)) >= 20 * 320)
+        assert len(recorder.tail()) == 800 * 2  # capped at tail_seconds
+        path = recorder.stop()
+
+        with wave.open(str(path), "rb") as wav:
+            data = wav.readframes(wav.getnframes())
+        assert data == b"".join(asr) == b"".join(meter)
+        assert recorder.tail() == data[-len(recorder.tail()):]
+
+    def test_slow_consumer_lags_without_blocking_others(self, recorder_env):
+        fast = []
+        release = threading.Event()
+        recorder = recorder_mod.StreamRecorder(on_chunk=lambda _data: release.wait(5))
+        recorder.add_consumer("meter", fast.append)
+        recorder.start()
+        _wait_for(lambda: len(b"".join(fast)) >= 20 * 320)
+        stats = recorder.stats()["consumers"]
+        assert stats["on_chunk"]["lag_bytes"] > stats["meter"]["lag_bytes"]
+        assert stats["disk"]["dropped_bytes"] == 0
+        release.set()
+        recorder.stop()
+
+    def test_pause_stops_capture(self, recorder_env):
+        recorder = recorder_mod.StreamRecorder()
+        recorder.start()
+        _wait_for(lambda: recorder.duration > 0.05)
+        recorder.pause()
+        time.sleep(0.05)
+        paused_at = recorder.stats()["consumers"]["disk"]["read_bytes"]
+        time.sleep(0.1)
+        assert recorder.stats()["consumers"]["disk"]["read_bytes"] == paused_at
+        recorder.resume()
+        _wait_for(lambda: recorder.stats()["consumers"]["disk"]["read_bytes"] > paused_at)
+        assert recorder.stats()["consumers"]["disk"]["read_bytes"] > paused_at
+        recorder.stop()
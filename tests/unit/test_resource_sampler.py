@@ -0,0 +1,46 @@
+import time
+
+import pytest
+
+from src.utils import resource
+from src.utils.resource import ResourceSampler, monitor_resources
+
+pytest.importorskip("psutil")
+
+
+@pytest.fixture
+def sampler(monkeypatch):
+    fresh = ResourceSampler(capacity=4)
+    monkeypatch.setattr(resource, "_SAMPLER", fresh)
+    return fresh
+
+
+class TestResourceSampler:
+    """Bounded sampling and work-based attribution."""
+
+    def test_ring_is_bounded(self, sampler):
+        for _ in range(10):
+            sampler.sample()
+        assert len(sampler.window(0.0)) == 4
+
+    def test_window_filters_by_time(self, sampler):
+        sampler.sample()
+        cut = time.monotonic()
+        sampler.sample()
+        assert len(sampler.window(cut)) == 1
+
+    def test_cpu_is_split_by_counted_work(self, sampler):
+        measure_a, results_a = monitor_resources()
+        measure_b, results_b = monitor_resources()
+        measure_a(3200, 1.0)
+        measure_b(3200, 3.0)
+        with sampler._lock:
+            sampler._samples.append((time.monotonic(), 80.0, 100.0))
+            sampler._samples.append((time.monotonic(), 40.0, 120.0))
+
+        a, b = results_a(), results_b()
+        assert set(a) == {"cpu_avg", "memory_avg", "peak_memory"}
+        assert a["cpu_avg"] == pytest.approx(15.0)
+        assert b["cpu_avg"] == pytest.approx(45.0)
+        assert a["memory_avg"] == pytest.approx(110.0)
+        assert b["peak_memory"] == pytest.approx(120.0)
@@ -0,0 +1,56 @@
+import numpy as np
+
+from src.audio.ring_buffer import PCMRingBuffer
+
+
+def _pcm(values):
+    return np.asarray(values, dtype=np.int16).tobytes()
+
+
+class TestPCMRingBuffer:
+    """Bounded append, zero-copy views and lazy float32 conversion."""
+
+    def test_append_drops_oldest_beyond_capacity(self):
+        rb = PCMRingBuffer(4)
+        rb.append(_pcm([1, 2, 3]))
+        rb.append(_pcm([4, 5, 6]))
+
+        assert rb.view().tolist() == [3, 4, 5, 6]
+        assert rb.total_samples == 6
+        assert rb.start_sample == 2
+
+    def test_compaction_keeps_storage_and_contents(self):
+        rb = PCMRingBuffer(3)
+        storage = rb._pcm
+        for i in range(20):
+            rb.append(_pcm([i]))
+
+        assert rb._pcm is storage
+        assert rb.view().tolist() == [17, 18, 19]
+
+    def test_odd_byte_chunks_are_realigned(self):
+        rb = PCMRingBuffer(8)
+        raw = _pcm([100, -200, 300])
+        rb.append(raw[:3])
+        rb.append(raw[3:])
+
+        assert rb.view().tolist() == [100, -200, 300]
+
+    def test_float32_view_matches_conversion_after_trimming(self):
+        rb = PCMRingBuffer(6)
+        rb.append(_pcm([0, 16384, -32768]))
+        assert rb.as_float32(1).tolist() == [-1.0]
+
+        rb.append(_pcm([8192, 1, 2, 3]))
+        rb.consume(2)
+        expected = rb.view().astype(np.float32) / 32768.0
+        np.testing.assert_array_equal(rb.as_float32(), expected)
+
+    def test_keep_last_and_to_bytes(self):
+        rb = PCMRingBuffer.for_duration(1.0, sample_rate=10)
+        rb.append(np.arange(8, dtype=np.int16))
+        rb.keep_last(3)
+
+        assert len(rb) == 3
+        assert rb.to_bytes() == _pcm([5, 6, 7])
+        assert rb.duration == 0.3
@@ -0,0 +1,190 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from src.core.factories.streaming_factory import StreamingHandlerFactory
+from src.core.services.capacity import CapacityModel
+from src.core.services.sharded_streaming_service import ShardedStreamingService
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses the fork start method")
+
+
+class _EchoHandler:
+    """Emits a ready event, a partial per chunk and a final with the total byte count on close."""
+
+    def __init__(self, update_queue, **_):
+        self.update_queue = update_queue
+        self.received = 0
+        self.update_queue.put({"type": "ready"})  # before the session id is known
+
+    def __call__(self, chunk):
+        self.received += len(chunk)
+        self.update_queue.put({"type": "partial", "text": str(self.received)})
+
+    def close(self):
+        self.update_queue.put({"type": "final", "text": str(self.received), "is_final": True})
+
+
+for _name in ("echo", "echo_lite"):
+    if _name not in StreamingHandlerFactory._providers:
+        StreamingHandlerFactory.register_provider(_name, _EchoHandler)
+
+
+def _admission(monkeypatch, **kwargs):
+    """Give every worker a one-core budget where a second "echo" session does not fit."""
+    kwargs.setdefault("priors", {"echo": 0.8, "echo_lite": 0.1})
+    monkeypatch.setattr(
+        CapacityModel, "from_settings", classmethod(lambda cls, share=1.0: cls(cores=1, target_utilisation=1.0, **kwargs))
+    )
+
+
+@pytest.fixture
+def service(monkeypatch):
+    # Admission control is covered by test_capacity; keep placement host-independent.
+    monkeypatch.setattr(CapacityModel, "from_settings", classmethod(lambda cls, share=1.0: cls(policy="off")))
+    # fork so the workers inherit the test-only "echo" provider and the patch
+    svc = ShardedStreamingService(2, start_method="fork")
+    yield svc
+    svc.shutdown()
+
+
+async def _collect(svc, session_id):
+    return [u async for u in svc.updates(session_id)]
+
+
+class TestShardedStreamingService:
+    """Placement, routing and shutdown across worker processes."""
+
+    def test_sessions_are_spread_and_routed(self, service):
+        async def scenario():
+            ids = [await service.start_session("echo") for _ in range(4)]
+            readers = [asyncio.create_task(_collect(service, sid)) for sid in ids]
+            for n, sid in enumerate(ids):
+                for _ in range(n + 1):
+                    await service.process_chunk(sid, b"\x00" * 3200)
+            stats = service.get_session_stats(ids[0])
+            for sid in ids:
+                await service.end_session(sid)
+            return ids, stats, await asyncio.wait_for(asyncio.gather(*readers), 10)
+
+        ids, stats, results = asyncio.run(scenario())
+
+        assert [s["sessions"] for s in service.shard_stats()] == [0, 0]
+        assert stats["shard"] in (0, 1)
+        assert "audio_quality" in stats
+        for n, updates in enumerate(results):
+            finals = [u for u in updates if u.get("type") == "final"]
+            assert finals[0]["text"] == str(3200 * (n + 1))
+            assert updates[-1]["type"] == "metrics"
+            assert "delivery_latency" in updates[-1]
+
+    def test_updates_produced_while_starting_are_delivered(self, service):
+        async def scenario():
+            sid = await service.start_session("echo")
+            reader = asyncio.create_task(_collect(service, sid))
+            await service.end_session(sid)
+            return await asyncio.wait_for(reader, 10)
+
+        assert asyncio.run(scenario())[0] == {"type": "ready"}
+
+    def test_least_loaded_placement(self, service):
+        async def scenario():
+            ids = [await service.start_session("echo") for _ in range(4)]
+            placed = [s["sessions"] for s in service.shard_stats()]
+            for sid in ids:
+                await service.end_session(sid)
+            return placed
+
+        assert asyncio.run(scenario()) == [2, 2]
+
+    def test_unknown_engine_is_reported(self, service):
+        with pytest.raises(Exception, match="not supported"):
+            asyncio.run(service.start_session("nope"))
+        assert [s["sessions"] for s in service.shard_stats()] == [0, 0]
+
+    def test_placement_follows_reported_headroom(self, service):
+        service._ensure_started()
+        busy, idle = service._shards
+        busy.load = {"sessions": 0, "capacity": {"headroom": 0.1, "rtf": {}}}
+        idle.load = {"sessions": 0, "capacity": {"headroom": 2.0, "rtf": {}}}
+        assert service._pick_shard("echo") is idle
+        idle.reserved = 4  # 4 × 0.5 cores (default prior) placed since the report
+        assert service._pick_shard("echo") is busy
+
+    def test_capacity_is_summed_over_shards(self, service):
+        async def scenario():
+            sid = await service.start_session("echo")
+            await asyncio.sleep(1.5)  # one load report per second
+            capacity = service.get_capacity()
+            await service.end_session(sid)
+            return capacity
+
+        capacity = asyncio.run(scenario())
+        assert capacity["policy"] == "off"
+        assert len(capacity["shards"]) == 2
+        assert capacity["budget"] == pytest.approx(sum(c["budget"] for c in capacity["shards"]))
+        assert capacity["live"] == {"echo": 1} and capacity["admitted"] == 1
+
+
+class TestShardedAdmission:
+    """Admission policies running inside a single worker."""
+
+    def test_downgrade_is_reported_as_session_event(self, monkeypatch):
+        _admission(monkeypatch, policy="downgrade", downgrades={"echo": "echo_lite"})
+        svc = ShardedStreamingService(1, start_method="fork")
+
+        async def scenario():
+            first = await svc.start_session("echo")
+            second = await svc.start_session("echo")
+            reader = asyncio.create_task(_collect(svc, second))
+            for sid in (first, second):
+                await svc.end_session(sid)
+            return await asyncio.wait_for(reader, 10)
+
+        try:
+            updates = asyncio.run(scenario())
+        finally:
+            svc.shutdown()
+        (downgrade,) = [u for u in updates if u["type"] == "downgrade"]
+        assert (downgrade["requested"], downgrade["engine"]) == ("echo", "echo_lite")
+
+    def test_queued_start_does_not_stall_other_sessions(self, monkeypatch):
+        _admission(monkeypatch, policy="queue", queue_timeout=10.0)
+        svc = ShardedStreamingService(1, start_method="fork")
+
+        async def scenario():
+            first = await svc.start_session("echo")
+            reader = asyncio.create_task(_collect(svc, first))
+            waiting = asyncio.create_task(svc.start_session("echo"))
+            await asyncio.sleep(0.2)
+            await svc.process_chunk(first, b"\x00" * 3200)
+            started = time.monotonic()
+            await svc.end_session(first)  # frees the capacity the second start waits for
+            second = await asyncio.wait_for(waiting, 5)
+            elapsed = time.monotonic() - started
+            await svc.end_session(second)
+            return elapsed, await asyncio.wait_for(reader, 10)
+
+        try:
+            elapsed, updates = asyncio.run(scenario())
+        finally:
+            svc.shutdown()
+        assert elapsed < 5
+        assert [u["text"] for u in updates if u.get("type") == "final"] == ["3200"]
+
+
+class TestSpawnedShards:
+    def test_spawned_workers_load_configuration(self, monkeypatch):
+        monkeypatch.setenv("STREAMING_ADMISSION_POLICY", "downgrade")
+        svc = ShardedStreamingService(1)  # default start method: spawn
+        try:
+            svc._ensure_started()
+            deadline = time.monotonic() + 60
+            while svc.get_capacity()["policy"] is None and time.monotonic() < deadline:
+                time.sleep(0.2)
+            # Without the bootstrap the worker falls back to the default "reject".
+            assert svc.get_capacity()["policy"] == "downgrade"
+        finally:
+            svc.shutdown()
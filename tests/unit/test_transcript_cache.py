@@ -0,0 +1,158 @@
+import asyncio
+import os
+import time
+
+import pytest
+from cryptography.fernet import Fernet
+
+from src.asr import transcription
+from src.asr.exceptions import TranscriptionError
+from src.asr.transcript_cache import TranscriptCache, transcript_key
+
+
+class _Security:
+    """Just the two ISecurityService methods the cache uses."""
+
+    def __init__(self):
+        self._fernet = Fernet(Fernet.generate_key())
+
+    def encrypt_data(self, data):
+        return self._fernet.encrypt(data)
+
+    def decrypt_data(self, cipher):
+        return self._fernet.decrypt(cipher)
+
+
+@pytest.fixture
+def security():
+    return _Security()
+
+
+def _cache(tmp_path, security, **kwargs):
+    kwargs.setdefault("max_bytes", 1 << 20)
+    return TranscriptCache(tmp_path / "cache", security=security, **kwargs)
+
+
+def _key(name):
+    return transcript_key(name, "whisper", {"size": "tiny"}, "en-US")
+
+
+class TestTranscriptKey:
+    def test_depends_on_audio_engine_model_and_language(self):
+        base = transcript_key("abc", "whisper", {"size": "tiny"}, "en-US")
+        assert base == transcript_key("abc", "whisper", {"size": "tiny"}, "en-US")
+        assert len({
+            base,
+            transcript_key("abd", "whisper", {"size": "tiny"}, "en-US"),
+            transcript_key("abc", "vosk", {"model_path": None}, "en-US"),
+            transcript_key("abc", "whisper", {"size": "base"}, "en-US"),
+            transcript_key("abc", "whisper", {"size": "tiny"}, "de-DE"),
+        }) == 5
+
+
+class TestTranscriptCache:
+    def test_round_trip_is_encrypted_on_disk(self, tmp_path, security):
+        cache = _cache(tmp_path, security)
+        cache.put(_key("a"), "patient reports chest pain")
+        assert cache.get(_key("a")) == "patient reports chest pain"
+        assert cache.get(_key("b")) is None
+        (entry,) = (tmp_path / "cache").iterdir()
+        assert b"chest pain" not in entry.read_bytes()
+        assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+    def test_evicts_least_recently_used(self, tmp_path, security):
+        cache = _cache(tmp_path, security)
+        cache.put(_key("a"), "x" * 100)
+        cache.max_bytes = 3 * cache.stats()["bytes"]
+        cache.put(_key("b"), "x" * 100)
+        cache.put(_key("c"), "x" * 100)
+        assert cache.get(_key("a"))  # "b" is now the least recently used
+        cache.put(_key("d"), "x" * 100)
+        assert cache.get(_key("b")) is None
+        assert all(cache.get(_key(k)) for k in "acd")
+        assert cache.stats()["evictions"] == 1
+        assert len(list((tmp_path / "cache").iterdir())) == 3
+
+    def test_expired_entries_are_dropped(self, tmp_path, security):
+        cache = _cache(tmp_path, security, ttl_seconds=60)
+        cache.put(_key("a"), "old")
+        path = next((tmp_path / "cache").iterdir())
+        os.utime(path, (time.time(), time.time() - 120))
+        assert cache.get(_key("a")) is None
+        assert not path.exists()
+        assert cache.stats()["expired"] == 1
+
+    def test_index_is_rebuilt_on_reopen(self, tmp_path, security):
+        cache = _cache(tmp_path, security)
+        cache.put(_key("a"), "first")
+        cache.put(_key("b"), "second")
+        reopened = _cache(tmp_path, security)
+        assert reopened.get(_key("b")) == "second"
+        assert reopened.stats()["entries"] == 2
+        assert reopened.stats()["bytes"] == cache.stats()["bytes"]
+
+    def test_unreadable_entry_is_a_miss(self, tmp_path, security):
+        _cache(tmp_path, security).put(_key("a"), "text")
+        cache = _cache(tmp_path, _Security())  # different key
+        assert cache.get(_key("a")) is None
+        assert cache.stats()["entries"] == 0
+
+
+class TestSingleflight:
+    def test_concurrent_requests_share_one_decode(self, tmp_path, security):
+        cache = _cache(tmp_path, security)
+        calls = []
+
+        async def decode():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "shared"
+
+        async def _many():
+            return await asyncio.gather(*(cache.get_or_compute(_key("a"), decode) for _ in range(5)))
+
+        assert asyncio.run(_many()) == ["shared"] * 5
+        assert len(calls) == 1
+        assert cache.stats()["coalesced"] == 4
+        assert asyncio.run(cache.get_or_compute(_key("a"), decode)) == "shared"
+        assert len(calls) == 1
+
+    def test_failures_reach_every_caller_and_are_not_cached(self, tmp_path, security):
+        cache = _cache(tmp_path, security)
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise TranscriptionError("decoder exploded")
+
+        async def _two():
+            return await asyncio.gather(
+                cache.get_or_compute(_key("a"), fail), cache.get_or_compute(_key("a"), fail), return_exceptions=True
+            )
+
+        assert [str(r) for r in asyncio.run(_two())] == ["decoder exploded"] * 2
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["in_flight"] == 0
+
+
+class TestTranscribeAudio:
+    def test_reupload_is_served_from_cache(self, tmp_path, security, monkeypatch):
+        cache = _cache(tmp_path, security)
+        runs = []
+
+        class _Executor:
+            async def run(self, provider_type, options, audio_path):
+                runs.append(provider_type)
+                return "decoded"
+
+        monkeypatch.setattr(transcription, "get_transcription_executor", lambda: _Executor())
+        monkeypatch.setattr(transcription, "get_transcript_cache", lambda: cache)
+        first, second = tmp_path / "first.wav", tmp_path / "second.wav"
+        first.write_bytes(b"RIFF same audio")
+        second.write_bytes(b"RIFF same audio")
+
+        assert asyncio.run(transcription.transcribe_audio(first, "whisper_tiny")) == "decoded"
+        assert asyncio.run(transcription.transcribe_audio(second, "whisper_tiny")) == "decoded"
+        assert runs == ["whisper"]
+        asyncio.run(transcription.transcribe_audio(second, "whisper_base"))
+        asyncio.run(transcription.transcribe_audio(second, "whisper_tiny", use_cache=False))
+        assert runs == ["whisper"] * 3
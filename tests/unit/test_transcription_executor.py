@@ -0,0 +1,94 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from src.asr.exceptions import TranscriptionError
+from src.asr.executor import TranscriptionExecutor, parse_pool_workers
+from src.core.bootstrap import container
+from src.core.exceptions import ConfigurationError
+from src.core.factories.transcriber_factory import TranscriberFactory
+
+
+class _SleepyTranscriber:
+    """Blocks synchronously inside ``async def`` like the real engines."""
+
+    def __init__(self, seconds: float = 0.2, fail: bool = False) -> None:
+        self.seconds = seconds
+        self.fail = fail
+
+    async def transcribe(self, audio_path, **_kwargs):
+        if self.fail:
+            raise RuntimeError("decoder exploded")
+        time.sleep(self.seconds)
+        return f"{os.getpid()}:{Path(audio_path).name}"
+
+
+@pytest.fixture(autouse=True)
+def sleepy_provider(monkeypatch):
+    factory = container.resolve(TranscriberFactory)
+    monkeypatch.setitem(factory._providers, "sleepy", _SleepyTranscriber)
+
+
+async def _ticks_during(coro):
+    ticks = 0
+    task = asyncio.ensure_future(coro)
+    while not task.done():
+        await asyncio.sleep(0.01)
+        ticks += 1
+    return await task, ticks
+
+
+class TestParsePoolWorkers:
+    def test_parses_counts(self):
+        assert parse_pool_workers("vosk=2, Whisper=0") == {"vosk": 2, "whisper": 0}
+        assert parse_pool_workers("") == {}
+
+    @pytest.mark.parametrize("spec", ["vosk", "vosk=two"])
+    def test_rejects_malformed(self, spec):
+        with pytest.raises(ConfigurationError):
+            parse_pool_workers(spec)
+
+
+class TestThreadMode:
+    def test_event_loop_keeps_running(self, tmp_path):
+        executor = TranscriptionExecutor({"sleepy": 0})
+        transcript, ticks = asyncio.run(_ticks_during(executor.run("sleepy", {"seconds": 0.3}, tmp_path / "a.wav")))
+        assert transcript == f"{os.getpid()}:a.wav"
+        assert ticks >= 10
+        stats = executor.stats()["sleepy"]
+        assert stats["mode"] == "thread"
+        assert stats["completed"] == 1
+        assert stats["run_seconds"]["max"] >= 0.3
+
+    def test_failures_surface_as_transcription_error(self, tmp_path):
+        executor = TranscriptionExecutor({"sleepy": 0})
+        with pytest.raises(TranscriptionError, match="decoder exploded"):
+            asyncio.run(executor.run("sleepy", {"fail": True}, tmp_path / "a.wav"))
+        assert executor.stats()["sleepy"]["failed"] == 1
+
+
+class TestProcessPool:
+    def test_jobs_run_in_worker_and_queue(self, tmp_path):
+        executor = TranscriptionExecutor({"sleepy": 1}, start_method="fork")
+
+        async def _two():
+            return await asyncio.gather(
+                executor.run("sleepy", {"seconds": 0.3}, tmp_path / "a.wav"),
+                executor.run("sleepy", {"seconds": 0.3}, tmp_path / "b.wav"),
+            )
+
+        try:
+            (first, second), ticks = asyncio.run(_ticks_during(_two()))
+        finally:
+            executor.shutdown()
+        assert first.endswith(":a.wav") and second.endswith(":b.wav")
+        assert first.split(":")[0] != str(os.getpid())
+        assert ticks >= 20
+        stats = executor.stats()["sleepy"]
+        assert stats["mode"] == "process"
+        assert (stats["completed"], stats["in_flight"], stats["queued"]) == (2, 0, 0)
+        # The second job waited for the single worker to finish the first.
+        assert stats["wait_seconds"]["max"] >= 0.2
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.asr.streaming.update_queue import CoalescingUpdateQueue, LatencyTracker, UpdateQueue
+
+
+class TestUpdateQueue:
+    """Async wake-ups and production timestamps of the session update queue."""
+
+    @pytest.mark.asyncio
+    async def test_wait_wakes_on_put_from_other_thread(self):
+        q = UpdateQueue(maxsize=8)
+        waiter = asyncio.create_task(q.wait(timeout=2))
+        await asyncio.sleep(0)
+
+        threading.Thread(target=q.put, args=({"type": "final", "text": "hi"},)).start()
+
+        assert await waiter is True
+        produced_at, update = q.get_timed_nowait()
+        assert update["text"] == "hi"
+        assert produced_at > 0
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out_when_idle(self):
+        assert await UpdateQueue().wait(timeout=0.01) is False
+
+    def test_get_keeps_queue_semantics(self):
+        q = UpdateQueue()
+        q.put({"n": 1})
+        assert q.get() == {"n": 1}
+        assert q.empty()
+
+
+class TestCoalescingUpdateQueue:
+    """Newest-partial coalescing with lossless, ordered finals."""
+
+    def test_only_newest_partial_survives(self):
+        q = CoalescingUpdateQueue()
+        for i in range(1000):  # would block a bounded queue.Queue
+            q.put({"type": "partial", "text": str(i)})
+
+        assert q.qsize() == 1
+        assert q.get_nowait()["text"] == "999"
+        assert q.coalesced == 999
+
+    def test_finals_are_kept_in_order_and_supersede_partials(self):
+        q = CoalescingUpdateQueue()
+        q.put({"type": "final", "text": "a"})
+        q.put({"text": "x", "is_final": False})
+        q.put({"type": "final", "text": "b"})
+        q.put({"type": "partial", "text": "c"})
+
+        assert [q.get_nowait()["text"] for _ in range(3)] == ["a", "b", "c"]
+        assert q.empty()
+
+    @pytest.mark.asyncio
+    async def test_async_iteration_drains_then_stops_on_close(self):
+        q = CoalescingUpdateQueue()
+
+        def produce():
+            q.put({"type": "final", "text": "done"})
+            q.put({"type": "metrics"})
+            q.close()
+
+        threading.Thread(target=produce).start()
+        received = [update async for update in q]
+
+        assert [u["type"] for u in received] == ["final", "metrics"]
+
+
+def test_latency_tracker_summary_in_milliseconds():
+    tracker = LatencyTracker(window=10)
+    for ms in range(1, 11):
+        tracker.record(ms / 1000.0)
+
+    summary = tracker.summary()
+    assert summary["count"] == 10
+    assert summary["p50_ms"] == pytest.approx(5.0)
+    assert summary["max_ms"] == pytest.approx(10.0)
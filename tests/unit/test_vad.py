@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from src.audio.vad import EnergyVAD, split_at_pauses
+
+RATE = 16000
+
+
+def _tone(seconds, amplitude=0.3, freq=220.0):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * 32767 * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.int16)
+
+
+def _feed(vad, samples, chunk=1600):
+    raw = samples.tobytes()
+    return [vad.process(raw[i : i + chunk * 2]) for i in range(0, len(raw), chunk * 2)]
+
+
+class TestEnergyVAD:
+    """Gating, hangover, pre-roll and endpoint detection."""
+
+    def test_skip_policy_drops_silence_and_reports_endpoint(self):
+        vad = EnergyVAD(policy="skip", hangover_ms=100, preroll_ms=0)
+        audio = np.concatenate([_silence(1.0), _tone(0.5), _silence(1.0)])
+
+        decisions = _feed(vad, audio)
+        forwarded = sum(len(d.audio) for d in decisions) // 2
+
+        # Speech plus the 100 ms hangover, none of the surrounding silence.
+        assert forwarded == int(0.6 * RATE)
+        assert sum(d.endpoint for d in decisions) == 1
+        assert vad.stats()["forwarded_ratio"] == pytest.approx(0.6 / 2.5)
+
+    def test_preroll_replays_audio_before_onset(self):
+        vad = EnergyVAD(policy="skip", preroll_ms=200)
+        quiet_lead = _tone(0.5, amplitude=0.002)
+        decisions = _feed(vad, np.concatenate([quiet_lead, _tone(0.2)]))
+
+        forwarded = np.frombuffer(b"".join(d.audio for d in decisions), dtype=np.int16)
+        assert len(forwarded) == int(0.4 * RATE)
+        assert np.array_equal(forwarded[: int(0.2 * RATE)], quiet_lead[-int(0.2 * RATE) :])
+
+    def test_compress_policy_keeps_short_gap(self):
+        vad = EnergyVAD(policy="compress", compress_ms=200, hangover_ms=0, preroll_ms=0)
+        decisions = _feed(vad, np.concatenate([_tone(0.5), _silence(3.0)]))
+
+        forwarded = sum(len(d.audio) for d in decisions) // 2
+        assert forwarded == int(0.7 * RATE)
+
+    def test_noise_with_high_zero_crossing_rate_is_not_speech(self):
+        rng = np.random.default_rng(0)
+        hiss = (rng.standard_normal(RATE) * 0.015 * 32767).astype(np.int16)
+        vad = EnergyVAD(policy="skip", preroll_ms=0)
+
+        assert not any(d.audio for d in _feed(vad, hiss))
+
+    def test_odd_sized_chunks_are_reassembled(self):
+        vad = EnergyVAD(policy="skip", hangover_ms=0, preroll_ms=0)
+        raw = _tone(0.1).tobytes()
+        out = vad.process(raw[:333]).audio + vad.process(raw[333:]).audio
+
+        assert out == raw
+
+
+class TestSplitAtPauses:
+    def test_ranges_cover_audio_and_end_in_pauses(self):
+        audio = np.concatenate([_tone(0.8), _silence(0.1), _tone(0.9), _silence(0.1), _tone(0.5)])
+        bounds = split_at_pauses(audio, RATE, 1.0, search_seconds=0.5)
+        assert bounds[0][0] == 0 and bounds[-1][1] == len(audio)
+        assert all(end == nxt for (_s, end), (nxt, _e) in zip(bounds, bounds[1:]))
+        assert all(end - start <= RATE for start, end in bounds)
+        assert np.all(audio[bounds[0][1] - 160 : bounds[0][1]] == 0)
+        assert np.all(audio[bounds[1][1] - 160 : bounds[1][1]] == 0)
@@ -0,0 +1,42 @@
+import wave
+
+import numpy as np
+import pytest
+
+from src.audio.wav_writer import StreamingWavWriter
+
+
+def _pcm(seconds, rate=16000):
+    return (np.arange(int(seconds * rate)) % 2000 - 1000).astype("<i2").tobytes()
+
+
+class TestStreamingWavWriter:
+    def test_incremental_writes_round_trip(self, tmp_path):
+        path = tmp_path / "out.wav"
+        pcm = _pcm(1.5)
+        with StreamingWavWriter(path) as writer:
+            for offset in range(0, len(pcm), 2048):
+                writer.write(pcm[offset : offset + 2048])
+        assert writer.closed
+        assert writer.duration == pytest.approx(1.5)
+        with wave.open(str(path), "rb") as wav:
+            assert (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) == (1, 2, 16000)
+            assert wav.readframes(wav.getnframes()) == pcm
+
+    def test_header_is_patched_while_recording(self, tmp_path):
+        path = tmp_path / "live.wav"
+        writer = StreamingWavWriter(path, header_interval=0.5)
+        writer.write(_pcm(0.6))
+        writer.write(_pcm(0.1))
+        # Not closed: a reader sees everything up to the last patch.
+        with wave.open(str(path), "rb") as wav:
+            assert wav.getnframes() == int(0.6 * 16000)
+        writer.close()
+        with wave.open(str(path), "rb") as wav:
+            assert wav.getnframes() == int(0.7 * 16000)
+
+    def test_close_is_idempotent_and_blocks_writes(self, tmp_path):
+        writer = StreamingWavWriter(tmp_path / "x.wav")
+        assert writer.close() == writer.close()
+        with pytest.raises(ValueError):
+            writer.write(b"\x00\x00")
@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from src.asr.model_registry import ModelRegistry
+from src.asr.streaming import whisper_batcher
+from src.asr.streaming.whisper_batcher import WhisperBatchWorker
+
+
+class _RecordingWorker(WhisperBatchWorker):
+    """Batch worker whose forward pass just records the batch shape."""
+
+    def __init__(self, *args, **kwargs):
+        self.batches: list[tuple[int, str | None]] = []
+        super().__init__(*args, **kwargs)
+
+    def _decode(self, windows, prompt):
+        self.batches.append((len(windows), prompt))
+        return [f"len={len(w)}" for w in windows]
+
+
+@pytest.fixture(autouse=True)
+def fake_registry(monkeypatch):
+    reg = ModelRegistry()
+    reg.register_loader("whisper", lambda name, device: object())
+    monkeypatch.setattr(whisper_batcher, "get_model_registry", lambda: reg)
+    return reg
+
+
+def _submit_all(worker, windows, prompt=None):
+    results: dict[int, str] = {}
+    done = threading.Event()
+
+    def _callback_for(i):
+        def _cb(text, exc):
+            assert exc is None
+            results[i] = text
+            if len(results) == len(windows):
+                done.set()
+
+        return _cb
+
+    for i, window in enumerate(windows):
+        worker.submit(window, _callback_for(i), prompt=prompt)
+    assert done.wait(timeout=2)
+    return results
+
+
+def test_windows_from_many_sessions_share_one_forward_pass():
+    worker = _RecordingWorker("tiny", max_batch_size=8, max_wait=0.2)
+    results = _submit_all(worker, [[0.0] * n for n in (1, 2, 3)])
+
+    assert results == {0: "len=1", 1: "len=2", 2: "len=3"}
+    assert worker.batches == [(3, None)]
+    assert worker.stats()["avg_batch_size"] == pytest.approx(3.0)
+
+
+def test_batch_size_cap_splits_batches():
+    worker = _RecordingWorker("tiny", max_batch_size=2, max_wait=0.2)
+    _submit_all(worker, [[0.0]] * 5)
+
+    assert sum(n for n, _ in worker.batches) == 5
+    assert max(n for n, _ in worker.batches) == 2
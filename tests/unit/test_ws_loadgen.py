@@ -0,0 +1,138 @@
+import asyncio
+import random
+import socket
+import threading
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from scripts.ws_loadgen import (
+    ClientTrace,
+    client_url,
+    frames,
+    generate_speech,
+    load_wav,
+    run_load,
+    schedule,
+    summarise,
+)
+
+
+class TestAudio:
+    def test_stereo_wav_is_downmixed(self, tmp_path):
+        path = tmp_path / "stereo.wav"
+        samples = np.array([[100, 300], [-200, -400]], dtype="<i2")
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(8000)
+            wav.writeframes(samples.tobytes())
+        pcm, rate = load_wav(str(path))
+        assert rate == 8000
+        assert np.frombuffer(pcm, dtype="<i2").tolist() == [200, -300]
+
+    def test_frames_cover_audio(self):
+        pcm = generate_speech(1.05)
+        out = frames(pcm, 16000, 100)
+        assert b"".join(f for f, _ in out) == pcm
+        assert out[0][1] == pytest.approx(0.1)
+        assert out[-1][1] == pytest.approx(1.05)
+
+
+class TestSchedule:
+    def test_real_time_and_speedup(self):
+        assert schedule([0.1, 0.2], 1.0, 0, random.Random(0)) == pytest.approx([0.1, 0.2])
+        assert schedule([0.1, 0.2], 2.0, 0, random.Random(0)) == pytest.approx([0.05, 0.1])
+        assert schedule([0.1, 0.2], 0, 0, random.Random(0)) == [0.0, 0.0]
+
+    def test_jitter_never_reorders(self):
+        ends = [i / 10 for i in range(1, 200)]
+        offsets = schedule(ends, 1.0, 80, random.Random(1))
+        assert offsets == sorted(offsets)
+        assert max(abs(o - e) for o, e in zip(offsets, ends)) <= 0.08 + 1e-9
+
+
+class TestTrace:
+    def test_final_latency_uses_completing_frame(self):
+        trace = ClientTrace(0)
+        trace.sent_audio, trace.sent_at = [0.1, 0.2, 0.3], [10.0, 10.1, 10.2]
+        trace.on_update({"type": "partial", "text": "a"}, now=10.05)
+        trace.on_update({"type": "final", "text": "ab", "audio_end": 0.2}, now=10.25)
+        assert trace.first_partial_ms == pytest.approx(50.0)
+        assert trace.final_ms == [pytest.approx(150.0)]
+        assert trace.update_lag_ms == [pytest.approx(50.0), pytest.approx(50.0)]
+
+    def test_capacity_error_marks_rejected(self):
+        trace = ClientTrace(0)
+        trace.on_update({"type": "error", "error": "capacity", "detail": "full", "retry_after": 5})
+        report = summarise([trace, ClientTrace(1)], audio_seconds=1.0, wall_seconds=1.0)
+        assert report["rejected"] == 1
+        assert report["errors"] == ["full"]
+
+    def test_client_url(self):
+        url = client_url("http://127.0.0.1:9000/", "stream", {"engine": "vosk", "rate": 8000, "model": None})
+        assert url == "ws://127.0.0.1:9000/ws/stream?engine=vosk&rate=8000"
+
+
+@pytest.fixture(scope="module")
+def echo_server():
+    """Local uvicorn app acknowledging every frame and finalising each second."""
+    uvicorn = pytest.importorskip("uvicorn")
+    pytest.importorskip("websockets")
+    from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+
+    app = FastAPI()
+
+    @app.websocket("/ws/stream")
+    async def stream(ws: WebSocket):
+        await ws.accept()
+        if ws.query_params.get("engine") == "full":
+            await ws.send_json({"type": "error", "error": "capacity", "detail": "full", "retry_after": 1})
+            await ws.close(code=1013)
+            return
+        audio, segment_end = 0.0, 1.0
+        try:
+            while True:
+                audio += len(await ws.receive_bytes()) / 32000
+                if audio >= segment_end - 1e-6:
+                    segment_end += 1.0
+                    await ws.send_json({"type": "final", "text": "x", "audio_end": audio})
+                else:
+                    await ws.send_json({"type": "partial", "text": "x"})
+        except WebSocketDisconnect:
+            pass
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            pytest.fail("uvicorn did not start")
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+class TestRunLoad:
+    def test_clients_complete_with_latencies(self, echo_server):
+        audio = frames(generate_speech(2.0), 16000, 100)
+        url = client_url(echo_server, "stream", {"engine": "echo"})
+        traces, wall = asyncio.run(run_load(url, audio, clients=3, speed=4.0, jitter_ms=5, ramp=0.1, drain=0.3))
+        report = summarise(traces, audio_seconds=2.0, wall_seconds=wall)
+        assert report["completed"] == 3
+        assert report["frames_sent"] == 3 * len(audio)
+        assert report["latency_ms"]["final"]["count"] == 6
+        assert report["latency_ms"]["first_partial"]["count"] == 3
+
+    def test_capacity_rejection_is_counted(self, echo_server):
+        audio = frames(generate_speech(0.5), 16000, 100)
+        url = client_url(echo_server, "stream", {"engine": "full"})
+        traces, wall = asyncio.run(run_load(url, audio, clients=2, speed=0, jitter_ms=0, ramp=0, drain=0.2))
+        assert [t.status for t in traces] == ["rejected", "rejected"]